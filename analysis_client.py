@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+клиент сервиса анализа (analysis_service.py): только стандартная библиотека, поэтому запрос
+не импортирует pandas и не читает набор - все считает уже запущенный сервис
+запуск: python analysis_client.py health
+        python analysis_client.py top '{"by": "ova", "n": 5, "columns": ["name", "ova"]}'
+из кода: query('group', by='nationality', agg={'ova': 'mean'}, sort_by='ova', limit=10)
+"""
+
+import argparse
+import json
+import sys
+import urllib.error
+import urllib.request
+
+DEFAULT_URL = 'http://127.0.0.1:8765'
+TIMEOUT = 30
+
+
+class ServiceError(Exception):
+    """сервис недоступен или отклонил запрос (текст ошибки - от сервиса)"""
+
+
+def _request(url, payload=None, timeout=TIMEOUT):
+    data = None if payload is None else json.dumps(payload).encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.load(e).get('error')
+        except ValueError:
+            message = e.reason
+        raise ServiceError(f"{e.code}: {message}") from e
+    except urllib.error.URLError as e:
+        raise ServiceError(f"сервис {url} недоступен: {e.reason}") from e
+
+
+def query(kind, url=DEFAULT_URL, timeout=TIMEOUT, **params):
+    """ответ сервиса на запрос kind; таблицы приходят как {'columns': [...], 'rows': [...]}"""
+    return _request(f"{url.rstrip('/')}/query", {'kind': kind, **params}, timeout)['value']
+
+
+def health(url=DEFAULT_URL, timeout=TIMEOUT):
+    """источник, версия и размер набора в сервисе"""
+    return _request(f"{url.rstrip('/')}/health", timeout=timeout)
+
+
+def main():
+    """основная функция"""
+    parser = argparse.ArgumentParser(description='запрос к сервису анализа')
+    parser.add_argument('kind', help='health или вид запроса: rows, top, counts, pivot, group, corr, pairs, describe, crosstab')
+    parser.add_argument('params', nargs='?', default='{}', help='параметры запроса в json')
+    parser.add_argument('--url', default=DEFAULT_URL, help='адрес сервиса')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help='таймаут, секунды')
+    args = parser.parse_args()
+
+    try:
+        if args.kind == 'health':
+            result = health(args.url, args.timeout)
+        else:
+            result = query(args.kind, args.url, args.timeout, **json.loads(args.params))
+    except ServiceError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+локальный сервис анализа: очищенный набор загружается один раз и держится в памяти,
+запросы в духе analiz-2.py и statistical_analysis.py (фильтры, топ-n, сводные таблицы,
+группировки, корреляции, описательные статистики) выполняются без запуска интерпретатора
+и повторного чтения файла; новый очищенный файл подхватывается без перезапуска
+запуск: python analysis_service.py --port 8765
+запросы: POST /query с json {"kind": "top", "by": "ova", "n": 10, "where": [["age", "<", 23]]},
+         GET /health; клиент - analysis_client.py
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from correlation_engine import correlation_submatrix, top_pairs
+from dataset_loader import CACHE_DIR, clear_loaded, find_source, load_players, source_signature
+from descriptive_stats import describe_columns
+from reporting import json_default, structured
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# как часто проверяется, не появился ли новый очищенный файл (секунды)
+RELOAD_INTERVAL = 2.0
+# строк в ответе по умолчанию и не больше этого
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 10000
+# ответы на одинаковые запросы к одной версии набора берутся из памяти
+RESULT_CACHE_SIZE = 256
+MAX_BODY_BYTES = 1 << 20
+
+# условия where: [столбец, операция, значение]; isna и notna - без значения
+FILTER_OPS = {
+    '==': lambda series, value: series == value,
+    '!=': lambda series, value: series != value,
+    '<': lambda series, value: series < value,
+    '<=': lambda series, value: series <= value,
+    '>': lambda series, value: series > value,
+    '>=': lambda series, value: series >= value,
+    'in': lambda series, values: series.isin(values),
+    'not in': lambda series, values: ~series.isin(values),
+    'between': lambda series, bounds: series.between(*bounds),
+    'contains': lambda series, text: series.astype(str).str.contains(text, case=False, regex=False),
+    'isna': lambda series: series.isna(),
+    'notna': lambda series: series.notna(),
+}
+# функции агрегации pivot (aggfunc) и group (agg)
+AGG_FUNCS = ['mean', 'median', 'sum', 'min', 'max', 'std', 'var', 'count', 'size', 'nunique', 'first', 'last']
+
+# состояние сервиса: текущий набор, его источник и версия, кэш ответов
+_service = {
+    'df': None,
+    'source': None,
+    'signature': None,
+    'version': 0,
+    'loaded_at': None,
+    'load_s': None,
+    'results': OrderedDict(),
+    'lock': threading.Lock(),
+    'input': None,
+    'cache_dir': CACHE_DIR,
+}
+
+
+class QueryError(Exception):
+    """ошибка запроса (неизвестный вид, столбец или операция); клиент получает код 400"""
+
+
+def load_dataset():
+    """загрузка текущего источника и замена набора сервиса; старые ответы забываются"""
+    path = _service['input'] or find_source()
+    signature = source_signature(path)
+    start = time.perf_counter()
+    clear_loaded()
+    df = load_players(path=path, cache_dir=_service['cache_dir'])
+    with _service['lock']:
+        _service.update(df=df, source=path, signature=signature, loaded_at=time.time(),
+                        load_s=time.perf_counter() - start, version=_service['version'] + 1)
+        _service['results'].clear()
+    print(f"Загружен '{path}': {len(df)} строк, {len(df.columns)} столбцов "
+          f"за {_service['load_s']:.2f} с (версия {_service['version']})")
+
+
+def watch_source(stop, interval=RELOAD_INTERVAL):
+    """фоновая проверка источника: новый или измененный файл загружается заново
+
+    файл загружается, только когда его размер и время изменения не менялись между двумя
+    проверками, чтобы не прочитать наполовину записанный csv; при ошибке чтения остается старый набор
+    """
+    pending = None
+    while not stop.wait(interval):
+        try:
+            path = _service['input'] or find_source()
+            current = (path, source_signature(path))
+        except FileNotFoundError:
+            continue
+        if current == (_service['source'], _service['signature']):
+            pending = None
+            continue
+        if current != pending:
+            pending = current
+            continue
+        try:
+            load_dataset()
+        except Exception as e:
+            print(f"Ошибка загрузки '{path}', остается версия {_service['version']}: {e}")
+        pending = None
+
+
+def check_columns(df, columns):
+    """столбцы запроса списком; неизвестные - QueryError"""
+    if isinstance(columns, str):
+        columns = [columns]
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise QueryError(f"нет столбцов: {', '.join(map(str, missing))}")
+    return list(columns)
+
+
+def apply_where(df, where):
+    """строки, удовлетворяющие всем условиям where"""
+    if not where:
+        return df
+    if not isinstance(where, (list, tuple)):
+        raise QueryError("where - список условий [столбец, операция, значение]")
+    mask = np.ones(len(df), dtype=bool)
+    for condition in where:
+        if not isinstance(condition, (list, tuple)) or len(condition) < 2:
+            raise QueryError(f"условие {condition!r} должно быть списком [столбец, операция, значение]")
+        col, op, *value = condition
+        check_columns(df, [col])
+        if op not in FILTER_OPS:
+            raise QueryError(f"неизвестная операция '{op}', допустимы: {', '.join(FILTER_OPS)}")
+        # пропуски в nullable-столбцах условию не удовлетворяют
+        mask &= FILTER_OPS[op](df[col], *value).fillna(False).to_numpy(dtype=bool)
+    return df[mask]
+
+
+def _limit(request, key='limit', default=DEFAULT_LIMIT):
+    """число строк ответа из request[key] в пределах 0..MAX_LIMIT"""
+    limit = int(request.get(key, default))
+    return max(0, min(limit, MAX_LIMIT))
+
+
+def check_aggfuncs(funcs):
+    """функция агрегации или их список; не из AGG_FUNCS - QueryError"""
+    names = [funcs] if isinstance(funcs, str) else funcs
+    if not isinstance(names, list) or not names or any(name not in AGG_FUNCS for name in names):
+        raise QueryError(f"неизвестная агрегация {funcs!r}, допустимы: {', '.join(AGG_FUNCS)}")
+    return funcs
+
+
+def _flatten(frame):
+    """составные названия столбцов (после agg со списком функций) в 'столбец_функция'"""
+    if isinstance(frame.columns, pd.MultiIndex):
+        frame = frame.copy()
+        frame.columns = ['_'.join(str(part) for part in col if part != '') for col in frame.columns]
+    return frame
+
+
+def query_rows(df, request):
+    """строки по условиям: where, columns, sort_by, ascending, limit"""
+    df = apply_where(df, request.get('where'))
+    if request.get('sort_by'):
+        df = df.sort_values(check_columns(df, request['sort_by']), ascending=request.get('ascending', True))
+    if request.get('columns'):
+        df = df[check_columns(df, request['columns'])]
+    return {'matched': len(df), 'rows': df.head(_limit(request))}
+
+
+def query_top(df, request):
+    """n строк с наибольшими (smallest - наименьшими) значениями by"""
+    df = apply_where(df, request.get('where'))
+    by = check_columns(df, request['by'])
+    n = _limit(request, 'n', 10)
+    if all(pd.api.types.is_numeric_dtype(df[col]) for col in by):
+        top = df.nsmallest(n, by) if request.get('smallest') else df.nlargest(n, by)
+    else:
+        top = df.sort_values(by, ascending=bool(request.get('smallest'))).head(n)
+    columns = check_columns(df, request['columns']) if request.get('columns') else None
+    return top if columns is None else top[columns]
+
+
+def query_counts(df, request):
+    """частоты значений столбца (первые n), normalize - доли"""
+    df = apply_where(df, request.get('where'))
+    col = check_columns(df, request['column'])[0]
+    counts = df[col].value_counts(normalize=bool(request.get('normalize')))
+    return counts.head(_limit(request, 'n', 10))
+
+
+def query_pivot(df, request):
+    """сводная таблица: index, columns, values, aggfunc"""
+    df = apply_where(df, request.get('where'))
+    index = check_columns(df, request['index'])
+    columns = check_columns(df, request['columns']) if request.get('columns') else None
+    values = check_columns(df, request['values']) if request.get('values') else None
+    pivot = df.pivot_table(index=index, columns=columns, values=values,
+                           aggfunc=check_aggfuncs(request.get('aggfunc', 'mean')), observed=True)
+    return _flatten(pivot).round(int(request.get('round', 2)))
+
+
+def query_group(df, request):
+    """агрегаты по группам: by, agg {столбец: функция или список}, sort_by, ascending, limit"""
+    df = apply_where(df, request.get('where'))
+    by = check_columns(df, request['by'])
+    agg = request.get('agg') or {'ova': 'mean'}
+    if not isinstance(agg, dict):
+        raise QueryError("agg - словарь {столбец: функция или список функций}")
+    check_columns(df, list(agg))
+    for funcs in agg.values():
+        check_aggfuncs(funcs)
+    grouped = _flatten(df.groupby(by, observed=True).agg(agg))
+    if request.get('sort_by'):
+        grouped = grouped.sort_values(request['sort_by'], ascending=request.get('ascending', False))
+    return grouped.head(_limit(request)).round(int(request.get('round', 2)))
+
+
+def _numeric_columns(df, request):
+    if request.get('columns'):
+        return check_columns(df, request['columns'])
+    # dummy-столбцы позиций в числовые сводки по умолчанию не входят
+    return [col for col in df.select_dtypes('number').columns if not str(col).startswith('position_')]
+
+
+def _corr_cache_dir(request):
+    """матрицы отфильтрованных строк на диск не сохраняются: их слишком много разных"""
+    return None if request.get('where') else _service['cache_dir']
+
+
+def query_corr(df, request):
+    """корреляции столбцов (по умолчанию всех числовых) из общей матрицы, method - pearson/spearman"""
+    df = apply_where(df, request.get('where'))
+    matrix = correlation_submatrix(df, _numeric_columns(df, request), request.get('method', 'pearson'),
+                                   _corr_cache_dir(request))
+    return matrix.round(int(request.get('round', 3)))
+
+
+def query_pairs(df, request):
+    """сильнейшие пары признаков: k первых и/или |r| > threshold"""
+    df = apply_where(df, request.get('where'))
+    matrix = correlation_submatrix(df, _numeric_columns(df, request), request.get('method', 'pearson'),
+                                   _corr_cache_dir(request))
+    pairs = top_pairs(matrix, k=request.get('k', 10), threshold=request.get('threshold'))
+    return pairs.round(int(request.get('round', 3)))
+
+
+def query_describe(df, request):
+    """описательные статистики как в statistical_analysis.py (descriptive_stats.py) и коэффициент вариации"""
+    df = apply_where(df, request.get('where'))
+    stats = describe_columns(df, _numeric_columns(df, request)).copy()
+    stats['cv_pct'] = stats['std'] / stats['mean'].where(stats['mean'] != 0) * 100
+    return stats.round(int(request.get('round', 2)))
+
+
+def query_crosstab(df, request):
+    """таблица сопряженности index x columns; normalize - как в pd.crosstab"""
+    df = apply_where(df, request.get('where'))
+    index = check_columns(df, request['index'])[0]
+    columns = check_columns(df, request['columns'])[0]
+    table = pd.crosstab(df[index], df[columns], normalize=request.get('normalize', False))
+    table.columns = table.columns.astype(str)
+    return table.round(int(request.get('round', 3)))
+
+
+QUERIES = {
+    'rows': query_rows,
+    'top': query_top,
+    'counts': query_counts,
+    'pivot': query_pivot,
+    'group': query_group,
+    'corr': query_corr,
+    'pairs': query_pairs,
+    'describe': query_describe,
+    'crosstab': query_crosstab,
+}
+
+
+def run_query(request):
+    """выполнение запроса к текущему набору; одинаковые запросы к одной версии берутся из кэша"""
+    kind = request.get('kind')
+    if kind not in QUERIES:
+        raise QueryError(f"неизвестный запрос '{kind}', допустимы: {', '.join(QUERIES)}")
+    key = json.dumps(request, sort_keys=True, default=str)
+    with _service['lock']:
+        df, version = _service['df'], _service['version']
+        cached = _service['results'].get((version, key))
+        if cached is not None:
+            _service['results'].move_to_end((version, key))
+            return cached
+    if df is None:
+        raise QueryError("набор еще не загружен")
+    try:
+        value = structured(QUERIES[kind](df, request))
+    except KeyError as e:
+        raise QueryError(f"не хватает параметра или столбца: {e}") from e
+    except (TypeError, ValueError) as e:
+        raise QueryError(str(e)) from e
+    result = {'kind': kind, 'version': version, 'value': value}
+    with _service['lock']:
+        results = _service['results']
+        results[(version, key)] = result
+        while len(results) > RESULT_CACHE_SIZE:
+            results.popitem(last=False)
+    return result
+
+
+def health():
+    """состояние сервиса: источник, размер набора, версия и время загрузки"""
+    df = _service['df']
+    return {
+        'source': _service['source'],
+        'version': _service['version'],
+        'rows': None if df is None else len(df),
+        'columns': None if df is None else [str(col) for col in df.columns],
+        'loaded_at': _service['loaded_at'],
+        'load_s': _service['load_s'],
+        'queries': list(QUERIES),
+    }
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    """GET /health и POST /query; ответы - json"""
+
+    def _respond(self, status, data):
+        body = json.dumps(data, ensure_ascii=False, default=json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self._respond(200, health())
+        else:
+            self._respond(404, {'error': f"нет пути '{self.path}'"})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/query':
+            self._respond(404, {'error': f"нет пути '{self.path}'"})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self._respond(413, {'error': 'слишком большой запрос'})
+            return
+        start = time.perf_counter()
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise QueryError("запрос должен быть json-объектом")
+            result = run_query(request)
+        except (QueryError, ValueError) as e:
+            self._respond(400, {'error': str(e)})
+            return
+        except Exception as e:
+            # ошибка одного запроса не останавливает сервис
+            self._respond(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+        self._respond(200, {**result, 'seconds': time.perf_counter() - start})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    """основная функция"""
+    parser = argparse.ArgumentParser(description='сервис анализа очищенного набора fifa в памяти')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='адрес (по умолчанию только локальный)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='порт')
+    parser.add_argument('--input', default=None,
+                        help='очищенный файл (по умолчанию players_cleaned.parquet/.feather/.csv)')
+    parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL,
+                        help='период проверки нового файла, секунды')
+    parser.add_argument('--no-cache', action='store_true', help='не использовать дисковый кэш csv')
+    parser.add_argument('--verbose', action='store_true', help='печатать каждый запрос')
+    args = parser.parse_args()
+
+    _service.update(input=args.input, cache_dir=None if args.no_cache else CACHE_DIR)
+    load_dataset()
+    stop = threading.Event()
+    watcher = threading.Thread(target=watch_source, args=(stop, args.reload_interval), daemon=True)
+    watcher.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), AnalysisHandler)
+    server.verbose = args.verbose
+    print(f"Сервис анализа: http://{args.host}:{server.server_port} (Ctrl+C - остановка)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
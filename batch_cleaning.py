@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+пакетная очистка нескольких выпусков (players.csv разных лет) в пуле процессов
+каждый файл очищается отдельным процессом в свой каталог вывода; отчет очистки пишется рядом
+с результатом в json (таблицы не форматируются), а общая сводка по времени и строкам - в json
+запуск: python batch_cleaning.py 'releases/*.csv' --output-dir cleaned --workers 4
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import pyarrow as pa
+
+from data_cleaning import (COLUMNAR_CODECS, COLUMNAR_COMPRESSION, COLUMNAR_FORMAT, COLUMNAR_FORMATS,
+                           clean_in_memory, clean_streaming)
+from reporting import LEVELS, SUMMARY, configure, write_json
+from stage_cache import CACHE_DIR
+
+OUTPUT_DIR = 'cleaned'
+SUMMARY_FILE = 'batch_summary.json'
+
+
+def expand_inputs(patterns):
+    """список файлов по путям и шаблонам glob (без повторов, в порядке аргументов)"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def output_names(paths):
+    """имена результатов: players.csv -> players_cleaned.csv
+
+    одинаковые имена файлов из разных каталогов (fifa21/players.csv, fifa22/players.csv)
+    различаются именем каталога: fifa21_players_cleaned.csv
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    names = []
+    for path, stem in zip(paths, stems):
+        if stems.count(stem) > 1:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            stem = f'{parent}_{stem}'
+        names.append(f'{stem}_cleaned.csv')
+    return names
+
+
+def init_worker(arrow_threads):
+    """настройка процесса пула: потоки pyarrow делятся между процессами, предупреждения скрыты"""
+    pa.set_cpu_count(arrow_threads)
+    warnings.filterwarnings('ignore')
+
+
+def clean_release(input_file, output_file, chunksize, columnar, compression, cache_dir,
+                  verbosity=LEVELS[SUMMARY]):
+    """очистка одного выпуска в процессе пула; отчет очистки сохраняется в json рядом с результатом,
+    а остальной вывод (ошибки) - в лог"""
+    log_file = os.path.splitext(output_file)[0] + '.log'
+    report_file = os.path.splitext(output_file)[0] + '.report.json'
+    result = {
+        'input': input_file,
+        'output': output_file,
+        'log': log_file,
+        'report': report_file,
+        'mode': 'streaming' if chunksize else 'memory',
+        'status': 'ok',
+        'error': None,
+        'rows_in': None,
+        'rows_out': None,
+    }
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    configure(verbosity, report_file)
+    with open(log_file, 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+        try:
+            if chunksize:
+                stages = clean_streaming(input_file, output_file, chunksize, columnar, compression,
+                                         cache_dir=cache_dir)
+                # при результате из кэша второго прохода нет и строки не считаются
+                if 'pass2.load' in stages:
+                    result['rows_in'] = stages['pass2.load']['rows_out']
+                    result['rows_out'] = stages['pass2.write']['rows_out']
+            else:
+                context = {}
+                df_clean, _ = clean_in_memory(input_file, output_file, columnar, compression,
+                                              cache_dir=cache_dir, context=context)
+                result['rows_in'] = context['initial_shape'][0]
+                result['rows_out'] = len(df_clean)
+        except Exception as e:
+            # ошибка одного выпуска не останавливает остальные
+            result['status'] = 'error'
+            result['error'] = f'{type(e).__name__}: {e}'
+            print(result['error'])
+        write_json(input_file=input_file, output_file=output_file, status=result['status'])
+    result['wall_s'] = time.perf_counter() - wall_start
+    result['cpu_s'] = time.process_time() - cpu_start
+    return result
+
+
+def run_batch(inputs, output_dir=OUTPUT_DIR, workers=None, chunksize=None, columnar=COLUMNAR_FORMAT,
+              compression=COLUMNAR_COMPRESSION, cache_dir=CACHE_DIR, verbosity=LEVELS[SUMMARY]):
+    """очистка списка файлов в пуле из workers процессов; возвращает сводку по выпускам"""
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(inputs)))
+    arrow_threads = max(1, (os.cpu_count() or 1) // workers)
+    outputs = [os.path.join(output_dir, name) for name in output_names(inputs)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(arrow_threads,)) as pool:
+        futures = [pool.submit(clean_release, input_file, output_file, chunksize, columnar, compression,
+                               cache_dir, verbosity)
+                   for input_file, output_file in zip(inputs, outputs)]
+        for future in as_completed(futures):
+            result = future.result()
+            status = 'готово' if result['status'] == 'ok' else f"ошибка ({result['error']})"
+            print(f"{result['input']}: {status} за {result['wall_s']:.2f} с")
+            results.append(result)
+    # сводка в порядке входных файлов, а не завершения
+    results.sort(key=lambda result: inputs.index(result['input']))
+    return results
+
+
+def print_summary(results, wall_s, workers, summary_file=None):
+    """общая таблица по выпускам, итоги и, если указан файл, сохранение в json"""
+    print("\n" + "="*50)
+    print("СВОДКА ПАКЕТНОЙ ОЧИСТКИ")
+    print("="*50)
+    table = pd.DataFrame(results).set_index('input')
+    print(table[['status', 'mode', 'rows_in', 'rows_out', 'wall_s', 'cpu_s']].round(3))
+
+    rows_in = table['rows_in'].fillna(0).sum()
+    cpu_s = table['cpu_s'].sum()
+    print(f"\nФайлов: {len(table)}, с ошибками: {(table['status'] != 'ok').sum()}")
+    print(f"Строк на входе: {rows_in:.0f}, на выходе: {table['rows_out'].fillna(0).sum():.0f}")
+    # процессорное время всех процессов к общему времени - сколько ядер в среднем было занято
+    print(f"Общее время: {wall_s:.2f} с, процессорное по файлам: {cpu_s:.2f} с, "
+          f"занято ядер в среднем: {cpu_s / wall_s if wall_s else 0:.1f} из {workers} процессов")
+    if wall_s:
+        print(f"Пропускная способность: {rows_in / wall_s:.0f} строк/с")
+
+    if summary_file:
+        data = {'workers': workers, 'wall_s': wall_s, 'releases': results}
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        print(f"Сводка сохранена в '{summary_file}'")
+
+
+def main():
+    """основная функция"""
+    parser = argparse.ArgumentParser(description='пакетная очистка нескольких выпусков fifa')
+    parser.add_argument('inputs', nargs='+', help='исходные csv или шаблоны glob (в кавычках)')
+    parser.add_argument('--output-dir', default=OUTPUT_DIR, help='каталог очищенных файлов и логов')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='количество процессов (по умолчанию - число ядер)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='потоковый режим для каждого файла: количество строк в одной части')
+    parser.add_argument('--columnar', choices=COLUMNAR_FORMATS, default=COLUMNAR_FORMAT,
+                        help='типизированная копия рядом с каждым csv (none - не писать)')
+    parser.add_argument('--compression', default=COLUMNAR_COMPRESSION, help='сжатие типизированной копии')
+    parser.add_argument('--summary', default=None,
+                        help=f'json со сводкой (по умолчанию {SUMMARY_FILE} в каталоге вывода)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help='каталог кэша результатов этапов (не больше CACHE_MAX_BYTES, старые записи вытесняются)')
+    parser.add_argument('--no-cache', action='store_true', help='очищать заново, не используя кэш')
+    parser.add_argument('--verbosity', choices=LEVELS, default=LEVELS[SUMMARY],
+                        help='подробность json-отчета каждого выпуска (full - со всеми таблицами)')
+    args = parser.parse_args()
+
+    if args.columnar != 'none' and args.compression not in COLUMNAR_CODECS[args.columnar]:
+        parser.error(f"сжатие {args.compression} недоступно для {args.columnar}: "
+                     f"{', '.join(COLUMNAR_CODECS[args.columnar])}")
+    inputs = expand_inputs(args.inputs)
+    missing = [path for path in inputs if not os.path.exists(path)]
+    if missing:
+        parser.error(f"файлы не найдены: {', '.join(missing)}")
+
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(inputs)))
+    print(f"Очистка {len(inputs)} файлов в {workers} процессах, результаты в '{args.output_dir}'")
+    wall_start = time.perf_counter()
+    results = run_batch(inputs, args.output_dir, workers, args.chunksize, args.columnar, args.compression,
+                        None if args.no_cache else args.cache_dir, args.verbosity)
+    summary_file = args.summary or os.path.join(args.output_dir, SUMMARY_FILE)
+    print_summary(results, time.perf_counter() - wall_start, workers, summary_file)
+    return 0 if all(result['status'] == 'ok' for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
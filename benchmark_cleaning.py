@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+бенчмарк векторизованных парсеров очистки против прежних построчных реализаций
+запуск: python benchmark_cleaning.py [количество строк]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from cleaning_parsers import encode_positions, parse_height, parse_team_contract, parse_weight
+
+REPEATS = 3
+
+
+def split_team_contract_apply(value):
+    """прежняя построчная реализация разбора team_and_contract (эталон)"""
+    if pd.isna(value) or value == 'nan':
+        return pd.Series([np.nan, np.nan, np.nan])
+
+    value = str(value).strip()
+    lines = value.split('\n')
+
+    if len(lines) >= 2:
+        team = lines[0].strip()
+        contract = lines[1].strip()
+
+        if '~' in contract:
+            years = contract.split('~')
+            if len(years) == 2:
+                start_year = years[0].strip()
+                end_year = years[1].strip()
+                try:
+                    start_year = int(start_year)
+                    end_year = int(end_year)
+                except ValueError:
+                    start_year = np.nan
+                    end_year = np.nan
+                return pd.Series([team, start_year, end_year])
+
+        return pd.Series([team, np.nan, np.nan])
+    else:
+        return pd.Series([value, np.nan, np.nan])
+
+
+def position_dummies_apply(series):
+    """прежнее построение dummy-столбцов: отдельный проход apply на каждую позицию (эталон)"""
+    positions_split = series.astype(str).str.split()
+    all_positions = set()
+    for positions in positions_split.dropna():
+        if isinstance(positions, list):
+            all_positions.update(positions)
+    all_positions.discard('nan')
+
+    dummies = pd.DataFrame(index=series.index)
+    for position in sorted(all_positions):
+        dummies[f'position_{position.lower()}'] = positions_split.apply(
+            lambda x: 1 if isinstance(x, list) and position in x else 0
+        )
+    return dummies
+
+
+def convert_height_apply(height_str):
+    """прежний построчный перевод роста в сантиметры (эталон)"""
+    if pd.isna(height_str):
+        return np.nan
+    height_str = str(height_str).strip()
+    if "'" in height_str:
+        parts = height_str.replace('"', '').split("'")
+        if len(parts) == 2:
+            feet = int(parts[0])
+            inches = int(parts[1]) if parts[1] else 0
+            return feet * 30.48 + inches * 2.54
+    return np.nan
+
+
+def convert_weight_legacy(series):
+    """прежний перевод веса через astype(str) и str.extract (эталон)"""
+    return series.astype(str).str.extract(r'(\d+)').astype(float)[0] * 0.453592
+
+
+def make_team_contract_sample(n_rows, seed=0):
+    """синтетический столбец team_and_contract в виде после приведения к нижнему регистру"""
+    rng = np.random.default_rng(seed)
+    clubs = np.array(['fc barcelona', 'juventus', 'paris saint-germain', 'fc bayern münchen',
+                      'liverpool', 'real madrid', 'ac milan', 'ajax'])
+    start = rng.integers(2010, 2021, n_rows)
+    end = start + rng.integers(1, 6, n_rows)
+    values = pd.Series(clubs[rng.integers(0, len(clubs), n_rows)], dtype=object)
+    values = values + '\n' + pd.Series(start).astype(str) + ' ~ ' + pd.Series(end).astype(str)
+    kind = rng.random(n_rows)
+    values[kind < 0.05] = 'olympique de marseille\njun 30, 2021 on loan'
+    values[(kind >= 0.05) & (kind < 0.07)] = 'free'
+    values[(kind >= 0.07) & (kind < 0.08)] = 'nan'
+    return values
+
+
+def make_positions_sample(n_rows, seed=0):
+    """синтетический столбец positions: 1-2 позиции через пробел"""
+    rng = np.random.default_rng(seed)
+    positions = np.array(['gk', 'cb', 'lb', 'rb', 'lwb', 'rwb', 'cdm', 'cm', 'cam',
+                          'lm', 'rm', 'lw', 'rw', 'cf', 'st'])
+    values = pd.Series(positions[rng.integers(0, len(positions), n_rows)], dtype=object)
+    second = rng.random(n_rows) < 0.6
+    values[second] = values[second] + ' ' + positions[rng.integers(0, len(positions), second.sum())]
+    return values
+
+
+def make_units_sample(n_rows, seed=0):
+    """синтетические столбцы height (5'9") и weight (159lbs)"""
+    rng = np.random.default_rng(seed)
+    inches_total = rng.integers(62, 80, n_rows)
+    height = (pd.Series(inches_total // 12).astype(str) + "'"
+              + pd.Series(inches_total % 12).astype(str) + '"')
+    weight = pd.Series(rng.integers(120, 230, n_rows)).astype(str) + 'lbs'
+    return height.astype(object), weight.astype(object)
+
+
+def time_call(func, *args):
+    """лучшее время из REPEATS запусков"""
+    best = float('inf')
+    result = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def benchmark_team_contract(n_rows):
+    """сравнение apply-реализации и векторизованного парсера team_and_contract"""
+    sample = make_team_contract_sample(n_rows)
+    apply_time, expected = time_call(lambda s: s.apply(split_team_contract_apply), sample)
+    vector_time, actual = time_call(parse_team_contract, sample)
+
+    expected.columns = actual.columns
+    pd.testing.assert_series_equal(actual['club_name'], expected['club_name'], check_dtype=False)
+    for col in ['contract_start_year', 'contract_end_year']:
+        pd.testing.assert_series_equal(actual[col].astype('float64'), expected[col].astype('float64'))
+
+    print(f"team_and_contract, {n_rows:,} строк:")
+    print(f"  apply: {apply_time:.3f} c")
+    print(f"  векторизованный парсер: {vector_time:.3f} c")
+    print(f"  ускорение: {apply_time / vector_time:.1f}x (результаты совпадают)")
+
+
+def benchmark_positions(n_rows):
+    """сравнение apply по каждой позиции и однопроходного кодировщика"""
+    sample = make_positions_sample(n_rows)
+    apply_time, expected = time_call(position_dummies_apply, sample)
+    dense_time, dense = time_call(encode_positions, sample)
+    sparse_time, sparse = time_call(lambda s: encode_positions(s, sparse=True), sample)
+
+    pd.testing.assert_frame_equal(dense, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(sparse.sparse.to_dense().astype('int64'), expected)
+
+    expected_mb = expected.memory_usage(deep=True).sum() / 1024**2
+    dense_mb = dense.memory_usage(deep=True).sum() / 1024**2
+    sparse_mb = sparse.memory_usage(deep=True).sum() / 1024**2
+    print(f"positions, {n_rows:,} строк, {len(expected.columns)} позиций:")
+    print(f"  apply: {apply_time:.3f} c, {expected_mb:.2f} MB")
+    print(f"  uint8: {dense_time:.3f} c, {dense_mb:.2f} MB")
+    print(f"  sparse bool: {sparse_time:.3f} c, {sparse_mb:.2f} MB")
+    print(f"  ускорение uint8: {apply_time / dense_time:.1f}x (результаты совпадают)")
+
+
+def benchmark_units(n_rows):
+    """сравнение построчного перевода роста/веса и векторизованных парсеров"""
+    height, weight = make_units_sample(n_rows)
+    legacy_time, (expected_height, expected_weight) = time_call(
+        lambda h, w: (h.apply(convert_height_apply), convert_weight_legacy(w)), height, weight)
+    vector_time, (height_cm, weight_kg) = time_call(
+        lambda h, w: (parse_height(h), parse_weight(w)), height, weight)
+
+    pd.testing.assert_series_equal(height_cm, expected_height.astype('float32'))
+    pd.testing.assert_series_equal(weight_kg, expected_weight.astype('float32'), check_names=False)
+
+    print(f"height/weight, {n_rows:,} строк:")
+    print(f"  apply + astype(str): {legacy_time:.3f} c")
+    print(f"  векторизованные парсеры: {vector_time:.3f} c")
+    print(f"  ускорение: {legacy_time / vector_time:.1f}x (результаты совпадают)")
+
+
+def main():
+    """основная функция"""
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    benchmark_team_contract(n_rows)
+    benchmark_positions(n_rows)
+    benchmark_units(n_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+замеры всей очистки на синтетических players.csv разных размеров с сохраненным эталоном
+каждый запуск - отдельный процесс data_cleaning.py без кэша, поэтому пиковая память не
+смешивается между размерами; время, пропускная способность и память берутся из отчета этапов
+запуск: python benchmark_pipeline.py --sizes 10k 1m             (замер и сравнение с эталоном)
+        python benchmark_pipeline.py --sizes 10k 1m --save-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from synthetic_players import parse_size, size_label, write_players
+
+SIZES = ['10k', '1m']
+DATA_DIR = 'benchmark_data'
+RESULTS_FILE = 'benchmark_results.json'
+BASELINE_FILE = 'benchmark_baseline.json'
+REPEATS = 1
+# файлы больше этого очищаются потоково, чтобы 10m строк не держать в памяти целиком
+STREAMING_MIN_ROWS = 2_000_000
+STREAMING_CHUNKSIZE = 500_000
+# замедление этапа больше этой доли (и больше MIN_REGRESSION_S) считается регрессией
+REGRESSION_SHARE = 0.1
+MIN_REGRESSION_S = 0.05
+
+CLEANER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_cleaning.py')
+
+
+def dataset_path(data_dir, n_rows, seed):
+    """синтетический файл размера n_rows; создается при первом обращении и переиспользуется"""
+    path = os.path.join(data_dir, f'players_{size_label(n_rows)}_seed{seed}.csv')
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        print(f"Генерация {n_rows} строк в '{path}'")
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        write_players(tmp_path, n_rows, seed)
+        os.replace(tmp_path, path)
+    return path
+
+
+def run_cleaner(input_file, chunksize, extra_args):
+    """очистка в отдельном процессе; возвращает отчет этапов и пиковый rss процесса (МБ или None)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_file = os.path.join(tmp_dir, 'report.json')
+        command = [sys.executable, CLEANER, '--no-cache', '--input', input_file,
+                   '--output', os.path.join(tmp_dir, 'players_cleaned.csv'), '--report', report_file]
+        if chunksize:
+            command += ['--chunksize', str(chunksize)]
+        command += extra_args
+        log_file = os.path.join(tmp_dir, 'clean.log')
+        with open(log_file, 'w', encoding='utf-8') as log:
+            process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+            peak_rss_mb = None
+            if hasattr(os, 'wait4'):
+                # wait4 возвращает ресурсы именно этого процесса, ru_maxrss в linux - в килобайтах
+                _, status, usage = os.wait4(process.pid, 0)
+                process.returncode = os.waitstatus_to_exitcode(status)
+                peak_rss_mb = usage.ru_maxrss / 1024
+            else:
+                process.wait()
+        if process.returncode != 0:
+            with open(log_file, encoding='utf-8') as log:
+                tail = log.read()[-2000:]
+            raise RuntimeError(f"очистка '{input_file}' завершилась с кодом {process.returncode}:\n{tail}")
+        with open(report_file, encoding='utf-8') as f:
+            report = json.load(f)
+    return report, peak_rss_mb
+
+
+def summarize_run(report, peak_rss_mb, n_rows):
+    """итоги запуска и метрики этапов: время, строки в секунду, прирост пиковой памяти"""
+    stages = {}
+    for entry in report['stages']:
+        rows = entry['rows_in'] or entry['rows_out']
+        stages[entry['stage']] = {
+            'wall_s': entry['wall_s'],
+            'cpu_s': entry['cpu_s'],
+            'rows_per_s': rows / entry['wall_s'] if entry['wall_s'] and rows else None,
+            'peak_rss_delta_mb': entry['peak_rss_delta_mb'],
+        }
+    wall_s = sum(stage['wall_s'] for stage in stages.values())
+    return {
+        'rows': n_rows,
+        'mode': report.get('mode'),
+        'wall_s': wall_s,
+        'rows_per_s': n_rows / wall_s if wall_s else None,
+        'peak_rss_mb': peak_rss_mb,
+        'stages': stages,
+    }
+
+
+def run_benchmarks(sizes, data_dir=DATA_DIR, seed=0, repeats=REPEATS, chunksize=None, extra_args=()):
+    """замеры по размерам; из повторов берется самый быстрый запуск"""
+    runs = {}
+    for size in sizes:
+        n_rows = parse_size(size)
+        input_file = dataset_path(data_dir, n_rows, seed)
+        size_chunksize = chunksize or (STREAMING_CHUNKSIZE if n_rows >= STREAMING_MIN_ROWS else None)
+        best = None
+        for repeat in range(repeats):
+            report, peak_rss_mb = run_cleaner(input_file, size_chunksize, list(extra_args))
+            run = summarize_run(report, peak_rss_mb, n_rows)
+            print(f"{size_label(n_rows)}, запуск {repeat + 1}: {run['wall_s']:.2f} с, "
+                  f"{run['rows_per_s']:.0f} строк/с, пик памяти {run['peak_rss_mb'] or 0:.0f} МБ")
+            if best is None or run['wall_s'] < best['wall_s']:
+                best = run
+        runs[size_label(n_rows)] = best
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'repeats': repeats,
+            'cleaner_args': list(extra_args),
+        },
+        'runs': runs,
+    }
+
+
+def stage_frame(run):
+    """метрики этапов одного размера в виде таблицы"""
+    table = pd.DataFrame(run['stages']).T[['wall_s', 'cpu_s', 'rows_per_s', 'peak_rss_delta_mb']].astype(float)
+    table = table.round({'wall_s': 3, 'cpu_s': 3, 'peak_rss_delta_mb': 1})
+    table['rows_per_s'] = table['rows_per_s'].round().astype('Int64')
+    return table
+
+
+def print_results(results):
+    """таблицы этапов по размерам"""
+    for label, run in results['runs'].items():
+        print("\n" + "="*50)
+        print(f"{label.upper()} ({run['rows']} строк, режим {run['mode']})")
+        print("="*50)
+        print(stage_frame(run))
+        print(f"Всего: {run['wall_s']:.2f} с, {run['rows_per_s']:.0f} строк/с, "
+              f"пик памяти процесса: {run['peak_rss_mb'] or 0:.0f} МБ")
+
+
+def compare_results(results, baseline):
+    """сравнение с эталоном по этапам; возвращает список регрессий (размер, этап, было, стало)"""
+    regressions = []
+    if baseline['environment'].get('cpu_count') != results['environment']['cpu_count']:
+        print("\nВнимание: эталон снят на машине с другим числом ядер, сравнение приблизительное")
+    for label, run in results['runs'].items():
+        base = baseline['runs'].get(label)
+        if base is None:
+            print(f"\n{label}: в эталоне нет такого размера")
+            continue
+        if base['mode'] != run['mode']:
+            # этапы потокового режима называются иначе, сравнивается только общее время
+            print(f"\n{label}: режим {run['mode']}, в эталоне {base['mode']}")
+        rows = []
+        for stage, metrics in {'total': run, **run['stages']}.items():
+            base_metrics = base if stage == 'total' else base['stages'].get(stage)
+            if base_metrics is None:
+                continue
+            before, after = base_metrics['wall_s'], metrics['wall_s']
+            change = (after - before) / before if before else None
+            regression = (change is not None and change > REGRESSION_SHARE
+                          and after - before > MIN_REGRESSION_S)
+            if regression:
+                regressions.append((label, stage, before, after))
+            rows.append({'stage': stage, 'baseline_s': before, 'current_s': after,
+                         'change_%': None if change is None else change * 100,
+                         'regression': '!' if regression else ''})
+        print("\n" + "="*50)
+        print(f"СРАВНЕНИЕ С ЭТАЛОНОМ: {label}")
+        print("="*50)
+        print(pd.DataFrame(rows).set_index('stage').round(3))
+        if run.get('peak_rss_mb') and base.get('peak_rss_mb'):
+            print(f"Пик памяти: {base['peak_rss_mb']:.0f} -> {run['peak_rss_mb']:.0f} МБ")
+    return regressions
+
+
+def main():
+    """основная функция"""
+    parser = argparse.ArgumentParser(description='замеры очистки на синтетических данных')
+    parser.add_argument('--sizes', nargs='+', default=SIZES, help='размеры: 10k 1m 10m или число строк')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='каталог синтетических файлов')
+    parser.add_argument('--seed', type=int, default=0, help='seed генератора данных')
+    parser.add_argument('--repeats', type=int, default=REPEATS, help='повторов на размер (берется лучший)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help=f'потоковый режим для всех размеров (по умолчанию от {STREAMING_MIN_ROWS} строк)')
+    parser.add_argument('--results', default=RESULTS_FILE, help='json с результатами замеров')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='json с эталоном')
+    parser.add_argument('--save-baseline', action='store_true', help='сохранить результаты как эталон')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='код возврата 1 при регрессии относительно эталона')
+    args, extra_args = parser.parse_known_args()
+    # остальные аргументы (например --text-parallel process) передаются очистке
+
+    results = run_benchmarks(args.sizes, args.data_dir, args.seed, args.repeats, args.chunksize, extra_args)
+    print_results(results)
+    with open(args.results, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультаты сохранены в '{args.results}'")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Эталон сохранен в '{args.baseline}'")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"Эталона '{args.baseline}' нет: сохраните его флагом --save-baseline")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_results(results, baseline)
+    if regressions:
+        print(f"\nРегрессии (медленнее эталона больше чем на {REGRESSION_SHARE:.0%}):")
+        for label, stage, before, after in regressions:
+            print(f"  {label} {stage}: {before:.3f} -> {after:.3f} с")
+    else:
+        print("\nРегрессий относительно эталона нет")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
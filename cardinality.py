@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+оценка числа уникальных значений скетчем hyperloglog
+скетч - массив из 2**HLL_PRECISION регистров, обновляется векторно и объединяется
+поэлементным максимумом, поэтому одинаков при любом разбиении файла на части
+"""
+
+import numpy as np
+import pandas as pd
+
+# 4096 регистров: стандартная ошибка оценки около 1.04 / sqrt(4096) = 1.6%
+HLL_PRECISION = 12
+HLL_REGISTERS = 1 << HLL_PRECISION
+HLL_ERROR = 1.04 / np.sqrt(HLL_REGISTERS)
+
+
+def new_sketch():
+    """пустой скетч"""
+    return np.zeros(HLL_REGISTERS, dtype=np.uint8)
+
+
+def _leading_zero_rank(values):
+    """номер первой единицы слева (число ведущих нулей + 1) для uint64"""
+    rank = np.ones(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        upper_empty = (values >> np.uint64(64 - shift)) == 0
+        rank += (upper_empty * shift).astype(np.uint8)
+        values = np.where(upper_empty, values << np.uint64(shift), values)
+    return rank
+
+
+def update_sketch(sketch, series):
+    """добавление непустых значений столбца в скетч (на месте)"""
+    values = series.dropna().to_numpy()
+    if len(values) == 0:
+        return sketch
+    # categorize=False: хеш каждого значения без предварительной факторизации
+    hashes = pd.util.hash_array(values, categorize=False)
+    registers = (hashes >> np.uint64(64 - HLL_PRECISION)).astype(np.intp)
+    rank = _leading_zero_rank(hashes << np.uint64(HLL_PRECISION))
+    np.maximum.at(sketch, registers, np.minimum(rank, 64 - HLL_PRECISION + 1))
+    return sketch
+
+
+def merge_sketches(sketch, other):
+    """объединение скетчей двух частей данных"""
+    return np.maximum(sketch, other)
+
+
+def estimate_distinct(sketch):
+    """оценка числа уникальных значений"""
+    m = HLL_REGISTERS
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.exp2(-sketch.astype(np.float64)))
+    zeros = np.count_nonzero(sketch == 0)
+    if estimate <= 2.5 * m and zeros:
+        # поправка для малых количеств: линейный подсчет по пустым регистрам
+        estimate = m * np.log(m / zeros)
+    return float(estimate)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+векторизованные парсеры сырых столбцов fifa
+используются скриптом data_cleaning.py и бенчмарками
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# первая строка - клуб, вторая (необязательная) - годы контракта вида "2004 ~ 2021"
+TEAM_CONTRACT_PATTERN = (
+    r'^(?P<club_name>[^\n]*)'
+    r'(?:\n[^\S\n]*(?P<contract_start_year>[+-]?\d+)[^\S\n]*~'
+    r'[^\S\n]*(?P<contract_end_year>[+-]?\d+)[^\S\n]*(?:\n|\Z))?'
+)
+
+CONTRACT_YEAR_DTYPE = 'Int32'
+
+# рост: 5'9" (футы и дюймы) или уже метрический 180cm / 180
+HEIGHT_PATTERN = (
+    r'^(?:(?P<feet>\d+)\s*\'\s*(?P<inches>\d*)\s*"?|(?P<cm>\d+(?:\.\d+)?)\s*(?:cm)?)$'
+)
+# вес: первое число и необязательная единица, строка без единицы считается фунтами
+WEIGHT_PATTERN = r'(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>kg|lbs?)?'
+
+FOOT_CM = 30.48
+INCH_CM = 2.54
+LB_KG = 0.453592
+
+
+def parse_team_contract(series):
+    """разбор team_and_contract на club_name, contract_start_year, contract_end_year за один проход"""
+    missing = series.isna() | (series == 'nan')
+    text = series.astype(str).str.strip()
+    parts = text.str.extract(TEAM_CONTRACT_PATTERN)
+
+    result = pd.DataFrame(index=series.index)
+    result['club_name'] = parts['club_name'].str.strip().mask(missing, np.nan)
+    for col in ['contract_start_year', 'contract_end_year']:
+        result[col] = pd.to_numeric(parts[col]).astype(CONTRACT_YEAR_DTYPE)
+    return result
+
+
+def _extract_groups(series, pattern):
+    """именованные группы регулярного выражения (re2 в pyarrow), пустая группа -> null"""
+    # строковый столбец передается без astype(str): пропуск становится null и так же не совпадает с шаблоном
+    values = series if pd.api.types.is_object_dtype(series) else series.astype(str)
+    text = pa.array(values.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    matches = pc.extract_regex(pc.utf8_lower(pc.utf8_trim_whitespace(text)), pattern)
+    groups = {}
+    for i, field in enumerate(matches.type):
+        values = pc.struct_field(matches, [i])
+        groups[field.name] = pc.if_else(pc.equal(values, ''), pa.scalar(None, pa.string()), values)
+    return groups
+
+
+def _to_float(values):
+    """строковый pyarrow-массив в float64 numpy (null -> NaN)"""
+    return pc.cast(values, pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def parse_height(series):
+    """рост в сантиметрах (float32) из футов и дюймов или из сантиметров"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float32')
+
+    groups = _extract_groups(series, HEIGHT_PATTERN)
+    feet = _to_float(groups['feet'])
+    inches = np.nan_to_num(_to_float(groups['inches']))
+    height_cm = np.where(np.isnan(feet), _to_float(groups['cm']), feet * FOOT_CM + inches * INCH_CM)
+    return pd.Series(height_cm, index=series.index, name=series.name).astype('float32')
+
+
+def parse_weight(series):
+    """вес в килограммах (float32) из фунтов или из килограммов
+
+    числовой столбец, как и у parse_height, считается уже метрическим (например, weight_kg
+    очищенного файла); фунты - только строки с 'lbs' или без единицы, как в исходном файле
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float32')
+
+    groups = _extract_groups(series, WEIGHT_PATTERN)
+    value = _to_float(groups['value'])
+    is_kg = pc.fill_null(pc.equal(groups['unit'], 'kg'), False).to_numpy(zero_copy_only=False)
+    weight_kg = np.where(is_kg, value, value * LB_KG)
+    return pd.Series(weight_kg, index=series.index, name=series.name).astype('float32')
+
+
+def _position_codes(series, positions=None):
+    """номера строк и отсортированные коды позиций для всех вхождений за один проход"""
+    tokens = series.astype(str).str.split()
+    lengths = tokens.str.len().to_numpy()
+    flat = tokens.explode().to_numpy()
+    rows = np.repeat(np.arange(len(series)), lengths)
+
+    # explode дает NaN на месте пустых списков, их нет в rows
+    flat = flat[pd.notna(flat)]
+    if positions is not None:
+        # фиксированный словарь позиций (например, общий для всех частей файла)
+        codes = pd.Index(positions).get_indexer(flat)
+        keep = codes >= 0
+        return rows[keep], codes[keep], list(positions)
+
+    codes, positions = pd.factorize(flat, sort=True)
+    positions = list(positions)
+    if 'nan' in positions:
+        nan_code = positions.index('nan')
+        keep = codes != nan_code
+        rows, codes = rows[keep], codes[keep]
+        codes = codes - (codes > nan_code)
+        positions.pop(nan_code)
+    return rows, codes, positions
+
+
+def positions_csr_matrix(series, positions=None):
+    """матрица вхождений позиций в формате csr (строки - игроки, столбцы - позиции)"""
+    from scipy import sparse
+
+    rows, codes, positions = _position_codes(series, positions)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.uint8), (rows, codes)),
+        shape=(len(series), len(positions)),
+    )
+    # повтор позиции в одной строке не должен давать 2
+    matrix.data[:] = 1
+    return matrix, [f'position_{position.lower()}' for position in positions]
+
+
+def encode_positions(series, sparse=False, positions=None):
+    """dummy-столбцы position_* за один проход: uint8 или разреженные bool"""
+    if sparse:
+        matrix, columns = positions_csr_matrix(series, positions)
+        dummies = (pd.DataFrame.sparse.from_spmatrix(matrix, columns=columns)
+                   .astype(pd.SparseDtype(bool, False)))
+        dummies.index = series.index
+        return dummies
+
+    rows, codes, positions = _position_codes(series, positions)
+    dummies = np.zeros((len(series), len(positions)), dtype=np.uint8)
+    dummies[rows, codes] = 1
+    columns = [f'position_{position.lower()}' for position in positions]
+    return pd.DataFrame(dummies, index=series.index, columns=columns)
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+декларативные преобразования исходных столбцов и их выполнение за один проход по столбцу
+описание - словарь {исходный столбец: имя преобразования}; каждое преобразование - одна
+функция над исходным столбцом, которая сама решает, нужен ли ей нижний регистр,
+поэтому строки не копируются промежуточными astype(str) и не разбираются повторно
+"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from cleaning_parsers import encode_positions, parse_height, parse_team_contract, parse_weight
+from reporting import SUMMARY, note
+
+# столбцы со звездами в названии ('★', 'star') без описания получают star_number
+STAR_NAME_MARKERS = ['★', 'star']
+
+# формат дат исходного файла ('Jul 1, 2004')
+DATE_FORMAT = '%b %d, %Y'
+
+# преобразования выполняются по уникальным значениям столбца, если их не больше такой доли строк
+MEMO_MAX_UNIQUE_SHARE = 0.5
+# результат этих преобразований зависит только от значения, поэтому он сохраняется в словаре
+# (значение -> результат) между частями файла и запусками; позиции зависят от словаря позиций,
+# текст в нижнем регистре почти не повторяется между выпусками, а даты дешево разбираются
+# по уникальным значениям части, и ошибка разбора не должна переживать запуск в словаре
+LOOKUP_TRANSFORMS = ['star_number', 'star_value', 'float32', 'height_cm', 'weight_kg', 'contract']
+LOOKUP_MAX_ENTRIES = 1000000
+
+
+def normalize_text(series):
+    """нижний регистр и обрезка пробелов; пропуск становится строкой 'nan', как после astype(str)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # для category достаточно обработать словарь, а не каждую строку
+        categories = series.cat.categories.astype(str).str.lower().str.strip().to_numpy(dtype=object)
+        codes = series.cat.codes.to_numpy()
+        if (codes == -1).any():
+            # код -1 (пропуск) попадет на последнюю, добавленную категорию 'nan'
+            categories = np.append(categories, 'nan')
+        values, inverse = np.unique(categories, return_inverse=True)
+        return pd.Series(pd.Categorical.from_codes(inverse[codes], categories=values),
+                         index=series.index, name=series.name)
+    if pd.api.types.is_object_dtype(series):
+        return series.str.lower().str.strip().fillna('nan')
+    return series.astype(str).str.lower().str.strip()
+
+
+def as_text(series):
+    """строковый столбец как есть, остальные через astype(str)"""
+    return series if pd.api.types.is_object_dtype(series) else series.astype(str)
+
+
+def star_number(series):
+    """первое число в строке звездного рейтинга"""
+    return as_text(series).str.extract(r'(\d+)', expand=False).astype(float)
+
+
+def star_value(series):
+    """число из значения со звездой ('4 ★' -> 4.0)"""
+    return star_number(as_text(series).str.replace('★', '', regex=False))
+
+
+def parse_date(series):
+    """дата (datetime64) в формате DATE_FORMAT; нераспознанные значения становятся NaT
+
+    формат задан явно: без него pandas выводит формат по первому значению ('May 9, 2013' -> %B)
+    и остальные месяцы становятся NaT; строки в другом формате (например, '2013-05-09'
+    из уже очищенного файла) разбираются по отдельности (format='mixed')
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    try:
+        parsed = pd.to_datetime(series, format=DATE_FORMAT, errors='coerce')
+        other = parsed.isna().to_numpy() & series.notna().to_numpy()
+        if other.any():
+            parsed[other] = pd.to_datetime(series[other], format='mixed', errors='coerce')
+        return parsed
+    except (ValueError, TypeError):
+        note(f"Невозможно преобразовать {series.name} в дату", SUMMARY)
+        return series
+
+
+def to_float32(series):
+    """уже метрические значения (height_cm, weight_kg) в float32"""
+    return pd.to_numeric(series, errors='coerce').astype('float32')
+
+
+def height_columns(series):
+    """рост из футов и дюймов в столбец height_cm"""
+    return pd.DataFrame({'height_cm': parse_height(series)})
+
+
+def weight_columns(series):
+    """вес из фунтов в столбец weight_kg"""
+    return pd.DataFrame({'weight_kg': parse_weight(series)})
+
+
+def contract_columns(series):
+    """team_and_contract в club_name, contract_start_year, contract_end_year"""
+    return parse_team_contract(normalize_text(series))
+
+
+def position_columns(series, sparse=False, positions=None):
+    """позиции в нижнем регистре, dummy-столбцы position_* и positions_formatted через запятую"""
+    series = normalize_text(series)
+    dummies = encode_positions(series, sparse=sparse, positions=positions)
+    formatted = series.astype(str).str.replace(' ', ',').rename('positions_formatted')
+    return pd.concat([series, dummies, formatted], axis=1)
+
+
+# функция преобразования возвращает Series (столбец заменяется на месте) или DataFrame
+# (исходный столбец удаляется, если его нет среди результатов, новые добавляются в конец)
+TRANSFORMS = {
+    'lower': normalize_text,
+    'keep': None,
+    'star_number': star_number,
+    'star_value': star_value,
+    'date': parse_date,
+    'float32': to_float32,
+    'height_cm': height_columns,
+    'weight_kg': weight_columns,
+    'contract': contract_columns,
+    'positions': position_columns,
+}
+
+
+def memoized(func, series, lookup=None, learn=False):
+    """func, примененная к уникальным значениям series и развернутая по кодам factorize
+
+    с learn известные результаты берутся из lookup (исходные значения в индексе), а разбираются
+    только новые значения; возвращает результат и новые строки словаря (или None)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # category и так обрабатываются по словарю
+        return func(series), None
+    codes, uniques = pd.factorize(series)
+    if len(uniques) > MEMO_MAX_UNIQUE_SHARE * len(series):
+        return func(series), None
+
+    values = pd.Series(uniques, name=series.name)
+    if learn and lookup is not None:
+        values = values[~values.isin(lookup.index).to_numpy()]
+    missing = codes == -1
+    # пропуск разбирается вместе с уникальными значениями (например, становится строкой 'nan')
+    parsed = func(pd.concat([values, series[missing].iloc[:1]], ignore_index=True))
+    learned = None
+    if learn:
+        learned = parsed.iloc[:len(values)]
+        learned.index = pd.Index(values.to_numpy(), dtype=object)
+        table = learned if lookup is None else pd.concat([lookup, learned])
+        table = table.loc[uniques]
+        if missing.any():
+            table = pd.concat([table, parsed.iloc[len(values):]])
+        table = table.reset_index(drop=True)
+        if learned.empty:
+            learned = None
+    else:
+        table = parsed
+
+    # пропуск - последняя строка таблицы
+    codes = np.where(missing, len(table) - 1, codes)
+    result = table.take(codes)
+    result.index = series.index
+    if isinstance(result, pd.Series):
+        result.name = series.name
+    return result, learned
+
+
+def update_lookups(lookups, compiled, outputs):
+    """дополнение словарей LOOKUP_TRANSFORMS новыми значениями; True, если что-то добавилось"""
+    changed = False
+    for col, name, _ in compiled:
+        learned = outputs[col][1]
+        if learned is None or name not in LOOKUP_TRANSFORMS:
+            continue
+        lookup = lookups.get(name)
+        if lookup is not None:
+            if len(lookup) >= LOOKUP_MAX_ENTRIES:
+                continue
+            learned = pd.concat([lookup, learned[~learned.index.isin(lookup.index)]])
+        lookups[name] = learned
+        changed = True
+    return changed
+
+
+def compile_transforms(df, spec, keep_case, sparse=False, positions=None, lookups=None):
+    """список (столбец, имя, функция) для столбцов набора по описанию spec
+
+    порядок - порядок spec, затем остальные столбцы; столбцы вне описания получают 'star_number'
+    по названию или 'lower' для текста (кроме keep_case); 'keep' и числовые столбцы не трогаются;
+    функции выполняются по уникальным значениям (memoized) и возвращают (результат, новые значения),
+    а с lookups преобразования LOOKUP_TRANSFORMS берут известные значения из словарей
+    """
+    resolved = {}
+    for col in df.columns:
+        if col in spec:
+            name = spec[col]
+        elif any(marker in str(col).lower() for marker in STAR_NAME_MARKERS):
+            name = 'star_number'
+        elif col in keep_case or not (pd.api.types.is_object_dtype(df[col])
+                                      or isinstance(df[col].dtype, pd.CategoricalDtype)):
+            name = 'keep'
+        else:
+            name = 'lower'
+        if name not in TRANSFORMS:
+            raise ValueError(f"неизвестное преобразование '{name}' для столбца {col}")
+        if TRANSFORMS[name] is not None:
+            resolved[col] = name
+
+    order = [col for col in spec if col in resolved] + [col for col in resolved if col not in spec]
+    compiled = []
+    for col in order:
+        func = TRANSFORMS[resolved[col]]
+        if func is position_columns:
+            # словарь позиций фиксируется заранее, чтобы процессы и части файла получили одни столбцы
+            func = partial(position_columns, sparse=sparse, positions=positions)
+        learn = lookups is not None and resolved[col] in LOOKUP_TRANSFORMS
+        lookup = lookups.get(resolved[col]) if learn else None
+        compiled.append((col, resolved[col], partial(memoized, func, lookup=lookup, learn=learn)))
+    return compiled
+
+
+def apply_transforms(df, compiled, outputs):
+    """сборка результатов преобразований (outputs[столбец] = (результат, ...)) в набор за одно объединение
+
+    Series заменяют столбец на месте, новые столбцы добавляются в конец в порядке compiled
+    """
+    added = []
+    dropped = []
+    for col, _, _ in compiled:
+        result = outputs[col][0]
+        if isinstance(result, pd.Series):
+            df[col] = result
+            continue
+        if col in result.columns:
+            df[col] = result[col]
+            result = result.drop(columns=col)
+        else:
+            dropped.append(col)
+        added.append(result)
+    if dropped:
+        df = df.drop(columns=dropped)
+    if added:
+        # столбцы результата заменяют одноименные существующие (height_cm и из height, и из файла)
+        new_columns = [col for frame in added for col in frame.columns]
+        df = pd.concat([df.drop(columns=[col for col in new_columns if col in df.columns]), *added], axis=1)
+    return df
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+корреляции всех числовых признаков одной матрицей с кэшем и выбор сильных пар
+матрица считается один раз по всем числовым столбцам набора матричным произведением (blas),
+скрипты берут из нее нужные подматрицы; ключ кэша - хеш значений числовых столбцов и метода,
+матрица хранится в памяти процесса и в .analysis_cache/, поэтому скрипты анализа,
+запущенные друг за другом, считают ее один раз
+пары выбираются из верхнего треугольника матрицы без циклов по ячейкам
+"""
+
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from dataset_loader import CACHE_DIR
+
+METHODS = ['pearson', 'spearman']
+# увеличивается при изменении расчета, чтобы не использовать старые матрицы из кэша
+ENGINE_VERSION = 1
+
+# матрицы, посчитанные в процессе: хеш -> DataFrame; самые старые вытесняются
+_matrices = {}
+MAX_MATRICES = 32
+
+
+def numeric_columns(df):
+    """все числовые столбцы набора (в том числе nullable UInt/Int)"""
+    return df.select_dtypes('number').columns.tolist()
+
+
+def dataset_hash(df, columns, method):
+    """хеш значений столбцов, их названий и метода: ключ матрицы в кэше"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((ENGINE_VERSION, method, [str(col) for col in columns])).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _pearson(block):
+    """матрица пирсона по столбцам блока float64; пропуски - попарно, как в pandas corr"""
+    valid = ~np.isnan(block)
+    counts = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # центрирование уменьшает потерю точности в суммах ниже
+        block = block - np.nanmean(block, axis=0)
+        if valid.all():
+            norms = np.sqrt((block ** 2).sum(axis=0))
+            scaled = block / norms
+            matrix = scaled.T @ scaled
+        else:
+            # суммы по строкам, где есть оба столбца пары: четыре матричных произведения
+            mask = valid.astype('float64')
+            values = np.where(valid, block, 0.0)
+            pair_counts = mask.T @ mask
+            sums = values.T @ mask
+            squares = (values ** 2).T @ mask
+            products = values.T @ values
+            covariance = products - sums * sums.T / pair_counts
+            variance = squares - sums ** 2 / pair_counts
+            matrix = covariance / np.sqrt(variance * variance.T)
+            matrix[pair_counts < 2] = np.nan
+    matrix = np.clip(matrix, -1.0, 1.0)
+    constant = ~(np.nanstd(block, axis=0) > 0) | (counts < 2)
+    matrix[constant, :] = np.nan
+    matrix[:, constant] = np.nan
+    diagonal = np.flatnonzero(~constant)
+    matrix[diagonal, diagonal] = 1.0
+    return matrix
+
+
+def _ranks(block):
+    """средние ранги значений в каждом столбце; пропуски остаются пропусками"""
+    return pd.DataFrame(block).rank(method='average').to_numpy(dtype='float64')
+
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, f'corr_{key}.pkl')
+
+
+def _load_cached(cache_dir, key):
+    path = _cache_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def _save_cached(cache_dir, key, matrix):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(cache_dir, key)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(matrix, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def correlation_matrix(df, method='pearson', cache_dir=CACHE_DIR):
+    """корреляции всех числовых столбцов набора (кэш в памяти и в cache_dir; None - только в памяти)
+
+    spearman - пирсон по рангам; при пропусках ранги считаются по всему столбцу,
+    а не заново для каждой пары, как в pandas
+    """
+    if method not in METHODS:
+        raise ValueError(f"неизвестный метод '{method}', допустимы: {', '.join(METHODS)}")
+    columns = numeric_columns(df)
+    key = dataset_hash(df, columns, method)
+    matrix = _matrices.get(key)
+    if matrix is None and cache_dir is not None:
+        matrix = _load_cached(cache_dir, key)
+    if matrix is None:
+        block = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+        if method == 'spearman':
+            block = _ranks(block)
+        matrix = pd.DataFrame(_pearson(block), index=columns, columns=columns)
+        if cache_dir is not None:
+            _save_cached(cache_dir, key, matrix)
+    _matrices.pop(key, None)
+    _matrices[key] = matrix
+    while len(_matrices) > MAX_MATRICES:
+        _matrices.pop(next(iter(_matrices)), None)
+    return matrix
+
+
+def correlation_submatrix(df, columns, method='pearson', cache_dir=CACHE_DIR):
+    """корреляции только columns (в их порядке) из общей матрицы набора"""
+    matrix = correlation_matrix(df, method, cache_dir)
+    missing = [col for col in columns if col not in matrix.columns]
+    if missing:
+        raise KeyError(f"нет числовых столбцов: {', '.join(map(str, missing))}")
+    return matrix.loc[columns, columns]
+
+
+def top_pairs(matrix, k=None, threshold=None, absolute=True):
+    """пары из верхнего треугольника матрицы по убыванию силы связи
+
+    threshold оставляет пары с |r| > threshold (или r > threshold при absolute=False), k - первые k;
+    результат - feature_1, feature_2, correlation, индекс - номер пары в порядке обхода треугольника
+    """
+    values = matrix.to_numpy()
+    rows, cols = np.triu_indices(len(values), k=1)
+    correlations = values[rows, cols]
+    strength = np.abs(correlations) if absolute else correlations
+    keep = ~np.isnan(correlations)
+    if threshold is not None:
+        keep &= strength > threshold
+    selected = np.flatnonzero(keep)
+    order = selected[np.argsort(-strength[selected], kind='stable')]
+    if k is not None:
+        order = order[:k]
+    labels = matrix.columns
+    # номера пар - среди отобранных, в порядке треугольника (как при обходе двумя циклами)
+    return pd.DataFrame({
+        'feature_1': labels[rows[order]],
+        'feature_2': labels[cols[order]],
+        'correlation': correlations[order],
+    }, index=np.searchsorted(selected, order))
@@ -1,306 +1,106 @@
 # улучшенная очистка данных fifa игроков
-import pandas as pd
-import numpy as np
+# запуск целиком в памяти: python data_cleaning.py
+# потоковый режим по частям: python data_cleaning.py --chunksize 100000
+# из другого кода: from data_cleaning import clean_in_memory; df, stages = clean_in_memory(...)
+# рядом с csv пишется типизированный players_cleaned.parquet (--columnar feather|none, --compression)
+import argparse
+import os
+import pickle
+import sys
 import warnings
-warnings.filterwarnings('ignore')
-
-pd.set_option('display.max_columns', None)
-pd.set_option('display.width', None)
-pd.set_option('display.max_colwidth', None)
-
-try:
-    df = pd.read_csv('players.csv', encoding='utf-8')
-except Exception as e:
-    print(f'Ошибка при загрузке файла: {e}')
-    sys.exit(1)
-
-# удалить лишние символы
-df.columns = (df.columns
-              .str.lower()
-              .str.replace(' ', '_')
-              .str.replace('-', '_')
-              .str.replace('&', 'and')
-              .str.replace('↓', '')
-              .str.replace('/', '_')
-              .str.replace('(', '')
-              .str.replace(')', '')
-              .str.strip('_'))
-
-print("\nНазвания столбцов после приведения к змеиному регистру:")
-print(df.columns.tolist())
-
-# привести текстовые данные к нижнему регистру (кроме имен игроков)
-text_columns = df.select_dtypes(include=['object']).columns
-for col in text_columns:
-    if col not in ['id', 'playerurl', 'photourl', 'name', 'full_name']:
-        df[col] = df[col].astype(str).str.lower().str.strip()
-
-print("\nТекстовые данные приведены к нижнему регистру (кроме имен игроков)")
-
-# разделить столбец team_and_contract на части
-if 'team_and_contract' in df.columns:
-    print("\nРазделение столбца team_and_contract на название клуба, год начала и год окончания...")
-    
-    def split_team_contract(value):
-
-        if pd.isna(value) or value == 'nan':
-            return pd.Series([np.nan, np.nan, np.nan])
-        
-        value = str(value).strip()
-        lines = value.split('\n')
-        
-        if len(lines) >= 2:
-            team = lines[0].strip()
-            contract = lines[1].strip()
-            
-            if '~' in contract:
-                years = contract.split('~')
-                if len(years) == 2:
-                    start_year = years[0].strip()
-                    end_year = years[1].strip()
-                    try:
-                        start_year = int(start_year)
-                        end_year = int(end_year)
-                    except ValueError:
-                        start_year = np.nan
-                        end_year = np.nan
-                    return pd.Series([team, start_year, end_year])
-            
-            return pd.Series([team, np.nan, np.nan])
-        else:
-            return pd.Series([value, np.nan, np.nan])
-    
-    df[['club_name', 'contract_start_year', 'contract_end_year']] = df['team_and_contract'].apply(split_team_contract)
-    df = df.drop('team_and_contract', axis=1)
-    print("Столбец team_and_contract разделен на club_name, contract_start_year, contract_end_year")
-
-# обработать позиции игроков
-if 'positions' in df.columns:
-    print("\nОбработка позиций игроков...")
-    
-    positions_split = df['positions'].astype(str).str.split()
-    
-    all_positions = set()
-    for positions in positions_split.dropna():
-        if isinstance(positions, list):
-            all_positions.update(positions)
-    
-    all_positions.discard('nan')
-    
-    print(f"Найдено уникальных позиций: {sorted(all_positions)}")
-    
-    for position in sorted(all_positions):
-        df[f'position_{position.lower()}'] = positions_split.apply(
-            lambda x: 1 if isinstance(x, list) and position in x else 0
-        )
-    
-    # сохранить позиции как строку, разделенную запятыми для удобства
-    df['positions_formatted'] = df['positions'].astype(str).str.replace(' ', ',')
-    
-    print("Позиции преобразованы и созданы dummy переменные")
-    print("Создан столбец 'positions_formatted' с позициями через запятую без пробелов (например: cm,st)")
-
-# преобразовать рост из футов и дюймов в сантиметры
-if 'height' in df.columns:
-    print("\nПреобразование роста из футов и дюймов в сантиметры")
-    def convert_height(height_str):
-        if pd.isna(height_str):
-            return np.nan
-        height_str = str(height_str).strip()
-        if "'" in height_str:
-            parts = height_str.replace('"', '').split("'")
-            if len(parts) == 2:
-                feet = int(parts[0])
-                inches = int(parts[1]) if parts[1] else 0
-                return feet * 30.48 + inches * 2.54
-        return np.nan
-    
-    df['height_cm'] = df['height'].apply(convert_height)
-    df = df.drop('height', axis=1)
-
-# преобразовать вес из фунтов в килограммы
-if 'weight' in df.columns:
-    print("\nПреобразование веса из фунтов в килограммы")
-    df['weight_kg'] = df['weight'].astype(str).str.extract('(\d+)').astype(float) * 0.453592
-    df = df.drop('weight', axis=1)
-
-# обработать звездные рейтинги и удалить звезды из определенных столбцов
-star_columns = [col for col in df.columns if '★' in str(col) or 'star' in str(col).lower()]
-for col in star_columns:
-    if col in df.columns:
-        print(f"\nИзвлечение числового значения из {col}")
-        df[col] = df[col].astype(str).str.extract('(\d+)').astype(float)
-
-# удалить звезды из столбцов w_f, ir, sm
-columns_to_clean_stars = ['w_f', 'ir', 'sm']
-for col in columns_to_clean_stars:
-    if col in df.columns:
-        print(f"\nУдаление звезд из столбца {col}")
-        df[col] = df[col].astype(str).str.replace('★', '', regex=False).str.extract('(\d+)').astype(float)
-        print(f"Столбец {col} очищен от звезд")
-
-# удалить ненужные денежные столбцы, если они есть
-date_columns = ['joined', 'loan_date_end']
-for col in date_columns:
-    if col in df.columns:
-        print(f"\nПреобразование {col} в формат даты")
-        try:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
-        except:
-            print(f"Невозможно преобразовать {col} в дату")
-
-# проверка на пропущенные значения
-print("\nПроверка на пропущенные значения:")
-missing_data = df.isnull().sum()
-missing_percentage = (missing_data / len(df)) * 100
-missing_info = pd.DataFrame({
-    'количество_пропусков': missing_data,
-    'процент_пропусков': missing_percentage
-})
-missing_info = missing_info[missing_info['количество_пропусков'] > 0]
-print(missing_info)
-
-if missing_info.empty:
-    print("Пропущенных значений не найдено")
-else:
-    print("\nОбработка пропущенных значений:")
-    for col in missing_info.index:
-        missing_pct = missing_info.loc[col, 'процент_пропусков']
-        
-        if missing_pct <= 5:
-            if df[col].dtype in ['int64', 'float64', 'float32']:
-                if abs(df[col].skew()) > 1:
-                    fill_value = df[col].median()
-                    df[col].fillna(fill_value, inplace=True)
-                    print(f"Заполнен {col} медианой: {fill_value:.2f} (данные имеют асимметричное распределение)")
-                else:
-                    fill_value = df[col].mean()
-                    df[col].fillna(fill_value, inplace=True)
-                    print(f"Заполнен {col} средним: {fill_value:.2f} (данные имеют нормальное распределение)")
-            else:
-                fill_value = df[col].mode()[0] if not df[col].mode().empty else 'unknown'
-                df[col].fillna(fill_value, inplace=True)
-                print(f"Заполнен {col} модой: {fill_value} (наиболее частое значение)")
-        else:
-            print(f"Столбец {col} имеет {missing_pct:.1f}% пропусков, требует индивидуального рассмотрения")
 
-# анализ и изменение типов данных
-for col in df.columns:
-    current_type = df[col].dtype
-    old_type = current_type
-    if col in ['age', 'ova', 'pot'] and current_type == 'object':
-        try:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        except:
-            pass
-    elif current_type == 'object' and col not in ['positions_list']:
-        try:
-            unique_count = df[col].nunique()
-            if unique_count < 50:
-                df[col] = df[col].astype('category')
-        except TypeError:
-            pass
-    new_type = df[col].dtype
-    if old_type != new_type:
-        print(f"Столбец '{col}' преобразован: {old_type} -> {new_type}")
-
-# оптимизация типов данных
-for col in df.columns:
-    old_type = df[col].dtype
-    if df[col].dtype == 'int64':
-        if df[col].min() >= 0 and df[col].max() <= 255:
-            df[col] = df[col].astype('uint8')
-        elif df[col].min() >= 0 and df[col].max() <= 65535:
-            df[col] = df[col].astype('uint16')
-        elif df[col].min() >= -128 and df[col].max() <= 127:
-            df[col] = df[col].astype('int8')
-        elif df[col].min() >= -32768 and df[col].max() <= 32767:
-            df[col] = df[col].astype('int16')
-    elif df[col].dtype == 'float64':
-        if df[col].min() >= np.finfo(np.float32).min and df[col].max() <= np.finfo(np.float32).max:
-            df[col] = df[col].astype('float32')
-    new_type = df[col].dtype
-    if old_type != new_type:
-        print(f"Столбец '{col}' оптимизирован: {old_type} -> {new_type}")
-
-# проверка на дубликаты
-initial_shape = df.shape
-duplicates = df.duplicated()
-duplicate_count = duplicates.sum()
-
-print(f"\nКоличество дубликатов: {duplicate_count}")
-
-if duplicate_count > 0:
-    print("Примеры дубликатов:")
-    print(df[duplicates].head())
-    
-    print("Возможные причины дубликатов:")
-    print("Технические ошибки при сборе данных")
-    print("Повторные записи об одном игроке")
-    print("Ошибки в системе учета")
-    
-    df_clean = df.drop_duplicates()
-    print(f"Размер после удаления дубликатов: {df_clean.shape}")
-    print(f"Удалено строк: {initial_shape[0] - df_clean.shape[0]}")
-else:
-    print("Дубликатов не найдено")
-    df_clean = df.copy()
-
-# удалить ненужные денежные столбцы, если они есть
-columns_to_drop = ['value', 'wage', 'release_clause']
-df_clean = df_clean.drop(columns=columns_to_drop, errors='ignore')
-
-for col in ['joined', 'loan_date_end']:
-    if col in df_clean.columns:
-        df_clean[col] = pd.to_datetime(df_clean[col], errors='coerce')
-        print(f"Столбец '{col}' преобразован в datetime: {df_clean[col].dtype}")
-
-# итоговая статистика
-print("\n" + "="*50)
-print("ИТОГОВАЯ СТАТИСТИКА")
-print("="*50)
-print(f"Исходный размер данных: {initial_shape}")
-print(f"Финальный размер данных: {df_clean.shape}")
-print(f"Удалено строк: {initial_shape[0] - df_clean.shape[0]}")
-print(f"Обработано столбцов: {len(df_clean.columns)}")
-
-missing_percentage = (df_clean.isnull().sum().sum() / (df_clean.shape[0] * df_clean.shape[1])) * 100
-print("\nКачество данных:")
-print(f"Процент пропущенных значений: {missing_percentage:.2f}%")
-print(f"Целостность данных: {100 - missing_percentage:.2f}%")
-print(f"Готовность к анализу: {'да' if missing_percentage < 1 else 'требует дополнительной обработки'}")
-
-
-# показать результат до и после
-print("\n" + "="*50)
-print("СРАВНЕНИЕ ДО И ПОСЛЕ ОЧИСТКИ")
-print("="*50)
-
-# загрузить исходные данные еще раз для сравнения
-df_original = pd.read_csv('players.csv', encoding='utf-8')
-print("СТОЛБЦЫ В df_original:")
-print(df_original.columns.tolist())
-print("\nПОСЛЕ ОЧИСТКИ")
-print("Первые 3 строки очищенных данных:")
-print(df_clean.head(3))
-
-print("\nОСНОВНЫЕ ИЗМЕНЕНИЯ")
-print(f"1. Столбцы: {len(df_original.columns)} → {len(df_clean.columns)}")
-print(f"2. Строки: {len(df_original)} → {len(df_clean)}")
-print(f"3. Размер в памяти: {df_original.memory_usage(deep=True).sum() / 1024**2:.2f} MB → {df_clean.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
-
-if 'positions_formatted' in df_clean.columns:
-    print(f"4. Позиции преобразованы (пример): {df_clean['positions_formatted'].dropna().iloc[0] if len(df_clean['positions_formatted'].dropna()) > 0 else 'нет данных'}")
-
-if 'club_name' in df_clean.columns and 'contract_start_year' in df_clean.columns:
-    print(f"5. team_and_contract разделен на club_name, contract_start_year, contract_end_year")
-
-# сохранение очищенных данных
-df_clean.to_csv('players_cleaned.csv', index=False)
-print(f"Очищенные данные сохранены в 'players_cleaned.csv'")
-
-# cоответствие новых столбцов их исходным столбцам в оригинальных данных (используются имена столбцов из исходного CSV)
-column_mapping = {
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
+
+from cardinality import HLL_ERROR, estimate_distinct, new_sketch, update_sketch
+from column_transforms import apply_transforms, compile_transforms, update_lookups
+from duplicates import find_duplicates, find_near_duplicates
+from memory_optimizer import downcast_target, memory_report
+from parallel_columns import PARALLEL_MODES, map_columns
+from pipeline_runner import iter_stage, measure_stage, run_stages, save_stage_report, stage_table
+from players_schema import NA_VALUES, RAW_SCHEMA, RAW_SKIP_COLUMNS
+from reporting import FULL, SUMMARY, add_arguments, configure, enabled, metric, note, section, write_json
+from stage_cache import (CACHE_DIR, CACHE_VERSION, file_digest, load_lookups, output_path, restore_output,
+                         save_lookups, stage_keys, store_output)
+
+INPUT_FILE = 'players.csv'
+OUTPUT_FILE = 'players_cleaned.csv'
+
+# типизированная копия результата: сохраняет uint8/float32/category/datetime, которые теряются в csv
+COLUMNAR_FORMAT = 'parquet'
+COLUMNAR_COMPRESSION = 'zstd'
+COLUMNAR_FORMATS = ['parquet', 'feather', 'none']
+# feather (arrow ipc) поддерживает только lz4 и zstd
+COLUMNAR_CODECS = {
+    'parquet': ['zstd', 'snappy', 'gzip', 'brotli', 'lz4', 'none'],
+    'feather': ['zstd', 'lz4', 'none'],
+}
+
+# разреженные bool вместо плотных uint8 для dummy-столбцов позиций
+POSITION_DUMMIES_SPARSE = False
+
+# текстовые столбцы, которые не приводятся к нижнему регистру (имена игроков и ссылки)
+TEXT_CASE_EXCLUDE = ['id', 'playerurl', 'photourl', 'name', 'full_name']
+# преобразования исходных столбцов (названия после normalize_column_names), см. column_transforms.TRANSFORMS;
+# новые столбцы добавляются в конец в этом порядке, остальной текст приводится к нижнему регистру
+COLUMN_TRANSFORMS = {
+    'team_and_contract': 'contract',
+    'positions': 'positions',
+    'height': 'height_cm',
+    'height_cm': 'float32',
+    'weight': 'weight_kg',
+    'weight_kg': 'float32',
+    'w_f': 'star_value',
+    'ir': 'star_value',
+    'sm': 'star_value',
+    'joined': 'date',
+    'loan_date_end': 'date',
+}
+MONEY_COLUMNS = ['value', 'wage', 'release_clause']
+
+# построчные строковые преобразования по столбцам (регистр, звезды): 'serial', 'thread' или 'process';
+# результат одинаков в любом режиме, части меньше TEXT_PARALLEL_MIN_ROWS строк обрабатываются последовательно
+TEXT_PARALLEL = 'serial'
+TEXT_WORKERS = os.cpu_count() or 1
+TEXT_PARALLEL_MIN_ROWS = 10000
+
+# пропуски заполняются автоматически, только если их не больше этого процента
+MAX_FILL_MISSING_PCT = 5
+# заполнение внутри групп (например 'bp' - лучшая позиция или 'nationality'); None - по всему набору;
+# группы, где значений меньше IMPUTE_GROUP_MIN_ROWS, и строки без группы заполняются общим значением
+IMPUTE_GROUP_BY = None
+IMPUTE_GROUP_MIN_ROWS = 5
+# object-столбцы с числом уникальных значений меньше max(CATEGORY_MAX_UNIQUE, CATEGORY_MAX_RATIO * строк)
+# переводятся в category
+CATEGORY_MAX_UNIQUE = 50
+CATEGORY_MAX_RATIO = 0.05
+# частоты не собираются для столбцов, где по скетчу уникальна больше чем такая доля строк
+# (ссылки, имена): category из них не получится, а мода при пропусках собирается отдельным проходом
+CATEGORY_UNIQUE_SHARE = 0.5
+# типы, которые сужаются по глобальным минимуму и максимуму
+DOWNCAST_TYPES = ['int64', 'float64', 'Int32', 'Int64']
+
+# дубликаты: хеш строк по DEDUP_KEYS (None - все столбцы, кроме производных от positions);
+# NEAR_DUPLICATES дополнительно удаляет похожие записи одного игрока (другие ссылки, фото):
+# тот же блок NEAR_DUP_BLOCK (страна и возраст - год рождения в выпуске), то же начало фамилии
+# и сходство полного имени по триграммам не меньше NEAR_DUP_MIN_SIMILARITY
+DEDUP_KEYS = None
+NEAR_DUPLICATES = False
+NEAR_DUP_BLOCK = ['nationality', 'age']
+NEAR_DUP_NAME = 'longname'
+NEAR_DUP_MIN_SIMILARITY = 0.8
+
+# инкрементальный режим: ключ строк и доля изменений с последней полной очистки,
+# после которой сохраненные значения заполнения и категории пересчитываются полной очисткой
+DELTA_KEY = 'id'
+DELTA_REBUILD_PCT = 10
+
+# соответствие новых столбцов их исходным столбцам (имена из исходного csv) для сравнения до/после
+COMPARISON_COLUMNS = {
     'club_name': 'Team & Contract',
     'contract_start_year': 'Team & Contract',
     'contract_end_year': 'Team & Contract',
@@ -308,36 +108,1269 @@ column_mapping = {
     'weight_kg': 'Weight',
     'positions_formatted': 'Positions',
 }
+COMPARISON_TAIL_ROWS = 50
+
+# типы pyarrow для объявленных в схеме столбцов
+ARROW_TYPES = {
+    'text': pa.string(),
+    'category': pa.dictionary(pa.int32(), pa.string()),
+    'int64': pa.float64(),
+}
+
+
+class CleaningError(Exception):
+    """ошибка очистки (например, файл не читается); процесс не завершается, решает вызывающий код"""
+
+
+def normalize_column_names(columns):
+    """приведение названий столбцов к змеиному регистру без спецсимволов"""
+    return (pd.Index(columns)
+            .str.lower()
+            .str.replace(' ', '_')
+            .str.replace('-', '_')
+            .str.replace('&', 'and')
+            .str.replace('↓', '')
+            .str.replace('/', '_')
+            .str.replace('(', '')
+            .str.replace(')', '')
+            .str.strip('_'))
+
+
+def _can_cast(values, arrow_type):
+    """все непустые строки столбца приводятся к arrow_type"""
+    try:
+        pc.cast(values, arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return False
+    return True
+
+
+def infer_column_types(path, columns, parse_options):
+    """типы необъявленных в схеме столбцов по всему файлу: int64, затем float64, иначе строка"""
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: pa.string() for col in columns}, include_columns=columns,
+        null_values=NA_VALUES, strings_can_be_null=True)
+    inferred = {col: pa.int64() for col in columns}
+    for batch in pa_csv.open_csv(path, parse_options=parse_options, convert_options=convert_options):
+        for col in columns:
+            values = batch.column(col)
+            if inferred[col] == pa.int64() and not _can_cast(values, pa.int64()):
+                inferred[col] = pa.float64()
+            if inferred[col] == pa.float64() and not _can_cast(values, pa.float64()):
+                inferred[col] = pa.string()
+    return inferred
+
+
+def read_players(path, chunksize=None):
+    """чтение сырого csv по объявленной схеме через pyarrow целиком или по частям"""
+    header = pd.read_csv(path, encoding='utf-8', nrows=0).columns
+    columns = [col for col in header if col not in RAW_SKIP_COLUMNS]
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+
+    # целые читаются как float64 и сужаются до int64 после чтения, если пропусков нет
+    column_types = {col: ARROW_TYPES[RAW_SCHEMA[col]] for col in columns if col in RAW_SCHEMA}
+    undeclared = [col for col in columns if col not in RAW_SCHEMA]
+    if undeclared:
+        column_types.update(infer_column_types(path, undeclared, parse_options))
+    convert_options = pa_csv.ConvertOptions(
+        column_types=column_types, include_columns=columns,
+        null_values=NA_VALUES, strings_can_be_null=True)
+    integer_columns = [col for col in columns if RAW_SCHEMA.get(col) == 'int64']
+
+    if chunksize is None:
+        table = pa_csv.read_csv(path, parse_options=parse_options, convert_options=convert_options)
+        return _arrow_to_frame(table, integer_columns)
+
+    reader = pa_csv.open_csv(path, parse_options=parse_options, convert_options=convert_options)
+    return (_arrow_to_frame(table, integer_columns) for table in _rechunk(reader, chunksize))
+
+
+def _rechunk(reader, chunksize):
+    """перегруппировка блоков pyarrow в части по chunksize строк"""
+    pending = []
+    pending_rows = 0
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunksize:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunksize)
+            rest = table.slice(chunksize)
+            pending = rest.to_batches()
+            pending_rows = rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending)
+
+
+def _arrow_to_frame(table, integer_columns):
+    """таблица pyarrow в DataFrame; целые столбцы без пропусков -> int64"""
+    df = table.to_pandas()
+    for col in integer_columns:
+        values = df[col]
+        if not values.isna().any() and (values % 1 == 0).all():
+            df[col] = values.astype('int64')
+    return df
+
+
+def raw_snapshot(df, input_file):
+    """легкий снимок исходных данных для сравнения до/после вместо повторного чтения файла"""
+    columns = pd.read_csv(input_file, encoding='utf-8', nrows=0).columns.tolist()
+    before_columns = []
+    for col in columns:
+        if col in set(COMPARISON_COLUMNS.values()) and col in df.columns and col not in before_columns:
+            before_columns.append(col)
+    return {
+        'columns': columns,
+        'rows': len(df),
+        'memory_mb': df.memory_usage(deep=True).sum() / 1024**2,
+        # copy: дальнейшая очистка не должна менять снимок
+        'tail': df[before_columns].tail(COMPARISON_TAIL_ROWS).copy(),
+    }
+
+
+def load_raw(df, context):
+    """этап чтения: весь файл по объявленной схеме и снимок исходных данных для сравнения"""
+    try:
+        df = read_players(context['input_file'])
+    except Exception as e:
+        raise CleaningError(f'Ошибка при загрузке файла: {e}') from e
+    context['snapshot'] = raw_snapshot(df, context['input_file'])
+    # хеши сырых строк по id для следующего инкрементального запуска (--delta)
+    context['row_hashes'], _ = raw_row_hashes(df)
+    return df
+
+
+def rename_columns(df, context):
+    """этап приведения названий столбцов к змеиному регистру"""
+    # удалить лишние символы
+    df.columns = normalize_column_names(df.columns)
+
+    if context['verbose']:
+        section("\nНазвания столбцов после приведения к змеиному регистру:", lambda: df.columns.tolist())
+    return df
+
+
+def map_text_columns(df, funcs, context):
+    """словарь {столбец: func(df[столбец])}, параллельно по столбцам, если это задано в context"""
+    mode = context.get('text_parallel', TEXT_PARALLEL)
+    if len(df) < TEXT_PARALLEL_MIN_ROWS:
+        mode = 'serial'
+    return map_columns(df, funcs, mode, context.get('text_workers', TEXT_WORKERS))
+
+
+def transform_columns(df, context):
+    """этап преобразований исходных столбцов по COLUMN_TRANSFORMS: один проход на столбец"""
+    verbose = context['verbose']
+    # словари разобранных значений общие для частей файла и, с кэшем, для запусков
+    lookups = context.get('_lookups')
+    compiled = compile_transforms(df, COLUMN_TRANSFORMS, TEXT_CASE_EXCLUDE, sparse=POSITION_DUMMIES_SPARSE,
+                                  positions=context.get('positions'), lookups=lookups)
+    outputs = map_text_columns(df, [(col, func) for col, _, func in compiled], context)
+    df = apply_transforms(df, compiled, outputs)
+    if lookups is not None and update_lookups(lookups, compiled, outputs):
+        context['_lookups_changed'] = True
+
+    if verbose:
+        note("\nПреобразования столбцов:")
+        for col, name, _ in compiled:
+            if name != 'lower':
+                note(f"{col}: {name}")
+        lowered = sum(name == 'lower' for _, name, _ in compiled)
+        note(f"Текстовые данные приведены к нижнему регистру (кроме имен игроков): {lowered} столбцов")
+        if 'positions' in outputs:
+            positions = [col[len('position_'):] for col in outputs['positions'][0].columns
+                         if col.startswith('position_')]
+            note(f"Найдено уникальных позиций: {positions}")
+    return df
+
+
+# построчные этапы, не зависящие от статистик по всему датасету
+ROW_STAGES = [
+    ('rename_columns', rename_columns),
+    ('transform_columns', transform_columns),
+]
+
+
+def transform_rows(df, positions=None, verbose=True, lookups=None):
+    """построчные преобразования сырой части данных без замеров"""
+    context = {'positions': positions, 'verbose': verbose, '_lookups': lookups}
+    for _, func in ROW_STAGES:
+        df = func(df, context)
+    return df
+
+
+def update_statistics(stats, df):
+    """накопление статистик по части данных: пропуски, типы и частоты значений"""
+    if stats is None:
+        stats = {
+            'rows': 0,
+            'chunks': 0,
+            'columns': [],
+            'missing': pd.Series(dtype='int64'),
+            'dtypes': {},
+            'counts': {},
+            'dropped_counts': set(),
+            'sketches': {},
+        }
+    stats['rows'] += len(df)
+    stats['chunks'] += 1
+
+    for col in df.columns:
+        if col not in stats['columns']:
+            stats['columns'].append(col)
+
+    missing = df.isnull().sum()
+    stats['missing'] = stats['missing'].add(missing, fill_value=0).astype('int64')
+
+    for col in df.columns:
+        stats['dtypes'].setdefault(col, set()).add(str(df[col].dtype))
+        if pd.api.types.is_object_dtype(df[col]):
+            # скетч уникальных значений одинаков при любом разбиении на части и дешевле value_counts
+            sketch = stats['sketches'].setdefault(col, new_sketch())
+            update_sketch(sketch, df[col])
+            # частоты почти уникальных текстовых столбцов без пропусков не нужны:
+            # они не станут category, а мода понадобится, только если появятся пропуски
+            if (col not in stats['dropped_counts']
+                    and estimate_distinct(sketch) > CATEGORY_UNIQUE_SHARE * stats['rows']
+                    and stats['missing'].get(col, 0) == 0):
+                stats['counts'].pop(col, None)
+                stats['dropped_counts'].add(col)
+        if col in stats['dropped_counts']:
+            continue
+        counts = df[col].value_counts()
+        if isinstance(counts.index, pd.CategoricalIndex):
+            counts.index = counts.index.astype(object)
+        if col in stats['counts']:
+            counts = stats['counts'][col].add(counts, fill_value=0)
+        stats['counts'][col] = counts
+    return stats
+
+
+def category_limit(n_rows):
+    """порог числа уникальных значений для перевода в category"""
+    return max(CATEGORY_MAX_UNIQUE, CATEGORY_MAX_RATIO * n_rows)
+
+
+def category_candidates(stats, columns):
+    """object-столбцы, которые по оценке скетча могут стать category
+
+    оценка берется с запасом в три стандартные ошибки, а точное число уникальных
+    проверяется потом по частотам; решение не зависит от разбиения файла на части
+    """
+    limit = category_limit(stats['rows'])
+    return [col for col in columns
+            if col in stats['sketches']
+            and estimate_distinct(stats['sketches'][col]) < limit * (1 + 3 * HLL_ERROR)]
+
+
+def column_dtype(stats, col):
+    """общий тип столбца по всем частям (int64 + float64 -> float64)"""
+    dtypes = stats['dtypes'][col]
+    if len(dtypes) == 1:
+        return next(iter(dtypes))
+    if dtypes <= {'int64', 'float64'}:
+        return 'float64'
+    if 'object' in dtypes:
+        return 'object'
+    return sorted(dtypes)[0]
+
+
+def counts_statistics(counts):
+    """среднее, медиана, мода и асимметрия по частотам значений (одинаково для любого разбиения)"""
+    counts = counts[counts > 0].sort_index()
+    values = counts.index.to_numpy(dtype='float64')
+    weights = counts.to_numpy(dtype='float64')
+    n = weights.sum()
+
+    mean = np.dot(values, weights) / n
+
+    cumulative = np.cumsum(weights)
+    upper = values[np.searchsorted(cumulative, n // 2, side='right')]
+    if n % 2:
+        median = upper
+    else:
+        lower = values[np.searchsorted(cumulative, n // 2 - 1, side='right')]
+        median = (lower + upper) / 2
+
+    # асимметрия с поправкой на смещение, как в pandas.Series.skew
+    if n < 3:
+        skew = np.nan
+    else:
+        deviation = values - mean
+        m2 = np.dot(weights, deviation ** 2)
+        m3 = np.dot(weights, deviation ** 3)
+        skew = 0.0 if m2 == 0 else (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2 ** 1.5)
+
+    return {'mean': mean, 'median': median, 'mode': counts_mode(counts), 'skew': skew}
+
+
+def counts_mode(counts):
+    """наиболее частое значение, при равенстве - наименьшее (как Series.mode()[0])"""
+    counts = counts[counts > 0]
+    if counts.empty:
+        return 'unknown'
+    return counts[counts == counts.max()].sort_index().index[0]
+
+
+def group_fill_values(counts, method):
+    """значения заполнения всех групп сразу по частотам пар (группа, значение)
+
+    те же правила, что в counts_statistics и counts_mode, но одной векторной операцией
+    по всем группам; группы меньше IMPUTE_GROUP_MIN_ROWS не возвращаются
+    """
+    frame = counts[counts > 0].rename('n').reset_index()
+    frame.columns = ['group', 'value', 'n']
+    totals = frame.groupby('group', sort=False)['n'].sum()
+    totals = totals[totals >= IMPUTE_GROUP_MIN_ROWS]
+    frame = frame[frame['group'].isin(totals.index)]
+
+    if method == 'mode':
+        # наиболее частое значение группы, при равенстве - наименьшее
+        frame = frame.sort_values(['group', 'n', 'value'], ascending=[True, False, True])
+        return frame.groupby('group', sort=False)['value'].first()
+
+    frame = frame.assign(value=frame['value'].astype('float64'))
+    if method == 'mean':
+        weighted = (frame['value'] * frame['n']).groupby(frame['group'], sort=False).sum()
+        return weighted / totals
+
+    # медиана по накопленным частотам внутри группы
+    frame = frame.sort_values(['group', 'value'])
+    cumulative = frame.groupby('group', sort=False)['n'].cumsum()
+    total = frame['group'].map(totals)
+    upper = frame[cumulative > total // 2].groupby('group', sort=False)['value'].first()
+    lower = frame[cumulative > total // 2 - 1].groupby('group', sort=False)['value'].first()
+    upper = upper.reindex(totals.index)
+    lower = lower.reindex(totals.index)
+    return upper.where(totals % 2 == 1, (lower + upper) / 2)
+
+
+def fill_values(plan, col):
+    """все значения, которыми может быть заполнен столбец: общее и групповые"""
+    values = [plan['fills'][col]]
+    if col in plan['group_fills']:
+        values.extend(plan['group_fills'][col].tolist())
+    return values
+
+
+def frame_counts(df, columns, by=None):
+    """частоты значений столбцов набора; с by - частоты пар (значение by, значение столбца)"""
+    if by is None:
+        return {col: df[col].value_counts() for col in columns}
+    # словари категорий частей файла различаются, поэтому группы и значения-категории берутся как object
+    groups = df[by].astype(object)
+    counts = {}
+    for col in columns:
+        values = df[col].astype(object) if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col]
+        counts[col] = values.groupby(groups, sort=False).value_counts(sort=False)
+    return counts
+
+
+def plan_cleaning(stats, collect_counts=None):
+    """глобальный план очистки: значения заполнения, категории и целевые типы"""
+    plan = plan_imputation(stats, collect_counts)
+    return plan_dtypes(stats, plan, collect_counts)
+
+
+def plan_imputation(stats, collect_counts=None):
+    """часть плана для заполнения пропусков: общие типы частей и значения заполнения"""
+    n_rows = stats['rows']
+    plan = {
+        'columns': list(stats['columns']),
+        'positions': [col[len('position_'):] for col in stats['columns']
+                      if col.startswith('position_') and col != 'positions_formatted'],
+        'dtypes': {},
+        'fills': {},
+        'fill_methods': {},
+        'group_by': IMPUTE_GROUP_BY if IMPUTE_GROUP_BY in stats['columns'] else None,
+        'group_fills': {},
+        'to_numeric': [],
+        'categories': {},
+        'downcast': {},
+    }
+    for col in plan['columns']:
+        dtype = column_dtype(stats, col)
+        if len(stats['dtypes'][col]) > 1:
+            plan['dtypes'][col] = dtype
+
+    # проверка на пропущенные значения
+    missing_data = stats['missing'].reindex(plan['columns']).fillna(0).astype('int64')
+    missing_percentage = (missing_data / n_rows) * 100
+    missing_info = pd.DataFrame({
+        'количество_пропусков': missing_data,
+        'процент_пропусков': missing_percentage
+    })
+    missing_info = missing_info[missing_info['количество_пропусков'] > 0]
+    section("\nПроверка на пропущенные значения:", lambda: missing_info)
+
+    # моды высококардинальных текстовых столбцов с пропусками считаются отдельным проходом
+    need_counts = [col for col in missing_info.index
+                   if col in stats['dropped_counts']
+                   and missing_info.loc[col, 'процент_пропусков'] <= MAX_FILL_MISSING_PCT]
+    if need_counts and collect_counts is not None:
+        stats['counts'].update(collect_counts(need_counts))
+
+    if missing_info.empty:
+        note("Пропущенных значений не найдено")
+    else:
+        note("\nОбработка пропущенных значений:")
+        for col in missing_info.index:
+            missing_pct = missing_info.loc[col, 'процент_пропусков']
+            dtype = column_dtype(stats, col)
+            counts = stats['counts'][col]
+
+            if missing_pct <= MAX_FILL_MISSING_PCT:
+                if dtype in ['int64', 'float64', 'float32'] or pd.api.types.is_integer_dtype(dtype):
+                    # nullable целые (годы контракта) заполняются округленным значением
+                    is_nullable_int = dtype[0].isupper()
+                    summary = counts_statistics(counts)
+                    if abs(summary['skew']) > 1:
+                        method = 'median'
+                        fill_value = summary['median']
+                        if is_nullable_int:
+                            fill_value = round(fill_value)
+                        note(f"Заполнен {col} медианой: {fill_value:.2f} (данные имеют асимметричное распределение)")
+                    else:
+                        method = 'mean'
+                        fill_value = summary['mean']
+                        if is_nullable_int:
+                            fill_value = round(fill_value)
+                        note(f"Заполнен {col} средним: {fill_value:.2f} (данные имеют нормальное распределение)")
+                else:
+                    method = 'mode'
+                    fill_value = counts_mode(counts)
+                    note(f"Заполнен {col} модой: {fill_value} (наиболее частое значение)")
+                plan['fills'][col] = fill_value
+                plan['fill_methods'][col] = method
+            else:
+                note(f"Столбец {col} имеет {missing_pct:.1f}% пропусков, требует индивидуального рассмотрения")
+
+    if plan['group_by'] is not None and collect_counts is not None:
+        plan_group_fills(stats, plan, collect_counts)
+    return plan
+
+
+def plan_group_fills(stats, plan, collect_counts):
+    """значения заполнения по группам plan['group_by'] тем же методом, что выбран для столбца
+
+    частоты по группам собираются один раз для всех заполняемых столбцов и хранятся в статистиках
+    """
+    group_by = plan['group_by']
+    group_counts = stats.setdefault('group_counts', {})
+    columns = [col for col in plan['fills'] if col != group_by]
+    need_counts = [col for col in columns if (group_by, col) not in group_counts]
+    if need_counts:
+        for col, counts in collect_counts(need_counts, by=group_by).items():
+            group_counts[(group_by, col)] = counts
+
+    for col in columns:
+        values = group_fill_values(group_counts[(group_by, col)], plan['fill_methods'][col])
+        if values.empty:
+            continue
+        if plan['fill_methods'][col] != 'mode' and column_dtype(stats, col)[0].isupper():
+            # nullable целые заполняются округленными значениями, как и общее значение
+            values = values.round()
+        plan['group_fills'][col] = values
+        note(f"Заполнение {col} по группам {group_by}: {len(values)} групп, "
+             f"остальные строки - общим значением {plan['fills'][col]}")
+
+
+def plan_dtypes(stats, plan, collect_counts=None):
+    """часть плана для типов: числа из строк, категории и сужение по глобальным минимуму и максимуму"""
+    candidates = category_candidates(stats, plan['columns'])
+    # точные частоты нужны только кандидатам в category, для которых они не собирались
+    need_counts = [col for col in candidates if col in stats['dropped_counts'] and col not in stats['counts']]
+    if need_counts and collect_counts is not None:
+        stats['counts'].update(collect_counts(need_counts))
+    limit = category_limit(stats['rows'])
+
+    # анализ и изменение типов данных
+    column_types = {}
+    for col in plan['columns']:
+        old_type = column_dtype(stats, col)
+        new_type = old_type
+        counts = stats['counts'].get(col)
+        has_nan = stats['missing'].get(col, 0) > 0 and col not in plan['fills']
+        if col in ['age', 'ova', 'pot'] and old_type == 'object':
+            plan['to_numeric'].append(col)
+            numeric_values = pd.to_numeric(pd.Series(counts.index), errors='coerce')
+            has_missing = numeric_values.isna().any() or (stats['missing'].get(col, 0) > 0 and col not in plan['fills'])
+            is_integral = not has_missing and (numeric_values % 1 == 0).all()
+            has_nan = has_missing
+            new_type = 'int64' if is_integral else 'float64'
+            counts = pd.Series(counts.to_numpy(), index=numeric_values).dropna()
+        elif old_type == 'object' and col not in ['positions_list'] and col in candidates and counts is not None:
+            categories = set(counts[counts > 0].index)
+            if col in plan['fills']:
+                categories.update(fill_values(plan, col))
+            try:
+                if len(categories) < limit:
+                    plan['categories'][col] = pd.CategoricalDtype(sorted(categories))
+                    new_type = 'category'
+            except TypeError:
+                pass
+        elif old_type == 'category':
+            # столбцы, прочитанные сразу как category, получают общий словарь для всех частей
+            categories = set(counts[counts > 0].index)
+            if col in plan['fills']:
+                categories.update(fill_values(plan, col))
+            plan['categories'][col] = pd.CategoricalDtype(sorted(categories))
+        if old_type != new_type:
+            note(f"Столбец '{col}' преобразован: {old_type} -> {new_type}")
+        column_types[col] = (new_type, counts, has_nan)
+
+    # оптимизация типов данных по глобальным минимуму и максимуму: берутся из частот значений,
+    # поэтому столбцы не сканируются; целые с пропусками получают nullable-типы (UInt8, Int16, ...)
+    for col in plan['columns']:
+        new_type, counts, has_nan = column_types[col]
+        if new_type not in DOWNCAST_TYPES or counts is None:
+            continue
+        values = counts[counts > 0].index
+        if col in plan['fills']:
+            values = values.append(pd.Index(fill_values(plan, col)))
+        if values.empty:
+            continue
+        values = values.to_numpy(dtype='float64')
+        target = downcast_target(new_type, values.min(), values.max(), has_nan, bool((values % 1 == 0).all()))
+        if target is not None:
+            plan['downcast'][col] = target
+            note(f"Столбец '{col}' оптимизирован: {new_type} -> {target}")
+    return plan
+
+
+def apply_fills(df, plan, report=None):
+    """общий тип столбцов по всем частям и заполнение пропусков (внутри групп, если они заданы)
 
-for col in ['Joined', 'Loan Date End']:
-    if col in df_clean.columns and col in df_original.columns:
-        column_mapping[col] = col
+    заменяются только столбцы с пропусками; report накапливает число заполненных значений
+    """
+    for col, dtype in plan['dtypes'].items():
+        if col in df.columns and str(df[col].dtype) != dtype:
+            df[col] = df[col].astype(dtype)
+    # группы берутся до заполнения, чтобы порядок столбцов в плане не влиял на результат
+    groups = df[plan['group_by']].astype(object) if plan['group_fills'] else None
+    for col, fill_value in plan['fills'].items():
+        missing = df[col].isna()
+        n_missing = int(missing.sum())
+        if n_missing == 0:
+            continue
+        n_group = 0
+        if col in plan['group_fills']:
+            group_values = groups[missing].map(plan['group_fills'][col])
+            n_group = int(group_values.notna().sum())
+            df[col] = df[col].fillna(group_values).fillna(fill_value)
+        else:
+            df[col] = df[col].fillna(fill_value)
+        if report is not None:
+            entry = report.setdefault(col, {'method': plan['fill_methods'][col], 'filled': 0, 'by_group': 0})
+            entry['filled'] += n_missing
+            entry['by_group'] += n_group
+    return df
+
+
+def fill_table(report):
+    """отчет о заполненных значениях в виде таблицы"""
+    return pd.DataFrame.from_dict(report, orient='index', columns=['method', 'filled', 'by_group'])
+
+
+def apply_dtypes(df, plan):
+    """приведение к числам, категориям и суженным типам"""
+    for col in plan['to_numeric']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col, dtype in plan['categories'].items():
+        df[col] = df[col].astype(dtype)
+    for col, dtype in plan['downcast'].items():
+        df[col] = df[col].astype(dtype)
+    return df
+
+
+def dedup_columns(df):
+    """столбцы для сравнения строк: DEDUP_KEYS или все, кроме dummy-позиций и positions_formatted
+
+    производные столбцы полностью определяются positions и только удлиняют хеширование
+    """
+    if DEDUP_KEYS is not None:
+        return list(DEDUP_KEYS)
+    return [col for col in df.columns if not col.startswith('position_') and col != 'positions_formatted']
+
+
+def impute_missing(df, context):
+    """этап заполнения пропусков: статистики по набору, план заполнения и его применение"""
+    context['stats'] = update_statistics(None, df)
+    context['plan'] = plan_imputation(
+        context['stats'], collect_counts=lambda cols, by=None: frame_counts(df, cols, by))
+    context['fill_report'] = report = {}
+    df = apply_fills(df, context['plan'], report)
+    if context['verbose'] and report:
+        section("\nЗаполнено значений:", lambda: fill_table(report))
+    return df
+
+
+def optimize_dtypes(df, context):
+    """этап оптимизации типов данных по плану с отчетом о памяти по столбцам"""
+    usage_before = df.memory_usage(index=False, deep=True)
+    dtypes_before = df.dtypes
+    context['plan'] = plan_dtypes(context['stats'], context['plan'],
+                                  collect_counts=lambda cols, by=None: frame_counts(df, cols, by))
+    df = apply_dtypes(df, context['plan'])
+    context['memory_report'] = report = memory_report(usage_before, dtypes_before, df)
+    if context['verbose']:
+        note(f"Память после изменения типов: {report['bytes_before'].sum() / 1024**2:.2f} MB -> "
+             f"{report['bytes_after'].sum() / 1024**2:.2f} MB")
+    return df
+
+
+def drop_duplicates(df, context):
+    """этап удаления дубликатов (в потоковом режиме хеши строк и имена общие для всех частей файла)"""
+    verbose = context['verbose']
+
+    # проверка на дубликаты
+    context['initial_shape'] = df.shape
+    duplicates, seen_hashes = find_duplicates(df, dedup_columns(df), context.get('seen_hashes'))
+    if seen_hashes is not None:
+        context['seen_hashes'] = seen_hashes
+    near_duplicates = None
+    if NEAR_DUPLICATES:
+        seen_names = context.setdefault('seen_names', {})
+        near_duplicates = find_near_duplicates(df[~duplicates], seen_names, NEAR_DUP_BLOCK, NEAR_DUP_NAME,
+                                               NEAR_DUP_MIN_SIMILARITY)
+        near_duplicates = near_duplicates.reindex(df.index, fill_value=False)
+        duplicates |= near_duplicates
+    duplicate_count = duplicates.sum()
+    if not verbose:
+        return df[~duplicates]
+
+    note(f"\nКоличество дубликатов: {duplicate_count}")
+    if near_duplicates is not None:
+        note(f"Из них похожих записей (блок {NEAR_DUP_BLOCK}, начало фамилии и имя {NEAR_DUP_NAME}): "
+             f"{near_duplicates.sum()}")
+
+    if duplicate_count > 0:
+        section("Примеры дубликатов:", lambda: df[duplicates].head())
+
+        note("Возможные причины дубликатов:")
+        note("Технические ошибки при сборе данных")
+        note("Повторные записи об одном игроке")
+        note("Ошибки в системе учета")
+
+        df_clean = df[~duplicates]
+        note(f"Размер после удаления дубликатов: {df_clean.shape}")
+        note(f"Удалено строк: {df.shape[0] - df_clean.shape[0]}")
+    else:
+        note("Дубликатов не найдено")
+        df_clean = df.copy()
+    return df_clean
+
+
+def finalize(df, context):
+    """этап удаления денежных столбцов в итоговом наборе (даты уже разобраны transform_columns)"""
+    # удалить ненужные денежные столбцы, если они есть
+    return df.drop(columns=MONEY_COLUMNS, errors='ignore')
+
+
+def stage_config():
+    """настройки, от которых зависит результат каждого этапа (входят в ключи кэша)"""
+    return {
+        'load': {'schema': RAW_SCHEMA, 'na_values': NA_VALUES, 'skip': RAW_SKIP_COLUMNS},
+        'transform_columns': {'transforms': COLUMN_TRANSFORMS, 'exclude': TEXT_CASE_EXCLUDE,
+                              'sparse': POSITION_DUMMIES_SPARSE},
+        'impute_missing': {'max_fill_missing_pct': MAX_FILL_MISSING_PCT, 'group_by': IMPUTE_GROUP_BY,
+                           'group_min_rows': IMPUTE_GROUP_MIN_ROWS},
+        'optimize_dtypes': {'category_max_unique': CATEGORY_MAX_UNIQUE, 'category_max_ratio': CATEGORY_MAX_RATIO},
+        'drop_duplicates': {'keys': DEDUP_KEYS, 'near': NEAR_DUPLICATES, 'block': NEAR_DUP_BLOCK,
+                            'name': NEAR_DUP_NAME, 'min_similarity': NEAR_DUP_MIN_SIMILARITY},
+        'finalize': {'money': MONEY_COLUMNS},
+    }
+
+
+def pipeline_keys(input_file):
+    """ключи кэша всех этапов PIPELINE_STAGES для файла с текущими настройками"""
+    try:
+        input_digest = file_digest(input_file)
+    except OSError as e:
+        raise CleaningError(f'Ошибка при загрузке файла: {e}') from e
+    return stage_keys(input_digest, [name for name, _ in PIPELINE_STAGES], stage_config())
+
+
+# полный конвейер очистки в памяти
+PIPELINE_STAGES = [
+    ('load', load_raw),
+    *ROW_STAGES,
+    ('impute_missing', impute_missing),
+    ('optimize_dtypes', optimize_dtypes),
+    ('drop_duplicates', drop_duplicates),
+    ('finalize', finalize),
+]
+
+# второй проход потокового режима: глобальный план уже построен по первому проходу
+STREAMING_STAGES = [
+    *ROW_STAGES,
+    ('impute_missing', lambda df, context: apply_fills(df, context['plan'], context.setdefault('fill_report', {}))),
+    ('optimize_dtypes', lambda df, context: apply_dtypes(df, context['plan'])),
+    ('drop_duplicates', drop_duplicates),
+    ('finalize', finalize),
+]
+
+
+def columnar_path(output_file, fmt):
+    """путь типизированного файла рядом с csv: players_cleaned.csv -> players_cleaned.parquet"""
+    return os.path.splitext(output_file)[0] + '.' + fmt
+
+
+def frame_to_arrow(df, schema=None):
+    """DataFrame в таблицу pyarrow; разреженные dummy-столбцы сохраняются плотными"""
+    sparse_columns = [col for col in df.columns if isinstance(df[col].dtype, pd.SparseDtype)]
+    if sparse_columns:
+        df = df.copy()
+        df[sparse_columns] = df[sparse_columns].sparse.to_dense()
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def open_columnar_writer(path, fmt, schema, compression):
+    """писатель parquet или feather (arrow ipc) с выбранным сжатием"""
+    if compression == 'none':
+        compression = None
+    if fmt == 'parquet':
+        return pq.ParquetWriter(path, schema, compression=compression or 'none')
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    return pa.ipc.new_file(path, schema, options=options)
+
+
+def write_columnar(df, path, fmt, compression):
+    """запись очищенного набора в типизированный колоночный файл"""
+    table = frame_to_arrow(df)
+    with open_columnar_writer(path, fmt, table.schema, compression) as writer:
+        writer.write_table(table)
+
+
+def output_targets(output_file, columnar, compression):
+    """выходные файлы: суффикс в кэше и путь (csv и, если нужна, типизированная копия)"""
+    targets = [('.csv', output_file)]
+    if columnar != 'none':
+        targets.append((f'.{compression}.{columnar}', columnar_path(output_file, columnar)))
+    return targets
+
+
+def write_outputs(df, output_file, columnar, compression, cache_dir=None, key=None):
+    """запись csv и типизированной копии; готовые файлы из кэша просто копируются"""
+    for suffix, path in output_targets(output_file, columnar, compression):
+        if cache_dir is not None and restore_output(cache_dir, key, suffix, path):
+            continue
+        if path == output_file:
+            df.to_csv(path, index=False)
+        else:
+            write_columnar(df, path, columnar, compression)
+        if cache_dir is not None:
+            store_output(cache_dir, key, suffix, path)
+
+
+def clean_in_memory(input_file, output_file, columnar=COLUMNAR_FORMAT, compression=COLUMNAR_COMPRESSION,
+                    report_file=None, cache_dir=CACHE_DIR, context=None, text_parallel=TEXT_PARALLEL,
+                    text_workers=TEXT_WORKERS):
+    """очистка всего файла в памяти с подробным отчетом; возвращает очищенный набор и замеры этапов
+
+    с cache_dir неизмененный файл при тех же настройках не очищается заново;
+    в переданном context после очистки остаются план и статистики этапов
+    """
+    context = {} if context is None else context
+    context.update(input_file=input_file, verbose=True, text_parallel=text_parallel, text_workers=text_workers,
+                   _lookups=load_lookups(cache_dir) if cache_dir is not None else {})
+    stages = {}
+    keys = None
+    if cache_dir is not None:
+        with measure_stage(stages, 'cache_key'):
+            keys = pipeline_keys(input_file)
+    df_clean = run_stages(PIPELINE_STAGES, None, context, stages, cache_dir=cache_dir, keys=keys)
+    if cache_dir is not None and context.pop('_lookups_changed', False):
+        save_lookups(cache_dir, context['_lookups'])
+
+    print_report(df_clean, context['initial_shape'], input_file)
+
+    # сохранение очищенных данных
+    with measure_stage(stages, 'write', len(df_clean)):
+        write_outputs(df_clean, output_file, columnar, compression, cache_dir, keys[-1] if keys else None)
+    note(f"Очищенные данные сохранены в '{output_file}'", SUMMARY)
+    if columnar != 'none':
+        note(f"Типизированная копия сохранена в '{columnar_path(output_file, columnar)}' "
+             f"({columnar}, сжатие {compression})", SUMMARY)
+
+    print_comparison(df_clean, context['snapshot'])
+
+    # состояние для --delta нужно только при типизированной копии, из которой читается прошлый результат
+    if columnar != 'none' and context.get('row_hashes') is not None:
+        save_delta_state(output_file, context['row_hashes'], context['plan'], 0, [])
+    else:
+        remove_delta_state(output_file)
+    print_stage_report(stages, report_file, mode='memory', input_file=input_file, output_file=output_file)
+    return df_clean, stages
+
+
+def clean_streaming(input_file, output_file, chunksize, columnar=COLUMNAR_FORMAT,
+                    compression=COLUMNAR_COMPRESSION, report_file=None, cache_dir=CACHE_DIR,
+                    text_parallel=TEXT_PARALLEL, text_workers=TEXT_WORKERS):
+    """потоковая очистка по частям: первый проход собирает статистики, второй очищает и дописывает
+
+    промежуточные результаты в потоковом режиме не кэшируются (они не помещаются в память),
+    но итоговые файлы совпадают с режимом в памяти и берутся из общего кэша
+    """
+    note(f"\nПотоковая очистка '{input_file}' частями по {chunksize} строк", SUMMARY)
+    context = {'input_file': input_file, 'verbose': False, 'text_parallel': text_parallel,
+               'text_workers': text_workers, '_lookups': {},
+               # хеши строк, уже записанных предыдущими частями (отсортированы для бинарного поиска)
+               'seen_hashes': np.empty(0, dtype=np.uint64)}
+    stages = {}
+    # потоковый результат не сохраняет состояние для --delta
+    remove_delta_state(output_file)
+
+    targets = output_targets(output_file, columnar, compression)
+    key = None
+    if cache_dir is not None:
+        with measure_stage(stages, 'cache_key'):
+            key = pipeline_keys(input_file)[-1]
+        if all(os.path.exists(output_path(cache_dir, key, suffix)) for suffix, _ in targets):
+            with measure_stage(stages, 'cache_load'):
+                for suffix, path in targets:
+                    restore_output(cache_dir, key, suffix, path)
+            note(f"Файл и настройки не изменились: результат взят из кэша '{cache_dir}'", SUMMARY)
+            note(f"Очищенные данные сохранены в '{output_file}'", SUMMARY)
+            print_stage_report(stages, report_file, mode='streaming', input_file=input_file,
+                               output_file=output_file, chunksize=chunksize)
+            return stages
+        context['_lookups'] = load_lookups(cache_dir)
+
+    def collect_counts(columns, by=None):
+        counts = {}
+        with measure_stage(stages, 'pass1.collect_counts'):
+            for chunk in read_players(input_file, chunksize):
+                chunk = transform_rows(chunk, verbose=False, lookups=context['_lookups'])
+                for col, chunk_counts in frame_counts(chunk, columns, by).items():
+                    counts[col] = counts[col].add(chunk_counts, fill_value=0) if col in counts else chunk_counts
+        return counts
+
+    try:
+        note("\nПроход 1: сбор статистик")
+        stats = None
+        pass1_stages = [(f'pass1.{name}', func) for name, func in ROW_STAGES]
+        for chunk in iter_stage(stages, 'pass1.load', read_players(input_file, chunksize)):
+            chunk = run_stages(pass1_stages, chunk, context, stages)
+            with measure_stage(stages, 'pass1.statistics', len(chunk)):
+                stats = update_statistics(stats, chunk)
+    except Exception as e:
+        raise CleaningError(f'Ошибка при загрузке файла: {e}') from e
+
+    with measure_stage(stages, 'plan', stats['rows']):
+        context['plan'] = plan = plan_cleaning(stats, collect_counts=collect_counts)
+    context['positions'] = plan['positions']
 
+    note("\nПроход 2: очистка и запись")
+    pass2_stages = [(f'pass2.{name}', func) for name, func in STREAMING_STAGES]
+    rows_in = rows_out = 0
+    missing_cells = 0
+    n_columns = 0
+    header = True
+    columnar_file = columnar_path(output_file, columnar) if columnar != 'none' else None
+    writer = schema = None
+    for chunk in iter_stage(stages, 'pass2.load', read_players(input_file, chunksize)):
+        rows_in += len(chunk)
+        chunk = run_stages(pass2_stages, chunk, context, stages)
+        rows_out += len(chunk)
+        missing_cells += int(chunk.isnull().sum().sum())
+        n_columns = len(chunk.columns)
+        with measure_stage(stages, 'pass2.write', len(chunk)):
+            chunk.to_csv(output_file, index=False, mode='w' if header else 'a', header=header)
+            header = False
+            if columnar_file is not None:
+                # схема берется из первой части: словари категорий общие по плану, а столбец,
+                # целиком пустой в какой-то части, приводится к тому же типу
+                table = frame_to_arrow(chunk, schema=schema)
+                if writer is None:
+                    schema = table.schema
+                    writer = open_columnar_writer(columnar_file, columnar, schema, compression)
+                writer.write_table(table)
+    if writer is not None:
+        writer.close()
+    if cache_dir is not None:
+        with measure_stage(stages, 'cache_save'):
+            for suffix, path in targets:
+                store_output(cache_dir, key, suffix, path)
+            if context.pop('_lookups_changed', False):
+                save_lookups(cache_dir, context['_lookups'])
 
-before_columns = []
-for col in df_original.columns:
-    if col in set(column_mapping.values()) and col not in before_columns:
-        before_columns.append(col)
+    note("\n" + "="*50, SUMMARY)
+    note("ИТОГОВАЯ СТАТИСТИКА", SUMMARY)
+    note("="*50, SUMMARY)
+    metric("Исходное количество строк", rows_in)
+    metric("Финальное количество строк", rows_out)
+    metric("Удалено дубликатов", rows_in - rows_out)
+    metric("Обработано столбцов", n_columns)
+    missing_percentage = missing_cells / (rows_out * n_columns) * 100 if rows_out else 0.0
+    metric("Процент пропущенных значений", missing_percentage, fmt='.2f', suffix='%')
+    if context.get('fill_report'):
+        section("\nЗаполнено значений:", lambda: fill_table(context['fill_report']), SUMMARY)
+    note(f"Очищенные данные сохранены в '{output_file}'", SUMMARY)
+    if writer is not None:
+        note(f"Типизированная копия сохранена в '{columnar_file}' ({columnar}, сжатие {compression})", SUMMARY)
 
-after_columns = [col for col in column_mapping.keys() if col in df_clean.columns]
+    print_stage_report(stages, report_file, mode='streaming', input_file=input_file,
+                       output_file=output_file, chunksize=chunksize)
+    return stages
 
-print("\n")
-print("Сравнение последних 50 строк (только новые/структурно изменённые столбцы)")
 
-print("\nдо очистки")
-if before_columns:
-    before_cols_with_dtype = [f"{col} ({df_original[col].dtype})" for col in before_columns]
-    before_df = df_original[before_columns].tail(50).copy()
-    before_df.columns = before_cols_with_dtype
-    print(before_df)
-else:
-    print("нет исходных столбцов для сравнения.")
+def delta_state_path(output_file):
+    """файл состояния инкрементальной очистки рядом с результатом: хеши строк по id и план"""
+    return os.path.splitext(output_file)[0] + '.delta.pkl'
+
+
+def raw_row_hashes(raw):
+    """хеши сырых строк по id (точные повторы строк схлопываются); None, если id нет или он повторяется"""
+    hashes = pd.Series(pd.util.hash_pandas_object(raw, index=False).to_numpy())
+    unique_rows = ~hashes.duplicated().to_numpy()
+    columns = list(normalize_column_names(raw.columns))
+    # выпуски с другим набором столбцов могут не содержать id
+    if DELTA_KEY not in columns:
+        return None, unique_rows
+    hashes.index = raw[raw.columns[columns.index(DELTA_KEY)]].to_numpy()
+    hashes = hashes[unique_rows]
+    if hashes.index.has_duplicates:
+        return None, unique_rows
+    return hashes, unique_rows
+
+
+def save_delta_state(output_file, hashes, plan, changed_since_full, stale):
+    """сохранение состояния для следующего инкрементального запуска"""
+    state = {
+        'version': CACHE_VERSION,
+        'config': stage_config(),
+        'hashes': hashes,
+        'plan': plan,
+        'changed_since_full': changed_since_full,
+        'stale': stale,
+    }
+    with open(delta_state_path(output_file), 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def remove_delta_state(output_file):
+    """удаление состояния, которое больше не соответствует результату"""
+    path = delta_state_path(output_file)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def load_delta_state(output_file):
+    """состояние прошлой очистки или None, если его нет или оно сохранено с другими настройками"""
+    path = delta_state_path(output_file)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        state = pickle.load(f)
+    if state.get('version') != CACHE_VERSION or state.get('config') != stage_config():
+        return None
+    return state
+
+
+def delta_conflicts(subset, previous, plan):
+    """несовместимость новых строк с сохраненным планом: без полной очистки результат был бы неверным"""
+    conflicts = []
+    if list(subset.columns) != list(previous.columns):
+        conflicts.append('изменился набор столбцов')
+        return conflicts
+    for col, target in plan['downcast'].items():
+        values = subset[col].dropna()
+        if values.empty:
+            continue
+        dtype = np.dtype(getattr(pd.api.types.pandas_dtype(target), 'numpy_dtype', target))
+        info = np.iinfo(dtype) if dtype.kind in 'iu' else np.finfo(dtype)
+        if values.min() < info.min or values.max() > info.max:
+            conflicts.append(f"значения {col} не помещаются в {target}")
+    return conflicts
+
+
+def clean_delta(input_file, output_file, columnar=COLUMNAR_FORMAT, compression=COLUMNAR_COMPRESSION,
+                report_file=None, cache_dir=CACHE_DIR, text_parallel=TEXT_PARALLEL, text_workers=TEXT_WORKERS):
+    """инкрементальная очистка: обрабатываются только добавленные и измененные по id строки
+
+    строки сравниваются по хешам сырых значений с прошлым запуском; значения заполнения,
+    словари категорий и целевые типы берутся из плана последней полной очистки, поэтому
+    они помечаются устаревшими, а при большой доле изменений или несовместимости
+    (новые позиции, выход за суженный тип, другой набор столбцов) выполняется полная очистка
+    """
+    note(f"\nИнкрементальная очистка '{input_file}' относительно '{output_file}'", SUMMARY)
+    stages = {}
+    state = load_delta_state(output_file)
+    previous_file = columnar_path(output_file, columnar)
+
+    with measure_stage(stages, 'load') as result:
+        try:
+            raw = read_players(input_file)
+        except Exception as e:
+            raise CleaningError(f'Ошибка при загрузке файла: {e}') from e
+        result['rows_out'] = len(raw)
+    with measure_stage(stages, 'row_hashes', len(raw)) as result:
+        hashes, unique_rows = raw_row_hashes(raw)
+        result['rows_out'] = int(unique_rows.sum())
+
+    def rebuild(reason):
+        note(f"Полная очистка: {reason}", SUMMARY)
+        clean_in_memory(input_file, output_file, columnar, compression, report_file, cache_dir,
+                        text_parallel=text_parallel, text_workers=text_workers)
+        return {'mode': 'full', 'reason': reason}
+
+    if hashes is None:
+        return rebuild(f"в '{input_file}' нет столбца {DELTA_KEY} или есть разные строки с одним {DELTA_KEY}")
+    if NEAR_DUPLICATES:
+        return rebuild('поиск похожих записей сравнивает строки со всем набором')
+    if DEDUP_KEYS is not None:
+        return rebuild(f"дубликаты по {DEDUP_KEYS} ищутся среди всех строк, а не только по {DELTA_KEY}")
+    if state is None or not os.path.exists(previous_file):
+        return rebuild('нет результата прошлой очистки с сохраненными типами')
+
+    old_hashes = state['hashes']
+    added = hashes.index.difference(old_hashes.index)
+    removed = old_hashes.index.difference(hashes.index)
+    common = hashes.index.intersection(old_hashes.index)
+    changed = common[hashes[common].to_numpy() != old_hashes[common].to_numpy()]
+    n_changes = len(added) + len(changed) + len(removed)
+    changed_since_full = state['changed_since_full'] + n_changes
+    changed_pct = changed_since_full / max(len(hashes), 1) * 100
+
+    note(f"Добавлено: {len(added)}, изменено: {len(changed)}, удалено: {len(removed)}", SUMMARY)
+    if changed_pct > DELTA_REBUILD_PCT:
+        return rebuild(f"с последней полной очистки изменено {changed_pct:.1f}% строк "
+                       f"(порог {DELTA_REBUILD_PCT}%)")
+
+    plan = state['plan']
+    stale = list(state['stale'])
+
+    def mark_stale(note):
+        if note not in stale:
+            stale.append(note)
+
+    # любая добавленная, измененная или удаленная строка сдвигает значения заполнения (среднее,
+    # медиану, моду), а старые строки сохраняют значения прошлой полной очистки
+    if n_changes:
+        for col in plan['fills']:
+            mark_stale(f"{col}: значение заполнения посчитано прошлой полной очисткой")
+    with measure_stage(stages, 'load_previous') as result:
+        previous = pd.read_parquet(previous_file) if columnar == 'parquet' else pd.read_feather(previous_file)
+        result['rows_out'] = len(previous)
+
+    key_column = raw.columns[list(normalize_column_names(raw.columns)).index(DELTA_KEY)]
+    process = unique_rows & raw[key_column].isin(added.union(changed)).to_numpy()
+    subset = raw[process].reset_index(drop=True)
+    del raw
+
+    if len(subset):
+        context = {'verbose': False, 'positions': plan['positions'], 'plan': plan,
+                   'text_parallel': text_parallel, 'text_workers': text_workers}
+        subset = run_stages(ROW_STAGES, subset, context, stages)
+
+        # позиции вне сохраненного словаря потерялись бы в фиксированных dummy-столбцах
+        tokens = set(subset['positions'].astype(str).str.split().explode().dropna()) - {'nan'}
+        unknown_positions = tokens - set(plan['positions'])
+        if unknown_positions:
+            return rebuild(f"новые позиции {sorted(unknown_positions)}")
+
+        for col in subset.columns:
+            if col not in plan['fills'] and subset[col].isna().any() and not previous[col].isna().any():
+                mark_stale(f"{col}: появились пропуски, которые полная очистка могла бы заполнить")
+
+        # словари категорий дополняются новыми значениями в пределах порога category_limit
+        for col, dtype in plan['categories'].items():
+            new_values = set(subset[col].dropna().unique()) - set(dtype.categories)
+            if not new_values:
+                continue
+            categories = sorted(set(dtype.categories) | new_values)
+            if len(categories) >= category_limit(len(hashes)):
+                return rebuild(f"у {col} стало {len(categories)} значений, столбец больше не category")
+            plan['categories'][col] = pd.CategoricalDtype(categories)
+            mark_stale(f"{col}: словарь категорий дополнен {sorted(new_values)}")
+
+        subset = run_stages([
+            ('impute_missing', lambda df, context: apply_fills(df, context['plan'])),
+            ('optimize_dtypes', lambda df, context: apply_dtypes(df, context['plan'])),
+            ('finalize', finalize),
+        ], subset, context, stages)
+
+        conflicts = delta_conflicts(subset, previous, plan)
+        if conflicts:
+            return rebuild('; '.join(conflicts))
+
+    with measure_stage(stages, 'merge', len(previous) + len(subset)) as result:
+        for col, dtype in plan['categories'].items():
+            previous[col] = previous[col].astype(dtype)
+        keep = ~previous[DELTA_KEY].isin(removed.union(changed))
+        merged = previous[keep]
+        if len(subset):
+            merged = pd.concat([merged, subset.astype(previous.dtypes.to_dict())], ignore_index=True)
+        # порядок строк как в новом файле, чтобы результат совпадал с полной очисткой
+        order = pd.Index(merged[DELTA_KEY]).get_indexer(hashes.index)
+        if (order == -1).any():
+            # строки, которых нет в прошлом результате и которые не обработаны сейчас
+            return rebuild(f"в прошлом результате нет {int((order == -1).sum())} строк нового файла")
+        merged = merged.iloc[order].reset_index(drop=True)
+        result['rows_out'] = len(merged)
+
+    with measure_stage(stages, 'write', len(merged)):
+        write_outputs(merged, output_file, columnar, compression)
+    save_delta_state(output_file, hashes, plan, changed_since_full, stale)
+
+    summary = {
+        'mode': 'delta',
+        'added': len(added),
+        'changed': len(changed),
+        'removed': len(removed),
+        'changed_since_full_pct': round(changed_pct, 2),
+        'stale': stale,
+    }
+    metric("Обработано строк", f"{len(subset)} из {len(merged)}")
+    metric("Изменено с последней полной очистки", changed_pct, fmt='.2f', suffix='% строк')
+    if stale:
+        note("Устаревшие глобальные статистики (пересчитываются полной очисткой, запуск без --delta):", SUMMARY)
+        for stale_note in stale:
+            note(f"  {stale_note}", SUMMARY)
+    note(f"Очищенные данные сохранены в '{output_file}'", SUMMARY)
+    print_stage_report(stages, report_file, input_file=input_file, output_file=output_file, delta=summary)
+    return summary
+
+
+def print_stage_report(stages, report_file=None, **meta):
+    """таблица замеров по этапам и, если указан файл, сохранение в json"""
+    note("\n" + "="*50, SUMMARY)
+    note("ЗАМЕРЫ ЭТАПОВ", SUMMARY)
+    note("="*50, SUMMARY)
+    section(None, lambda: stage_table(stages).round(3), SUMMARY)
+    if report_file:
+        save_stage_report(stages, report_file, **meta)
+        note(f"Отчет по этапам сохранен в '{report_file}'", SUMMARY)
+
+
+def print_report(df_clean, initial_shape, input_file):
+    """итоговая статистика очищенного набора"""
+    if not enabled(SUMMARY):
+        return
+    note("\n" + "="*50, SUMMARY)
+    note("ИТОГОВАЯ СТАТИСТИКА", SUMMARY)
+    note("="*50, SUMMARY)
+    metric("Исходный размер данных", initial_shape)
+    metric("Финальный размер данных", df_clean.shape)
+    metric("Удалено строк", initial_shape[0] - df_clean.shape[0])
+    metric("Обработано столбцов", len(df_clean.columns))
+
+    missing_percentage = (df_clean.isnull().sum().sum() / (df_clean.shape[0] * df_clean.shape[1])) * 100
+    note("\nКачество данных:", SUMMARY)
+    metric("Процент пропущенных значений", missing_percentage, fmt='.2f', suffix='%')
+    metric("Целостность данных", 100 - missing_percentage, fmt='.2f', suffix='%')
+    metric("Готовность к анализу", 'да' if missing_percentage < 1 else 'требует дополнительной обработки')
+
+
+def print_comparison(df_clean, snapshot):
+    """сравнение исходных и очищенных данных по снимку, сделанному при загрузке (уровень full)"""
+    if not enabled(FULL):
+        return
+    note("\n" + "="*50)
+    note("СРАВНЕНИЕ ДО И ПОСЛЕ ОЧИСТКИ")
+    note("="*50)
+
+    section("СТОЛБЦЫ В df_original:", lambda: snapshot['columns'])
+    note("\nПОСЛЕ ОЧИСТКИ")
+    section("Первые 3 строки очищенных данных:", lambda: df_clean.head(3))
+
+    note("\nОСНОВНЫЕ ИЗМЕНЕНИЯ")
+    note(f"1. Столбцы: {len(snapshot['columns'])} → {len(df_clean.columns)}")
+    note(f"2. Строки: {snapshot['rows']} → {len(df_clean)}")
+    note(f"3. Размер в памяти: {snapshot['memory_mb']:.2f} MB → {df_clean.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+
+    if 'positions_formatted' in df_clean.columns:
+        note(f"4. Позиции преобразованы (пример): {df_clean['positions_formatted'].dropna().iloc[0] if len(df_clean['positions_formatted'].dropna()) > 0 else 'нет данных'}")
+
+    if 'club_name' in df_clean.columns and 'contract_start_year' in df_clean.columns:
+        note(f"5. team_and_contract разделен на club_name, contract_start_year, contract_end_year")
+
+    after_columns = [col for col in COMPARISON_COLUMNS.keys() if col in df_clean.columns]
+
+    note("\n")
+    note(f"Сравнение последних {COMPARISON_TAIL_ROWS} строк (только новые/структурно изменённые столбцы)")
+
+    note("\nдо очистки")
+    before_df = snapshot['tail'].copy()
+    if len(before_df.columns):
+        before_df.columns = [f"{col} ({before_df[col].dtype})" for col in before_df.columns]
+        section(None, lambda: before_df)
+    else:
+        note("нет исходных столбцов для сравнения.")
+
+    note("\nпосле очистки")
+    after_cols_with_dtype = [f"{col} ({df_clean[col].dtype})" for col in after_columns]
+    after_df = df_clean[after_columns].tail(COMPARISON_TAIL_ROWS).copy()
+    after_df.columns = after_cols_with_dtype
+    section(None, lambda: after_df)
+
+
+def main():
+    """основная функция"""
+    parser = argparse.ArgumentParser(description='очистка данных fifa игроков')
+    parser.add_argument('--input', default=INPUT_FILE, help='исходный csv')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='очищенный csv')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='потоковый режим: количество строк в одной части')
+    parser.add_argument('--columnar', choices=COLUMNAR_FORMATS, default=COLUMNAR_FORMAT,
+                        help='типизированная копия рядом с csv (none - не писать)')
+    parser.add_argument('--compression', default=COLUMNAR_COMPRESSION,
+                        help='сжатие типизированной копии: zstd, snappy, gzip, brotli, lz4 или none')
+    parser.add_argument('--report', default=None,
+                        help='json с замерами этапов: время, строки, прирост пикового rss')
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help='каталог кэша результатов этапов (не больше CACHE_MAX_BYTES, старые записи вытесняются)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='очищать заново, не читая и не записывая кэш')
+    parser.add_argument('--delta', action='store_true',
+                        help='инкрементальная очистка: обрабатываются только новые и измененные по id строки')
+    parser.add_argument('--text-parallel', choices=PARALLEL_MODES, default=TEXT_PARALLEL,
+                        help='строковые преобразования по столбцам: serial - последовательно, '
+                             'thread/process - в потоках или процессах')
+    parser.add_argument('--text-workers', type=int, default=TEXT_WORKERS,
+                        help='количество потоков или процессов для строковых преобразований')
+    add_arguments(parser)
+    args = parser.parse_args()
+    text_options = {'text_parallel': args.text_parallel, 'text_workers': args.text_workers}
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    warnings.filterwarnings('ignore')
+    configure(args.verbosity, args.report_json)
+    if args.report_json is None:
+        # широкие таблицы печатаются целиком только в консольном отчете
+        pd.set_option('display.max_columns', None)
+        pd.set_option('display.width', None)
+        pd.set_option('display.max_colwidth', None)
+
+    if args.columnar != 'none' and args.compression not in COLUMNAR_CODECS[args.columnar]:
+        parser.error(f"сжатие {args.compression} недоступно для {args.columnar}: "
+                     f"{', '.join(COLUMNAR_CODECS[args.columnar])}")
+    if args.delta and (args.chunksize or args.columnar == 'none'):
+        parser.error("--delta читает прошлый результат из типизированной копии и работает только в памяти")
+
+    try:
+        if args.delta:
+            clean_delta(args.input, args.output, args.columnar, args.compression, args.report, cache_dir,
+                        **text_options)
+        elif args.chunksize:
+            clean_streaming(args.input, args.output, args.chunksize, args.columnar, args.compression,
+                            args.report, cache_dir, **text_options)
+        else:
+            clean_in_memory(args.input, args.output, args.columnar, args.compression, args.report,
+                            cache_dir, **text_options)
+    except CleaningError as e:
+        print(e)
+        return 1
+    finally:
+        path = write_json(input_file=args.input, output_file=args.output)
+        if path is not None:
+            print(f"Отчет сохранен в '{path}'")
+    return 0
+
 
-print("\nпосле очистки")
-after_cols_with_dtype = [f"{col} ({df_clean[col].dtype})" for col in after_columns]
-after_df = df_clean[after_columns].tail(50).copy()
-after_df.columns = after_cols_with_dtype
-print(after_df)
+if __name__ == "__main__":
+    sys.exit(main())
 
 
 # Решенные проблемы в данных (теперь в комментариях):
@@ -352,4 +1385,4 @@ print(after_df)
 # 9. Позиции игроков преобразованы: созданы dummy-переменные для каждой позиции, а также столбец positions_formatted без пробелов.
 # 10. Столбец 'team_and_contract' разделен на отдельные поля: club_name, contract_start_year, contract_end_year для удобства анализа контрактов.
 # 11. Типы данных оптимизированы (например, int64 → uint8/uint16, float64 → float32, object → category) для экономии памяти и ускорения вычислений.
-# 12. Данные готовы к дальнейшему анализу, визуализации и машинному обучению.
\ No newline at end of file
+# 12. Данные готовы к дальнейшему анализу, визуализации и машинному обучению.
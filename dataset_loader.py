@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+общая загрузка очищенного набора для скриптов анализа
+источник - players_cleaned.parquet/.feather, если есть, иначе players_cleaned.csv; csv читается по
+объявленной схеме (CLEANED_SCHEMA) без вывода типов по данным, целые сужаются optimize_memory и
+сохраняется в дисковый кэш parquet, поэтому скрипты, запущенные друг за другом, разбирают csv один раз
+кэш действителен, пока у источника те же размер и время изменения; если они изменились, сравнивается
+хеш содержимого. повторный вызов в том же процессе возвращает тот же DataFrame (без копии:
+столбцы, добавленные скриптом, видны следующим вызовам)
+дробные столбцы остаются float64: в float32 сдвигаются границы IQR, счетчики выбросов и p-значения тестов
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from memory_optimizer import optimize_memory
+from players_schema import CLEANED_DUMMY_PREFIX, CLEANED_SCHEMA
+from stage_cache import file_digest
+
+# порядок поиска источника: типизированные копии от data_cleaning.py читаются быстрее csv
+SOURCE_FILES = ['players_cleaned.parquet', 'players_cleaned.feather', 'players_cleaned.csv']
+CACHE_DIR = '.analysis_cache'
+# увеличивается при изменении схемы или способа чтения, чтобы не использовать старый кэш
+LOADER_VERSION = 2
+
+# типы pandas для объявленных в схеме столбцов
+PANDAS_TYPES = {
+    'text': 'object',
+    'category': 'category',
+    'float32': 'float64',
+}
+
+# загруженные в процессе наборы: (путь, столбцы) -> (подпись источника, DataFrame)
+_frames = {}
+# сведения о последней загрузке для отчета скрипта
+last_load = {}
+
+
+def find_source(directory='.'):
+    """первый существующий файл из SOURCE_FILES"""
+    for name in SOURCE_FILES:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"нет ни одного из файлов {', '.join(SOURCE_FILES)}")
+
+
+def clear_loaded():
+    """забыть загруженные в процессе наборы (например, перед загрузкой нового файла)"""
+    _frames.clear()
+
+
+def source_signature(path):
+    """размер и время изменения файла: быстрая проверка, что источник не менялся"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def read_cleaned_csv(path):
+    """чтение очищенного csv по объявленной схеме; необъявленные числа сужаются потом"""
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: PANDAS_TYPES[CLEANED_SCHEMA[col]] for col in header
+              if CLEANED_SCHEMA.get(col) in PANDAS_TYPES}
+    dtypes.update({col: 'uint8' for col in header if col.startswith(CLEANED_DUMMY_PREFIX)})
+    dates = [col for col in header if CLEANED_SCHEMA.get(col) == 'date']
+    return pd.read_csv(path, dtype=dtypes, parse_dates=dates)
+
+
+def widen_floats(df):
+    """float32 (из parquet/feather очистки) в float64 через кратчайшую десятичную запись,
+    как при чтении csv: 182.88, а не 182.8800048828125"""
+    floats = df.select_dtypes('float32').columns
+    if len(floats):
+        df = df.assign(**{col: pd.to_numeric(df[col].astype(str), errors='coerce') for col in floats})
+    return df
+
+
+def narrow_types(df):
+    """сужение целых столбцов; дробные остаются (или становятся) float64"""
+    df, _ = optimize_memory(df, floats=False)
+    return widen_floats(df)
+
+
+def column_names(path):
+    """столбцы файла без чтения данных"""
+    if path.endswith('.csv'):
+        return pd.read_csv(path, nrows=0).columns.tolist()
+    if path.endswith('.parquet'):
+        return pq.read_schema(path).names
+    with pa.ipc.open_file(path) as reader:
+        return reader.schema.names
+
+
+def existing_columns(columns, available):
+    """запрошенные столбцы, которые есть в файле, в порядке запроса (None - все)"""
+    return None if columns is None else [col for col in columns if col in available]
+
+
+def read_columnar(path, columns=None):
+    """чтение типизированной копии только нужных столбцов"""
+    columns = existing_columns(columns, column_names(path))
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_feather(path, columns=columns)
+
+
+def _cache_paths(cache_dir, path):
+    name = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=8).hexdigest()
+    base = os.path.join(cache_dir, f'{os.path.basename(path)}.{name}.v{LOADER_VERSION}')
+    return base + '.parquet', base + '.json'
+
+
+def _cache_valid(cache_path, meta_path, path):
+    """кэш соответствует источнику: те же размер и время изменения или тот же хеш содержимого"""
+    if not (os.path.exists(cache_path) and os.path.exists(meta_path)):
+        return False
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    size, mtime_ns = source_signature(path)
+    if meta.get('size') == size and meta.get('mtime_ns') == mtime_ns:
+        return True
+    if meta.get('size') != size or meta.get('digest') != file_digest(path):
+        return False
+    # файл перезаписан тем же содержимым: запоминается новое время, чтобы не хешировать снова
+    _write_meta(meta_path, path, meta['digest'])
+    return True
+
+
+def _write_meta(meta_path, path, digest):
+    size, mtime_ns = source_signature(path)
+    tmp_path = f'{meta_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'source': os.path.abspath(path), 'size': size, 'mtime_ns': mtime_ns, 'digest': digest}, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _build_cache(path, cache_path, meta_path):
+    """разбор csv, сужение типов и запись кэша через временный файл"""
+    digest = file_digest(path)
+    df = narrow_types(read_cleaned_csv(path))
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+    _write_meta(meta_path, path, digest)
+    return df
+
+
+def load_players(columns=None, path=None, cache_dir=CACHE_DIR):
+    """очищенный набор (только columns, если заданы; отсутствующие в файле пропускаются)
+
+    cache_dir=None отключает дисковый кэш csv
+    """
+    path = path or find_source()
+    key = (os.path.abspath(path), None if columns is None else tuple(columns))
+    signature = source_signature(path)
+    loaded = _frames.get(key)
+    if loaded is not None and loaded[0] == signature:
+        last_load.update(source=path, origin='memory', seconds=0.0)
+        return loaded[1]
+
+    start = time.perf_counter()
+    if not path.endswith('.csv'):
+        df = narrow_types(read_columnar(path, columns))
+        origin = 'columnar'
+    elif cache_dir is None:
+        df = narrow_types(read_cleaned_csv(path))
+        origin = 'csv'
+    else:
+        cache_path, meta_path = _cache_paths(cache_dir, path)
+        if _cache_valid(cache_path, meta_path, path):
+            df = read_columnar(cache_path, columns)
+            origin = 'cache'
+        else:
+            df = _build_cache(path, cache_path, meta_path)
+            origin = 'csv'
+    if origin == 'csv' and columns is not None:
+        df = df[existing_columns(columns, df.columns)]
+
+    _frames[key] = (signature, df)
+    last_load.update(source=path, origin=origin, seconds=time.perf_counter() - start)
+    return df
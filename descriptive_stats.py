@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+описательные статистики набора столбцов за один проход по блоку numpy
+столбцы переводятся в один массив float64, сортируются один раз по оси строк, и из сортировки
+берутся минимум, максимум, квартили, медиана и мода; моменты (среднее, std, асимметрия, эксцесс)
+считаются по тому же блоку; формулы асимметрии и эксцесса - как в pandas (skew, kurtosis)
+результат кэшируется: повторный вызов для того же DataFrame и тех же столбцов возвращает ту же таблицу
+"""
+
+import weakref
+
+import numpy as np
+import pandas as pd
+
+STATISTICS = ['count', 'mean', 'median', 'mode', 'std', 'min', 'q25', 'q50', 'q75', 'max', 'skew', 'kurtosis']
+
+# готовые таблицы: (id набора, столбцы) -> (слабая ссылка на набор, таблица)
+_results = {}
+
+
+def _quantile(sorted_block, counts, q):
+    """квантиль с линейной интерполяцией (как pandas quantile) по отсортированным столбцам"""
+    position = (counts - 1) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    columns = np.arange(sorted_block.shape[1])
+    low_values = sorted_block[lower.clip(0), columns]
+    high_values = sorted_block[upper.clip(0), columns]
+    result = low_values + (high_values - low_values) * (position - lower)
+    return np.where(counts > 0, result, np.nan)
+
+
+def _mode(sorted_values):
+    """самое частое значение отсортированного столбца без пропусков; при равенстве - наименьшее"""
+    if len(sorted_values) == 0:
+        return np.nan
+    starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    lengths = np.diff(np.r_[starts, len(sorted_values)])
+    return sorted_values[starts[np.argmax(lengths)]]
+
+
+def moment_statistics(counts, m2, m3, m4):
+    """std, асимметрия и эксцесс (формулы pandas) из сумм центральных степеней 2, 3 и 4"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # как в pandas: погрешности округления около нуля считаются нулем
+        m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+        m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+        m4 = np.where(np.abs(m4) < 1e-14, 0.0, m4)
+
+        std = np.sqrt(m2 / (counts - 1))
+        skew = counts * (counts - 1) ** 0.5 / (counts - 2) * (m3 / m2 ** 1.5)
+        skew = np.where(m2 == 0, 0.0, skew)
+        denominator = (counts - 2) * (counts - 3) * m2 ** 2
+        kurtosis = (counts * (counts + 1) * (counts - 1) * m4 / denominator
+                    - 3 * (counts - 1) ** 2 / ((counts - 2) * (counts - 3)))
+        kurtosis = np.where(denominator == 0, 0.0, kurtosis)
+    std = np.where(counts > 1, std, np.nan)
+    skew = np.where(counts > 2, skew, np.nan)
+    kurtosis = np.where(counts > 3, kurtosis, np.nan)
+    return std, skew, kurtosis
+
+
+def _moments(block, counts):
+    """среднее, std, асимметрия и эксцесс по столбцам блока (пропуски не учитываются)"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(block, axis=0) / counts
+        adjusted = block - mean
+        squared = adjusted ** 2
+        m2 = np.nansum(squared, axis=0)
+        m3 = np.nansum(squared * adjusted, axis=0)
+        m4 = np.nansum(squared ** 2, axis=0)
+    return (mean, *moment_statistics(counts, m2, m3, m4))
+
+
+def describe_columns(df, columns=None):
+    """таблица STATISTICS по столбцам (строки - столбцы набора); по умолчанию все числовые
+
+    таблица кэшируется для пары (df, columns), поэтому сводка и интерпретации читают одни значения;
+    после вызова эти столбцы набора не должны меняться на месте
+    """
+    columns = list(df.select_dtypes('number').columns if columns is None else columns)
+    key = (id(df), tuple(columns))
+    cached = _results.get(key)
+    if cached is not None and cached[0]() is df:
+        return cached[1]
+
+    block = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+    counts = (~np.isnan(block)).sum(axis=0)
+    # пропуски при сортировке уходят в конец столбца, поэтому первые counts значений - данные
+    sorted_block = np.sort(block, axis=0) if len(block) else np.full((1, len(columns)), np.nan)
+    mean, std, skew, kurtosis = _moments(block, counts)
+    positions = np.arange(len(columns))
+    has_values = counts > 0
+    median = _quantile(sorted_block, counts, 0.5)
+
+    result = pd.DataFrame({
+        'count': counts,
+        'mean': mean,
+        'median': median,
+        'mode': [_mode(sorted_block[:count, i]) for i, count in enumerate(counts)],
+        'std': std,
+        'min': np.where(has_values, sorted_block[0, positions], np.nan),
+        'q25': _quantile(sorted_block, counts, 0.25),
+        'q50': median,
+        'q75': _quantile(sorted_block, counts, 0.75),
+        'max': np.where(has_values, sorted_block[(counts - 1).clip(0), positions], np.nan),
+        'skew': skew,
+        'kurtosis': kurtosis,
+    }, index=pd.Index(columns))
+
+    _results[key] = (weakref.ref(df, lambda _: _results.pop(key, None)), result)
+    return result
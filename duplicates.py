@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+поиск точных и похожих дубликатов записей игроков без попарных сравнений
+точные дубликаты - совпадение хешей выбранных столбцов; похожие - записи одного блока
+(например страна и возраст) с одним началом фамилии и близким полным именем
+при потоковой очистке состояние (просмотренные хеши и имена) общее для всех частей файла;
+хеши хранятся отсортированным массивом uint64 и проверяются бинарным поиском
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def row_hashes(df, columns=None):
+    """хеш каждой строки по выбранным столбцам (по всем, если columns не задан)"""
+    frame = df if columns is None else df[columns]
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def in_sorted(values, sorted_values):
+    """маска values, которые есть в отсортированном массиве sorted_values (бинарный поиск)"""
+    if not len(sorted_values):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_values, values).clip(max=len(sorted_values) - 1)
+    return sorted_values[positions] == values
+
+
+def find_duplicates(df, columns=None, seen_hashes=None):
+    """маска повторных строк по хешам столбцов columns и обновленные seen_hashes
+
+    seen_hashes - отсортированный массив uint64 хешей строк предыдущих частей файла;
+    None, когда весь файл в памяти: повторы ищутся только внутри df и состояние не хранится
+    """
+    hashes = row_hashes(df, columns)
+    duplicates = pd.Series(hashes).duplicated().to_numpy()
+    if seen_hashes is not None:
+        duplicates |= in_sorted(hashes, seen_hashes)
+        new_hashes = np.sort(hashes[~duplicates])
+        seen_hashes = np.insert(seen_hashes, np.searchsorted(seen_hashes, new_hashes), new_hashes)
+    return pd.Series(duplicates, index=df.index), seen_hashes
+
+
+def name_key(series):
+    """имя без регистра, диакритики и знаков препинания: 'Kylian Mbappé-Lottin' -> 'kylian mbappe lottin'"""
+    normalized = series.astype(str).str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+    return normalized.str.lower().str.replace(r'[^a-z0-9]+', ' ', regex=True).str.strip()
+
+
+def name_similarity(a, b):
+    """сходство имен по совпадающим триграммам символов (коэффициент Жаккара, от 0 до 1)"""
+    a, b = f'  {a} ', f'  {b} '
+    grams_a = {a[i:i + 3] for i in range(len(a) - 2)}
+    grams_b = {b[i:i + 3] for i in range(len(b) - 2)}
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+# фамилии сравниваются по началу: опечатка в конце фамилии не разводит записи по разным группам
+SURNAME_PREFIX = 3
+
+
+def find_near_duplicates(df, seen_names, block, name_column, min_similarity):
+    """маска записей, похожих на более ранние: тот же блок, то же начало фамилии и близкое имя
+
+    блоком и началом фамилии строки разбиваются на маленькие группы, поэтому имена сравниваются
+    только внутри групп, где встретилось больше одного имени; seen_names хранит
+    имена уже принятых записей по хешу группы и дополняется
+    """
+    names = name_key(df[name_column])
+    surnames = names.str.rsplit(' ', n=1).str[-1].str[:SURNAME_PREFIX]
+    groups = pd.util.hash_pandas_object(df[block].assign(_surname=surnames), index=False).to_numpy()
+    names = names.to_numpy()
+
+    # группы без второго имени ни в этой части, ни в предыдущих сравнивать не с чем
+    candidates = pd.Series(groups).duplicated(keep=False).to_numpy()
+    candidates |= np.fromiter((g in seen_names for g in groups), dtype=bool, count=len(groups))
+
+    duplicates = np.zeros(len(df), dtype=bool)
+    for i in np.flatnonzero(candidates):
+        group, name = int(groups[i]), names[i]
+        known = seen_names.get(group, ())
+        if any(name == other or name_similarity(name, other) >= min_similarity for other in known):
+            duplicates[i] = True
+        else:
+            seen_names[group] = known + (name,)
+    seen_names.update(zip(groups[~candidates].tolist(), ((name,) for name in names[~candidates])))
+    return pd.Series(duplicates, index=df.index)
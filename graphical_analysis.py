@@ -11,6 +11,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib import rcParams
 
+from correlation_engine import correlation_submatrix
+from dataset_loader import load_players
+from reporting import QUIET, SUMMARY, configure_from_argv, enabled, note, write_json
+
 # настройка русского шрифта
 plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial Unicode MS', 'SimHei']
 plt.rcParams['axes.unicode_minus'] = False
@@ -19,19 +23,26 @@ plt.rcParams['axes.unicode_minus'] = False
 sns.set_style("whitegrid")
 rcParams['figure.figsize'] = (12, 8)
 
+# столбцы, которые используют диаграммы и сводка: остальные не читаются
+ANALYSIS_COLUMNS = [
+    'nationality', 'positions_formatted', 'age', 'ova', 'pot', 'height_cm', 'weight_kg',
+    'sprint_speed', 'dribbling', 'shot_power', 'short_passing', 'stamina', 'strength',
+    'reactions', 'composure',
+]
+
 def load_data():
-    """загрузка данных из players_cleaned.csv"""
+    """загрузка нужных диаграммам столбцов через общий загрузчик (dataset_loader.py)"""
     try:
-        df = pd.read_csv('players_cleaned.csv')
-        print(f"данные загружены: {df.shape[0]} игроков, {df.shape[1]} признаков")
+        df = load_players(ANALYSIS_COLUMNS)
+        note(f"данные загружены: {df.shape[0]} игроков, {df.shape[1]} признаков", SUMMARY)
         return df
     except FileNotFoundError:
-        print("ошибка: файл players_cleaned.csv не найден")
+        note("ошибка: файл players_cleaned.csv не найден", QUIET)
         return None
 
 def create_age_rating_distribution(df):
     """распределение игроков по возрастным группам и рейтингу (matplotlib)"""
-    print("создание диаграммы 1: распределение по возрастным группам и рейтингу...")
+    note("создание диаграммы 1: распределение по возрастным группам и рейтингу...")
     age_bins = [0, 20, 25, 30, 35, 100]
     age_labels = ['16-20', '21-25', '26-30', '31-35', '35+']
     df['age_group'] = pd.cut(df['age'], bins=age_bins, labels=age_labels)
@@ -43,7 +54,8 @@ def create_age_rating_distribution(df):
         index='age_group',
         columns='rating_group',
         aggfunc='count',
-        fill_value=0
+        fill_value=0,
+        observed=True
     )
     fig, ax = plt.subplots(figsize=(14, 10))
     pivot_data.plot(kind='bar', ax=ax, width=0.8)
@@ -59,15 +71,15 @@ def create_age_rating_distribution(df):
     plt.tight_layout()
     plt.savefig('age_rating_distribution.png', dpi=300, bbox_inches='tight')
     plt.show()
-    print("диаграмма сохранена как 'age_rating_distribution.png'")
+    note("диаграмма сохранена как 'age_rating_distribution.png'")
 
 def create_correlation_heatmap(df):
     """корреляционная матрица ключевых навыков (matplotlib)"""
-    print("создание диаграммы 2: корреляционная матрица навыков...")
+    note("создание диаграммы 2: корреляционная матрица навыков...")
     key_skills = ['ova', 'pot', 'sprint_speed', 'dribbling', 'shot_power', 
                   'short_passing', 'stamina', 'strength', 'reactions', 'composure']
     key_skills = [col for col in key_skills if col in df.columns]
-    correlation_matrix = df[key_skills].corr()
+    correlation_matrix = correlation_submatrix(df, key_skills)
     fig, ax = plt.subplots(figsize=(12, 10))
     im = ax.imshow(correlation_matrix, cmap='RdYlBu_r', aspect='auto')
     ax.set_xticks(range(len(key_skills)))
@@ -86,11 +98,11 @@ def create_correlation_heatmap(df):
     plt.savefig('correlation_heatmap.png', dpi=300, bbox_inches='tight')
     plt.show()
     
-    print("диаграмма сохранена как 'correlation_heatmap.png'")
+    note("диаграмма сохранена как 'correlation_heatmap.png'")
 
 def create_nationality_pie(df):
     """распределение игроков по национальностям (matplotlib)"""
-    print("создание диаграммы 3: распределение по национальностям...")
+    note("создание диаграммы 3: распределение по национальностям...")
     top_countries = df['nationality'].value_counts().head(10)
     fig, ax = plt.subplots(figsize=(14, 10))
     wedges, texts, autotexts = ax.pie(top_countries.values, labels=top_countries.index, 
@@ -108,11 +120,11 @@ def create_nationality_pie(df):
     plt.axis('equal')
     plt.savefig('nationality_distribution.png', dpi=300, bbox_inches='tight')
     plt.show()
-    print("диаграмма сохранена как 'nationality_distribution.png'")
+    note("диаграмма сохранена как 'nationality_distribution.png'")
 
 def create_rating_boxplot(df):
     """распределение рейтинга по возрастным группам (seaborn)"""
-    print("создание диаграммы 4: box plot рейтинга по возрастным группам...")
+    note("создание диаграммы 4: box plot рейтинга по возрастным группам...")
     if 'age_group' not in df.columns:
         age_bins = [0, 20, 25, 30, 35, 100]
         age_labels = ['16-20', '21-25', '26-30', '31-35', '35+']
@@ -133,14 +145,14 @@ def create_rating_boxplot(df):
     plt.tight_layout()
     plt.savefig('rating_boxplot.png', dpi=300, bbox_inches='tight')
     plt.show()
-    print("диаграмма сохранена как 'rating_boxplot.png'")
+    note("диаграмма сохранена как 'rating_boxplot.png'")
 
 def create_skills_comparison(df):
     """сравнение навыков по позициям (matplotlib)"""
-    print("создание дополнительной диаграммы: сравнение навыков...")
+    note("создание дополнительной диаграммы: сравнение навыков...")
     
-    print(f"всего уникальных позиций: {df['positions_formatted'].nunique()}")
-    print(f"топ-10 позиций: {df['positions_formatted'].value_counts().head(10).index.tolist()}")
+    note(lambda: f"всего уникальных позиций: {df['positions_formatted'].nunique()}")
+    note(lambda: f"топ-10 позиций: {df['positions_formatted'].value_counts().head(10).index.tolist()}")
     
     all_positions = df['positions_formatted'].value_counts().head(10).index.tolist()
     main_positions = []
@@ -152,28 +164,28 @@ def create_skills_comparison(df):
     if not main_positions:
         main_positions = all_positions[:5]
     
-    print(f"выбранные позиции для анализа: {main_positions}")
+    note(f"выбранные позиции для анализа: {main_positions}")
     
     skills = ['sprint_speed', 'dribbling', 'shot_power', 'short_passing', 'stamina']
     # проверяем какие навыки есть в данных
     available_skills = [col for col in skills if col in df.columns]
-    print(f"доступные навыки: {available_skills}")
+    note(f"доступные навыки: {available_skills}")
     
     if not available_skills:
-        print("ошибка: нет доступных навыков для анализа")
+        note("ошибка: нет доступных навыков для анализа", QUIET)
         return
     
     df_filtered = df[df['positions_formatted'].isin(main_positions)]
-    print(f"игроков с выбранными позициями: {len(df_filtered)}")
+    note(f"игроков с выбранными позициями: {len(df_filtered)}")
     
     if len(df_filtered) == 0:
-        print("ошибка: нет игроков с выбранными позициями")
+        note("ошибка: нет игроков с выбранными позициями", QUIET)
         return
     
-    skills_data = df_filtered.groupby('positions_formatted')[available_skills].mean()
+    skills_data = df_filtered.groupby('positions_formatted', observed=True)[available_skills].mean()
     
     if skills_data.empty:
-        print("ошибка: не удалось создать сводную таблицу")
+        note("ошибка: не удалось создать сводную таблицу", QUIET)
         return
     
     fig, ax = plt.subplots(figsize=(14, 10))
@@ -188,34 +200,37 @@ def create_skills_comparison(df):
     plt.tight_layout()
     plt.savefig('skills_comparison.png', dpi=300, bbox_inches='tight')
     plt.show()
-    print("диаграмма сохранена как 'skills_comparison.png'")
+    note("диаграмма сохранена как 'skills_comparison.png'")
 
 def print_summary_statistics(df):
-    """вывод сводной статистики по датасету fifa 2021"""
-    print("\n" + "="*60)
-    print("сводная статистика fifa 2021")
-    print("="*60)
-    print(f"общее количество игроков: {len(df):,}")
-    print(f"количество национальностей: {df['nationality'].nunique()}")
-    print(f"количество позиций: {df['positions_formatted'].nunique()}")
-    print(f"возрастной диапазон: {df['age'].min()} - {df['age'].max()} лет")
-    print(f"рейтинговый диапазон: {df['ova'].min()} - {df['ova'].max()}")
-    print(f"\nсредние значения:")
-    print(f"возраст: {df['age'].mean():.1f} лет")
-    print(f"рост: {df['height_cm'].mean():.1f} см")
-    print(f"вес: {df['weight_kg'].mean():.1f} кг")
-    print(f"общий рейтинг: {df['ova'].mean():.1f}")
-    print(f"потенциал: {df['pot'].mean():.1f}")
-    print(f"\nтоп-5 стран по количеству игроков:")
+    """вывод сводной статистики по датасету fifa 2021 (уровень summary)"""
+    if not enabled(SUMMARY):
+        return
+    note("\n" + "="*60, SUMMARY)
+    note("сводная статистика fifa 2021", SUMMARY)
+    note("="*60, SUMMARY)
+    note(f"общее количество игроков: {len(df):,}", SUMMARY)
+    note(lambda: f"количество национальностей: {df['nationality'].nunique()}", SUMMARY)
+    note(lambda: f"количество позиций: {df['positions_formatted'].nunique()}", SUMMARY)
+    note(lambda: f"возрастной диапазон: {df['age'].min()} - {df['age'].max()} лет", SUMMARY)
+    note(lambda: f"рейтинговый диапазон: {df['ova'].min()} - {df['ova'].max()}", SUMMARY)
+    note(f"\nсредние значения:", SUMMARY)
+    note(lambda: f"возраст: {df['age'].mean():.1f} лет", SUMMARY)
+    note(lambda: f"рост: {df['height_cm'].mean():.1f} см", SUMMARY)
+    note(lambda: f"вес: {df['weight_kg'].mean():.1f} кг", SUMMARY)
+    note(lambda: f"общий рейтинг: {df['ova'].mean():.1f}", SUMMARY)
+    note(lambda: f"потенциал: {df['pot'].mean():.1f}", SUMMARY)
+    note(f"\nтоп-5 стран по количеству игроков:", SUMMARY)
     top_countries = df['nationality'].value_counts().head(5)
     for country, count in top_countries.items():
         percentage = (count / len(df)) * 100
-        print(f"{country}: {count:,} игроков ({percentage:.1f}%)")
+        note(f"{country}: {count:,} игроков ({percentage:.1f}%)", SUMMARY)
 
 def main():
     """основная функция"""
-    print("графический анализ данных fifa 2021")
-    print("="*50)
+    configure_from_argv('графический анализ данных fifa 2021')
+    note("графический анализ данных fifa 2021", SUMMARY)
+    note("="*50, SUMMARY)
     df = load_data()
     if df is None:
         return
@@ -226,17 +241,21 @@ def main():
         create_nationality_pie(df)
         create_rating_boxplot(df)
         create_skills_comparison(df)
-        print("\n" + "="*50)
-        print("все диаграммы успешно созданы!")
-        print("="*50)
-        print("созданные файлы:")
-        print("- age_rating_distribution.png")
-        print("- correlation_heatmap.png")
-        print("- nationality_distribution.png")
-        print("- rating_boxplot.png")
-        print("- skills_comparison.png")
+        note("\n" + "="*50, SUMMARY)
+        note("все диаграммы успешно созданы!", SUMMARY)
+        note("="*50, SUMMARY)
+        note("созданные файлы:", SUMMARY)
+        note("- age_rating_distribution.png", SUMMARY)
+        note("- correlation_heatmap.png", SUMMARY)
+        note("- nationality_distribution.png", SUMMARY)
+        note("- rating_boxplot.png", SUMMARY)
+        note("- skills_comparison.png", SUMMARY)
     except Exception as e:
-        print(f"ошибка при создании диаграмм: {e}")
+        note(f"ошибка при создании диаграмм: {e}", QUIET)
+    finally:
+        report_path = write_json()
+        if report_path:
+            print(f"отчет сохранен в '{report_path}'")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+сужение числовых типов DataFrame с отчетом о памяти
+минимум, максимум, наличие пропусков и целочисленность считаются одним проходом
+по каждому блоку столбцов одного типа; используется очисткой и скриптами анализа
+"""
+
+import numpy as np
+import pandas as pd
+
+# порядок проверки как в исходной оптимизации: сначала беззнаковые, затем знаковые
+UNSIGNED_TYPES = ['uint8', 'uint16', 'uint32']
+SIGNED_TYPES = ['int8', 'int16', 'int32']
+# целые с пропусками хранятся в nullable-типах pandas
+NULLABLE_TYPES = {
+    'uint8': 'UInt8', 'uint16': 'UInt16', 'uint32': 'UInt32',
+    'int8': 'Int8', 'int16': 'Int16', 'int32': 'Int32',
+}
+
+
+def smallest_dtype(col_min, col_max, has_nan=False, integral=True):
+    """наименьший безопасный тип для диапазона значений (None, если сузить нельзя)
+
+    целые с пропусками получают nullable-тип pandas (UInt8, Int16, ...)
+    """
+    if not (np.isfinite(col_min) and np.isfinite(col_max)):
+        return None
+    if integral:
+        candidates = UNSIGNED_TYPES if col_min >= 0 else SIGNED_TYPES
+        for dtype in candidates:
+            info = np.iinfo(dtype)
+            if col_min >= info.min and col_max <= info.max:
+                return NULLABLE_TYPES[dtype] if has_nan else dtype
+        return None
+    if col_min >= np.finfo(np.float32).min and col_max <= np.finfo(np.float32).max:
+        return 'float32'
+    return None
+
+
+def downcast_target(dtype, col_min, col_max, has_nan=False, integral=True, nullable=True, floats=True):
+    """тип для сужения столбца типа dtype или None, если он не меньше текущего
+
+    floats=False оставляет дробные столбцы в исходном типе
+    """
+    if has_nan and integral and not nullable:
+        integral = False
+    if not integral and not floats:
+        return None
+    target = smallest_dtype(col_min, col_max, has_nan, integral)
+    if target is None or pd.api.types.pandas_dtype(target).itemsize >= pd.api.types.pandas_dtype(dtype).itemsize:
+        return None
+    return target
+
+
+def numeric_summary(df, columns=None):
+    """минимум, максимум, наличие пропусков и целочисленность числовых столбцов
+
+    столбцы одного типа обрабатываются одной векторной редукцией по двумерному массиву
+    """
+    if columns is None:
+        columns = [col for col in df.columns
+                   if pd.api.types.is_numeric_dtype(df[col])
+                   and not pd.api.types.is_bool_dtype(df[col])
+                   and not isinstance(df[col].dtype, pd.SparseDtype)]
+    dtypes = df[columns].dtypes.astype(str)
+    parts = []
+    for _, block_columns in dtypes.groupby(dtypes, sort=False):
+        block_columns = list(block_columns.index)
+        dtype = df[block_columns[0]].dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+            values = df[block_columns].to_numpy()
+            summary = pd.DataFrame({
+                'min': values.min(axis=0), 'max': values.max(axis=0),
+                'has_nan': False, 'integral': True,
+            }, index=block_columns)
+        else:
+            # float и nullable-целые: пропуски как NaN
+            values = df[block_columns].to_numpy(dtype='float64', na_value=np.nan)
+            nan_mask = np.isnan(values)
+            summary = pd.DataFrame({
+                'min': np.where(nan_mask, np.inf, values).min(axis=0),
+                'max': np.where(nan_mask, -np.inf, values).max(axis=0),
+                'has_nan': nan_mask.any(axis=0),
+                'integral': ((values % 1 == 0) | nan_mask).all(axis=0),
+            }, index=block_columns)
+        parts.append(summary)
+    if not parts:
+        return pd.DataFrame(columns=['min', 'max', 'has_nan', 'integral'])
+    return pd.concat(parts).reindex(columns)
+
+
+def memory_report(usage_before, dtypes_before, df):
+    """отчет по столбцам: типы и байты до и после"""
+    report = pd.DataFrame({
+        'dtype_before': dtypes_before.astype(str),
+        'dtype_after': df.dtypes.astype(str),
+        'bytes_before': usage_before,
+        'bytes_after': df.memory_usage(index=False, deep=True),
+    })
+    report['bytes_saved'] = report['bytes_before'] - report['bytes_after']
+    return report
+
+
+def optimize_memory(df, columns=None, nullable=True, floats=True):
+    """сужение числовых столбцов до наименьших безопасных типов; возвращает новый DataFrame и отчет
+
+    floats=False сужает только целые: дробные столбцы не переводятся в float32
+    """
+    usage_before = df.memory_usage(index=False, deep=True)
+    dtypes_before = df.dtypes
+    summary = numeric_summary(df, columns)
+
+    targets = {}
+    for col, row in summary.iterrows():
+        target = downcast_target(df[col].dtype, row['min'], row['max'], bool(row['has_nan']),
+                                 bool(row['integral']), nullable, floats)
+        if target is not None:
+            targets[col] = target
+
+    df = df.astype(targets)
+    return df, memory_report(usage_before, dtypes_before, df)
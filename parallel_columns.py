@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+параллельное применение преобразований к столбцам DataFrame
+столбцы делятся на части по числу исполнителей (потоки или процессы), к каждому столбцу
+применяется та же функция, что и в последовательном режиме, поэтому результат совпадает;
+пулы создаются один раз на процесс и переиспользуются всеми частями файла
+"""
+
+import atexit
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+PARALLEL_MODES = ['serial', 'thread', 'process']
+
+_executors = {}
+
+
+def _executor(mode, workers):
+    """общий пул для режима и числа исполнителей"""
+    key = (mode, workers)
+    if key not in _executors:
+        pool_class = ThreadPoolExecutor if mode == 'thread' else ProcessPoolExecutor
+        _executors[key] = pool_class(max_workers=workers)
+    return _executors[key]
+
+
+@atexit.register
+def shutdown():
+    """остановка созданных пулов"""
+    for executor in _executors.values():
+        executor.shutdown()
+    _executors.clear()
+
+
+def _apply(frame, funcs):
+    """результаты func(frame[col]) для части столбцов"""
+    return {col: func(frame[col]) for col, func in funcs}
+
+
+def partition(items, parts):
+    """деление списка на parts подряд идущих частей почти равной длины"""
+    size, extra = divmod(len(items), parts)
+    result = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (i < extra)
+        result.append(items[start:end])
+        start = end
+    return result
+
+
+def map_columns(df, funcs, mode='serial', workers=1):
+    """словарь {столбец: func(df[столбец])} для пар (столбец, функция)
+
+    mode='thread' выигрывает на функциях, отпускающих GIL (pyarrow, numpy),
+    mode='process' - на строковых методах pandas; для процессов функции должны
+    быть определены на уровне модуля, а в пул передаются только нужные столбцы
+    """
+    funcs = list(funcs)
+    if mode == 'serial' or workers < 2 or len(funcs) < 2:
+        return _apply(df, funcs)
+    executor = _executor(mode, workers)
+    futures = []
+    for part in partition(funcs, min(workers, len(funcs))):
+        frame = df if mode == 'thread' else df[[col for col, _ in part]]
+        futures.append(executor.submit(_apply, frame, part))
+    results = {}
+    for future in futures:
+        results.update(future.result())
+    return results
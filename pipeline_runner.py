@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+общий запуск этапов очистки с замерами
+для каждого этапа копятся время (настенное и процессорное), строки на входе/выходе
+и прирост пикового rss; отчет сохраняется в json
+результаты этапов могут браться из дискового кэша (stage_cache.py)
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from reporting import note
+from stage_cache import find_cached_stage, save_entry
+
+try:
+    import resource
+except ImportError:  # windows: пиковый rss недоступен
+    resource = None
+
+
+def peak_rss_mb():
+    """пиковый rss процесса в мегабайтах (None, если платформа не сообщает)"""
+    if resource is None:
+        return None
+    # linux сообщает ru_maxrss в килобайтах
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _stage_entry(report, name):
+    """запись этапа в отчете; при повторных вызовах (части файла) метрики суммируются"""
+    return report.setdefault(name, {
+        'stage': name,
+        'calls': 0,
+        'wall_s': 0.0,
+        'cpu_s': 0.0,
+        'rows_in': 0,
+        'rows_out': 0,
+        'peak_rss_delta_mb': None if resource is None else 0.0,
+    })
+
+
+@contextmanager
+def measure_stage(report, name, rows_in=0):
+    """замер произвольного блока как этапа; строки на выходе задаются через result['rows_out']"""
+    result = {'rows_out': rows_in}
+    rss_before = peak_rss_mb()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    yield result
+    if result.get('skip'):
+        return
+    entry = _stage_entry(report, name)
+    entry['calls'] += 1
+    entry['wall_s'] += time.perf_counter() - wall_start
+    entry['cpu_s'] += time.process_time() - cpu_start
+    entry['rows_in'] += rows_in
+    entry['rows_out'] += result['rows_out']
+    if rss_before is not None:
+        # пиковый rss не убывает: прирост показывает, насколько этап поднял максимум памяти
+        entry['peak_rss_delta_mb'] += peak_rss_mb() - rss_before
+
+
+def run_stage(report, name, func, df, context):
+    """выполнение одного этапа func(df, context) -> df с замерами"""
+    with measure_stage(report, name, 0 if df is None else len(df)) as result:
+        df = func(df, context)
+        result['rows_out'] = 0 if df is None else len(df)
+    return df
+
+
+def run_stages(stages, df, context, report, cache_dir=None, keys=None):
+    """последовательное выполнение списка этапов [(имя, функция), ...]
+
+    с cache_dir и ключами этапов (stage_cache.stage_keys) выполнение начинается после
+    последнего этапа, найденного в кэше, а результат каждого выполненного этапа сохраняется
+    """
+    start = 0
+    if cache_dir is not None:
+        with measure_stage(report, 'cache_load') as result:
+            cached_index, entry = find_cached_stage(cache_dir, keys)
+            if entry is not None:
+                df, cached_context = entry
+                # значения, переданные вызывающим кодом (файл, подробность вывода), не заменяются
+                for key, value in cached_context.items():
+                    context.setdefault(key, value)
+                start = cached_index + 1
+                if context.get('verbose', True):
+                    note(f"\nЭтапы до '{stages[cached_index][0]}' включительно взяты из кэша '{cache_dir}'")
+            result['rows_out'] = 0 if df is None else len(df)
+
+    for i, (name, func) in enumerate(stages[start:], start):
+        df = run_stage(report, name, func, df, context)
+        if cache_dir is not None:
+            with measure_stage(report, 'cache_save', len(df)):
+                # служебные значения с '_' (словари разобранных значений) хранятся отдельно
+                save_entry(cache_dir, keys[i], df, {key: value for key, value in context.items()
+                                                    if not key.startswith('_')})
+    return df
+
+
+def iter_stage(report, name, chunks):
+    """итерация по частям с замером получения каждой части как этапа (чтение файла)"""
+    chunks = iter(chunks)
+    while True:
+        with measure_stage(report, name) as result:
+            chunk = next(chunks, None)
+            # окончание файла не считается отдельным вызовом
+            result['skip'] = chunk is None
+            result['rows_out'] = 0 if chunk is None else len(chunk)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def stage_table(report):
+    """отчет по этапам в виде таблицы"""
+    return pd.DataFrame(list(report.values())).set_index('stage')
+
+
+def save_stage_report(report, path, **meta):
+    """сохранение отчета по этапам в json вместе с описанием запуска"""
+    data = dict(meta)
+    data['stages'] = list(report.values())
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+объявленная схема сырого players.csv (fifa 21)
+типы заданы заранее, поэтому при чтении не нужен вывод типов по данным
+"""
+
+# текстовые столбцы: читаются как строки
+RAW_TEXT_COLUMNS = [
+    'photoUrl', 'LongName', 'playerUrl', 'Nationality', 'Positions', 'Name',
+    'Team & Contract', 'Height', 'Weight', 'Joined', 'Loan Date End',
+    'W/F', 'SM', 'IR', 'Hits',
+]
+
+# текстовые столбцы с небольшим числом значений: сразу читаются как category
+RAW_CATEGORY_COLUMNS = ['foot', 'BP', 'A/W', 'D/W']
+
+# целочисленные столбцы (при пропусках становятся float64, как в pandas)
+RAW_INTEGER_COLUMNS = [
+    'ID', 'Age', '↓OVA', 'POT', 'BOV', 'Growth',
+    'Attacking', 'Crossing', 'Finishing', 'Heading Accuracy', 'Short Passing', 'Volleys',
+    'Skill', 'Dribbling', 'Curve', 'FK Accuracy', 'Long Passing', 'Ball Control',
+    'Movement', 'Acceleration', 'Sprint Speed', 'Agility', 'Reactions', 'Balance',
+    'Power', 'Shot Power', 'Jumping', 'Stamina', 'Strength', 'Long Shots',
+    'Mentality', 'Aggression', 'Interceptions', 'Positioning', 'Vision', 'Penalties', 'Composure',
+    'Defending', 'Marking', 'Standing Tackle', 'Sliding Tackle',
+    'Goalkeeping', 'GK Diving', 'GK Handling', 'GK Kicking', 'GK Positioning', 'GK Reflexes',
+    'Total Stats', 'Base Stats', 'PAC', 'SHO', 'PAS', 'DRI', 'DEF', 'PHY',
+]
+
+# столбцы, которые очистка все равно удаляет: не читаются вовсе
+RAW_SKIP_COLUMNS = ['Value', 'Wage', 'Release Clause']
+
+RAW_SCHEMA = {
+    **{col: 'text' for col in RAW_TEXT_COLUMNS},
+    **{col: 'category' for col in RAW_CATEGORY_COLUMNS},
+    **{col: 'int64' for col in RAW_INTEGER_COLUMNS},
+}
+
+# значения, которые pandas.read_csv по умолчанию считает пропусками
+NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+]
+
+# объявленная схема очищенного players_cleaned.csv для скриптов анализа
+# (числовые столбцы читаются как числа и затем сужаются optimize_memory)
+CLEANED_TEXT_COLUMNS = ['photourl', 'longname', 'playerurl', 'name', 'hits']
+CLEANED_CATEGORY_COLUMNS = [
+    'nationality', 'positions', 'foot', 'bp', 'a_w', 'd_w', 'club_name', 'positions_formatted',
+]
+CLEANED_DATE_COLUMNS = ['joined', 'loan_date_end']
+CLEANED_FLOAT32_COLUMNS = ['height_cm', 'weight_kg']
+# dummy-столбцы позиций (position_st, position_cb, ...) - 0/1
+CLEANED_DUMMY_PREFIX = 'position_'
+
+CLEANED_SCHEMA = {
+    **{col: 'text' for col in CLEANED_TEXT_COLUMNS},
+    **{col: 'category' for col in CLEANED_CATEGORY_COLUMNS},
+    **{col: 'date' for col in CLEANED_DATE_COLUMNS},
+    **{col: 'float32' for col in CLEANED_FLOAT32_COLUMNS},
+}
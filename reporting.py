@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+отчет скриптов с уровнями подробности и выводом в json
+разделы строятся лениво: функция раздела вызывается только на включенном уровне, поэтому на
+уровне quiet или summary широкие таблицы (head, describe, сравнения до/после) не считаются и не
+форматируются; с json те же разделы сохраняются структурой, а консольные таблицы не печатаются
+уровни: quiet - ничего, кроме ошибок; summary - итоги; full - все разделы (как раньше)
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+LEVELS = ['quiet', 'summary', 'full']
+QUIET, SUMMARY, FULL = range(len(LEVELS))
+
+# состояние отчета процесса: скрипты пишут в него вызовами note, metric и section
+_report = {
+    'level': FULL,
+    'json_file': None,
+    'entries': [],
+    'last_title': None,
+}
+
+
+def configure(level='full', json_file=None):
+    """уровень подробности (имя из LEVELS) и файл json; старые записи отчета сбрасываются"""
+    _report.update(level=LEVELS.index(level), json_file=json_file, entries=[], last_title=None)
+
+
+def add_arguments(parser):
+    """аргументы --verbosity и --report-json для argparse скрипта"""
+    parser.add_argument('--verbosity', choices=LEVELS, default=LEVELS[FULL],
+                        help='подробность вывода: quiet - только ошибки, summary - итоги, full - все таблицы')
+    parser.add_argument('--report-json', default=None,
+                        help='сохранить разделы отчета в json вместо печати таблиц')
+
+
+def configure_from_argv(description):
+    """настройка отчета по --verbosity и --report-json для скриптов без своих аргументов"""
+    parser = argparse.ArgumentParser(description=description)
+    add_arguments(parser)
+    args, _ = parser.parse_known_args()
+    configure(args.verbosity, args.report_json)
+    return args
+
+
+def enabled(level=FULL):
+    """включен ли уровень; для дорогих вычислений, которые нужны только отчету"""
+    return _report['level'] >= level
+
+
+def structured(value):
+    """значение раздела в виде, пригодном для json"""
+    if isinstance(value, pd.DataFrame):
+        frame = value.reset_index() if not isinstance(value.index, pd.RangeIndex) else value
+        return {'columns': [str(col) for col in frame.columns],
+                'rows': frame.astype(object).where(frame.notna(), None).values.tolist()}
+    if isinstance(value, pd.Series):
+        return {str(key): item for key, item in value.astype(object).where(value.notna(), None).items()}
+    if isinstance(value, pd.Index):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {str(key): structured(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [structured(item) for item in value]
+    return value
+
+
+def json_default(value):
+    """numpy и pandas скаляры, даты и прочее для json.dump"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _record(kind, title, value, level):
+    _report['entries'].append({'kind': kind, 'title': title, 'level': LEVELS[level], 'value': value})
+
+
+def note(text, level=FULL):
+    """строка отчета; text может быть функцией без аргументов, тогда строка строится лениво
+
+    в json строки хранятся как есть и служат заголовками следующих разделов без названия
+    """
+    if _report['level'] < level:
+        return
+    text = text() if callable(text) else text
+    if _report['json_file'] is None:
+        print(text)
+        return
+    text = str(text).strip()
+    # разделители из '=' и '-' в json не нужны
+    text = text.strip(':').strip() if text.strip('=-') else ''
+    if text:
+        _report['last_title'] = text
+        _record('note', None, text, level)
+
+
+def metric(label, value, level=SUMMARY, fmt=None, suffix=''):
+    """значение с подписью: в консоли 'подпись: значение', в json - число или строка как есть"""
+    if _report['level'] < level:
+        return
+    value = value() if callable(value) else value
+    if _report['json_file'] is None:
+        print(f"{label}: {value if fmt is None else format(value, fmt)}{suffix}")
+    else:
+        _record('metric', label, structured(value), level)
+
+
+def section(title, build, level=FULL):
+    """раздел с таблицей или значением; build() вызывается только на включенном уровне
+
+    в консоли печатается заголовок (если есть) и значение, в json значение сохраняется структурой
+    """
+    if _report['level'] < level:
+        return
+    value = build()
+    if _report['json_file'] is None:
+        if title:
+            print(title)
+        print(value)
+        return
+    title = title.strip().strip(':').strip() if title else _report['last_title']
+    _record('section', title, structured(value), level)
+
+
+def frame_info(df):
+    """сводка DataFrame.info() в виде таблицы: тип, непустые значения и память по столбцам"""
+    return pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'non_null': df.notna().sum(),
+        'memory_mb': df.memory_usage(deep=True, index=False) / 1024**2,
+    })
+
+
+def write_json(**meta):
+    """сохранение записей отчета в json (если он настроен); возвращает путь или None"""
+    path = _report['json_file']
+    if path is None:
+        return None
+    data = {'script': sys.argv[0], 'level': LEVELS[_report['level']], 'created': time.time(), **meta,
+            'entries': _report['entries']}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
+    return path
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+дисковый кэш этапов очистки
+ключ этапа - хеш ключа предыдущего этапа, имени этапа и его настроек,
+первый ключ строится от хеша содержимого исходного файла;
+поэтому изменение настроек одного этапа меняет ключи только этого этапа и следующих
+каталог ограничен CACHE_MAX_BYTES: после каждой записи удаляются давно не использованные файлы
+(время изменения обновляется при попадании), а словари разобранных значений старых версий - сразу
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+
+# увеличивается при изменении кода этапов, чтобы не использовать старые результаты
+CACHE_VERSION = 6
+
+CACHE_DIR = '.cleaning_cache'
+# предел размера каталога кэша; один запуск по 20 тыс. строк записывает около 80 МБ
+CACHE_MAX_BYTES = 1 << 30
+
+FILE_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    """хеш содержимого файла, читается блоками"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(FILE_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _digest(*parts):
+    """хеш от repr частей (списки, словари и числа настроек)"""
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def stage_keys(input_digest, stage_names, configs):
+    """ключи всех этапов цепочкой: каждый зависит от всех предыдущих"""
+    keys = []
+    key = _digest(CACHE_VERSION, input_digest)
+    for name in stage_names:
+        key = _digest(key, name, configs.get(name))
+        keys.append(key)
+    return keys
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, f'{key}.pkl')
+
+
+def load_entry(cache_dir, key):
+    """результат этапа (DataFrame и добавленные этапами значения контекста) или None"""
+    path = _entry_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        # поврежденная (или только что вытесненная) запись считается промахом и будет перезаписана
+        return None
+    _touch(path)
+    return entry
+
+
+def save_entry(cache_dir, key, df, context):
+    """сохранение результата этапа; запись через временный файл, чтобы не оставить половину
+
+    имя временного файла включает pid: одинаковые файлы в пакетной очистке
+    могут сохранять один и тот же этап из разных процессов одновременно
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(cache_dir, key)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((df, context), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    prune_cache(cache_dir, keep=[path])
+
+
+def find_cached_stage(cache_dir, keys):
+    """номер последнего этапа, результат которого есть в кэше, и сам результат (или -1, None)"""
+    for i in range(len(keys) - 1, -1, -1):
+        entry = load_entry(cache_dir, keys[i])
+        if entry is not None:
+            return i, entry
+    return -1, None
+
+
+def output_path(cache_dir, key, suffix):
+    """путь готового выходного файла в кэше (suffix различает csv и форматы/сжатие копии)"""
+    return os.path.join(cache_dir, f'{_digest(key, suffix)}{suffix}')
+
+
+def restore_output(cache_dir, key, suffix, path):
+    """копирование готового выходного файла из кэша; False, если его там нет"""
+    cached = output_path(cache_dir, key, suffix)
+    try:
+        shutil.copyfile(cached, path)
+    except FileNotFoundError:
+        return False
+    _touch(cached)
+    return True
+
+
+def store_output(cache_dir, key, suffix, path):
+    """сохранение копии выходного файла в кэш"""
+    os.makedirs(cache_dir, exist_ok=True)
+    cached = output_path(cache_dir, key, suffix)
+    tmp_path = f'{cached}.{os.getpid()}.tmp'
+    shutil.copyfile(path, tmp_path)
+    os.replace(tmp_path, cached)
+    prune_cache(cache_dir, keep=[cached])
+
+
+def _lookups_path(cache_dir):
+    return os.path.join(cache_dir, f'lookups_v{CACHE_VERSION}.pkl')
+
+
+def load_lookups(cache_dir):
+    """словари разобранных значений столбцов из прошлых запусков (пустой, если их нет)"""
+    path = _lookups_path(cache_dir)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {}
+
+
+def save_lookups(cache_dir, lookups):
+    """сохранение словарей разобранных значений через временный файл"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _lookups_path(cache_dir)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(lookups, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _touch(path):
+    """отметка использования файла кэша для вытеснения давно не использованных"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_cache(cache_dir, max_bytes=None, keep=()):
+    """удаление файлов кэша, начиная с давно не использованных, пока каталог больше max_bytes
+
+    по умолчанию предел - CACHE_MAX_BYTES; файлы keep (только что записанные) и словарь
+    текущей версии не удаляются, словари старых версий удаляются всегда;
+    возвращает число освобожденных байт
+    """
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    lookups_path = _lookups_path(cache_dir)
+    protected = {lookups_path, *keep}
+    files = []
+    freed = 0
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            # временные файлы пишутся другими процессами прямо сейчас
+            if not entry.is_file() or entry.name.endswith('.tmp'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.startswith('lookups_v') and entry.path != lookups_path:
+                _remove(entry.path)
+                freed += stat.st_size
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        if path in protected:
+            continue
+        _remove(path)
+        freed += size
+        total -= size
+    return freed
+
+
+def _remove(path):
+    """удаление файла кэша; файл мог уже удалить параллельный процесс"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
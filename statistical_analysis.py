@@ -1,33 +1,45 @@
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 from scipy.stats import chi2_contingency, ttest_ind
 import warnings
+
+from correlation_engine import correlation_submatrix, top_pairs
+from dataset_loader import last_load, load_players
+from descriptive_stats import describe_columns
+from reporting import SUMMARY, configure_from_argv, note, section, write_json
+
 warnings.filterwarnings('ignore')
 
 # Настройка для отображения русских символов
 plt.rcParams['font.family'] = ['DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
+# --verbosity quiet|summary|full и --report-json: подробность вывода и отчет в json
+configure_from_argv('статистический анализ данных fifa 2021')
+
 
-print("СТАТИСТИЧЕСКИЙ АНАЛИЗ ДАННЫХ FIFA 2021")
+note("СТАТИСТИЧЕСКИЙ АНАЛИЗ ДАННЫХ FIFA 2021", SUMMARY)
 
 
 # Загрузка данных
-print("\n1. ЗАГРУЗКА ДАННЫХ")
+note("\n1. ЗАГРУЗКА ДАННЫХ", SUMMARY)
 
-df = pd.read_csv('players_cleaned.csv')
-print(f"Размер датасета: {df.shape}")
-print(f"Количество игроков: {len(df)}")
-print(f"Количество признаков: {len(df.columns)}")
+# общая загрузка скриптов анализа (dataset_loader.py): типизированная копия или csv по схеме,
+# разобранный csv кэшируется на диске, поэтому следующие скрипты его не разбирают
+df = load_players()
+note(lambda: f"Источник: {last_load['source']} ({last_load['origin']}, {last_load['seconds']:.2f} с), "
+     f"память: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+note(f"Размер датасета: {df.shape}", SUMMARY)
+note(f"Количество игроков: {len(df)}")
+note(f"Количество признаков: {len(df.columns)}")
 
 
 
 # 1. основные статистические показатели
-print("\n" )
-print("2. основные статистические показатели")
+note("\n" , SUMMARY)
+note("2. основные статистические показатели", SUMMARY)
 
 
 # Выбираем ключевые числовые признаки для анализа
@@ -41,128 +53,110 @@ key_numeric_columns = [
 # Фильтруем только существующие колонки
 key_numeric_columns = [col for col in key_numeric_columns if col in df.columns]
 
-print("\n2.1. ОСНОВНЫЕ СТАТИСТИЧЕСКИЕ ПОКАЗАТЕЛИ ПО КЛЮЧЕВЫМ ПРИЗНАКАМ:")
-print("-" * 70)
+note("\n2.1. ОСНОВНЫЕ СТАТИСТИЧЕСКИЕ ПОКАЗАТЕЛИ ПО КЛЮЧЕВЫМ ПРИЗНАКАМ:")
+note("-" * 70)
 
-# Создаем таблицу с основными статистическими показателями
-stats_summary = pd.DataFrame()
+# все показатели по ключевым признакам одним проходом (descriptive_stats.py); таблица и
+# интерпретации ниже читают одни и те же значения
+key_stats = describe_columns(df, key_numeric_columns)
+stats_summary = key_stats[['mean', 'median', 'mode', 'std', 'min', 'q25', 'q50', 'q75', 'max', 'skew', 'kurtosis']]
+stats_summary.columns = [
+    'Среднее (mean)', 'Медиана (median)', 'Мода (mode)', 'Стандартное отклонение (std)', 'Минимум',
+    '25% (Q1)', '50% (Q2)', '75% (Q3)', 'Максимум', 'Асимметрия', 'Эксцесс',
+]
 
-for col in key_numeric_columns:
-    stats_summary.loc[col, 'Среднее (mean)'] = df[col].mean()
-    stats_summary.loc[col, 'Медиана (median)'] = df[col].median()
-    stats_summary.loc[col, 'Мода (mode)'] = df[col].mode().iloc[0] if len(df[col].mode()) > 0 else np.nan
-    stats_summary.loc[col, 'Стандартное отклонение (std)'] = df[col].std()
-    stats_summary.loc[col, 'Минимум'] = df[col].min()
-    stats_summary.loc[col, '25% (Q1)'] = df[col].quantile(0.25)
-    stats_summary.loc[col, '50% (Q2)'] = df[col].quantile(0.50)
-    stats_summary.loc[col, '75% (Q3)'] = df[col].quantile(0.75)
-    stats_summary.loc[col, 'Максимум'] = df[col].max()
-    stats_summary.loc[col, 'Асимметрия'] = df[col].skew()
-    stats_summary.loc[col, 'Эксцесс'] = df[col].kurtosis()
-
-print(stats_summary.round(2))
-
-print("\n2.2. ИНТЕРПРЕТАЦИЯ СТАТИСТИЧЕСКИХ ПОКАЗАТЕЛЕЙ:")
-print("-" * 70)
+section(None, lambda: stats_summary.round(2))
+
+note("\n2.2. ИНТЕРПРЕТАЦИЯ СТАТИСТИЧЕСКИХ ПОКАЗАТЕЛЕЙ:")
+note("-" * 70)
 
 for col in key_numeric_columns:
-    mean_val = df[col].mean()
-    median_val = df[col].median()
-    std_val = df[col].std()
-    skew_val = df[col].skew()
+    mean_val = key_stats.loc[col, 'mean']
+    median_val = key_stats.loc[col, 'median']
+    std_val = key_stats.loc[col, 'std']
+    skew_val = key_stats.loc[col, 'skew']
     
-    print(f"\n{col.upper()}:")
-    print(f"  Среднее: {mean_val:.2f}, Медиана: {median_val:.2f}")
-    print(f"  Стандартное отклонение: {std_val:.2f}")
+    note(f"\n{col.upper()}:")
+    note(f"  Среднее: {mean_val:.2f}, Медиана: {median_val:.2f}")
+    note(f"  Стандартное отклонение: {std_val:.2f}")
     
     # Анализ асимметрии
     if abs(skew_val) < 0.5:
-        print(f"  Распределение: близко к нормальному (асимметрия: {skew_val:.2f})")
+        note(f"  Распределение: близко к нормальному (асимметрия: {skew_val:.2f})")
     elif skew_val > 0.5:
-        print(f"  Распределение: правосторонняя асимметрия (асимметрия: {skew_val:.2f})")
+        note(f"  Распределение: правосторонняя асимметрия (асимметрия: {skew_val:.2f})")
     else:
-        print(f"  Распределение: левосторонняя асимметрия (асимметрия: {skew_val:.2f})")
+        note(f"  Распределение: левосторонняя асимметрия (асимметрия: {skew_val:.2f})")
     
     # Анализ разброса
     cv = std_val / mean_val * 100
-    print(f"  Коэффициент вариации: {cv:.1f}%")
+    note(f"  Коэффициент вариации: {cv:.1f}%")
 
 # 2. МАТРИЦА КОРРЕЛЯЦИЙ
-print("\n" )
-print("3. матрица корреляций")
-
+note("\n" , SUMMARY)
+note("3. матрица корреляций", SUMMARY)
 
-print("\n3.1. расчет корреляционной матрицы:")
 
+note("\n3.1. расчет корреляционной матрицы:")
 
-# Создаем корреляционную матрицу
-correlation_matrix = df[key_numeric_columns].corr()
 
-print("Корреляционная матрица (топ-10 корреляций):")
-print(correlation_matrix.round(3))
+# Создаем корреляционную матрицу: подматрица общей матрицы всех числовых признаков (correlation_engine.py)
+correlation_matrix = correlation_submatrix(df, key_numeric_columns)
 
-print("\n3.2. ВЫСОКИЕ КОРРЕЛЯЦИИ (|r| > 0.7):")
+note("Корреляционная матрица (топ-10 корреляций):")
+section(None, lambda: correlation_matrix.round(3))
 
+note("\n3.2. ВЫСОКИЕ КОРРЕЛЯЦИИ (|r| > 0.7):")
 
-# Находим высокие корреляции
-high_correlations = []
-for i in range(len(correlation_matrix.columns)):
-    for j in range(i+1, len(correlation_matrix.columns)):
-        corr_value = correlation_matrix.iloc[i, j]
-        if abs(corr_value) > 0.7:
-            high_correlations.append({
-                'Признак 1': correlation_matrix.columns[i],
-                'Признак 2': correlation_matrix.columns[j],
-                'Корреляция': corr_value
-            })
 
-high_corr_df = pd.DataFrame(high_correlations)
+# Находим высокие корреляции: верхний треугольник матрицы, по убыванию |r|
+high_corr_df = top_pairs(correlation_matrix, threshold=0.7).rename(columns={
+    'feature_1': 'Признак 1', 'feature_2': 'Признак 2', 'correlation': 'Корреляция'})
 if len(high_corr_df) > 0:
-    high_corr_df = high_corr_df.sort_values('Корреляция', key=abs, ascending=False)
-    print(high_corr_df.round(3))
+    section(None, lambda: high_corr_df.round(3))
 else:
-    print("Высоких корреляций (|r| > 0.7) не найдено")
+    note("Высоких корреляций (|r| > 0.7) не найдено")
 
-print("\n3.3. КОРРЕЛЯЦИИ С ОБЩИМ РЕЙТИНГОМ (OVA):")
+note("\n3.3. КОРРЕЛЯЦИИ С ОБЩИМ РЕЙТИНГОМ (OVA):")
 
 
 ova_correlations = correlation_matrix['ova'].sort_values(ascending=False)
-print("Топ-10 корреляций с общим рейтингом:")
+note("Топ-10 корреляций с общим рейтингом:")
 for i, (feature, corr) in enumerate(ova_correlations.head(11).items()):
     if feature != 'ova':
-        print(f"{i+1}. {feature}: {corr:.3f}")
+        note(f"{i+1}. {feature}: {corr:.3f}")
 
-print("\n3.4. БИЗНЕС-ИНТЕРПРЕТАЦИЯ КОРРЕЛЯЦИЙ:")
+note("\n3.4. БИЗНЕС-ИНТЕРПРЕТАЦИЯ КОРРЕЛЯЦИЙ:")
 
 
-print("Ключевые взаимосвязи и их влияние на бизнес-процессы:")
-print("1. Реакции и общий рейтинг (r ≈ 0.87):")
-print("   - Высокая корреляция указывает на важность скорости реакции")
-print("   - Рекомендация: Приоритет при скаутинге игроков")
-print("   - Влияние: Повышение качества подбора игроков")
+note("Ключевые взаимосвязи и их влияние на бизнес-процессы:")
+note("1. Реакции и общий рейтинг (r ≈ 0.87):")
+note("   - Высокая корреляция указывает на важность скорости реакции")
+note("   - Рекомендация: Приоритет при скаутинге игроков")
+note("   - Влияние: Повышение качества подбора игроков")
 
-print("\n2. Хладнокровие и общий рейтинг (r ≈ 0.70):")
-print("   - Умеренно высокая корреляция с ментальными качествами")
-print("   - Рекомендация: Оценка психологической устойчивости")
-print("   - Влияние: Улучшение командной стабильности")
+note("\n2. Хладнокровие и общий рейтинг (r ≈ 0.70):")
+note("   - Умеренно высокая корреляция с ментальными качествами")
+note("   - Рекомендация: Оценка психологической устойчивости")
+note("   - Влияние: Улучшение командной стабильности")
 
-print("\n3. Потенциал и текущий рейтинг (r ≈ 0.63):")
-print("   - Положительная корреляция между потенциалом и текущим уровнем")
-print("   - Рекомендация: Инвестиции в молодых игроков с высоким потенциалом")
-print("   - Влияние: Долгосрочное планирование развития команды")
+note("\n3. Потенциал и текущий рейтинг (r ≈ 0.63):")
+note("   - Положительная корреляция между потенциалом и текущим уровнем")
+note("   - Рекомендация: Инвестиции в молодых игроков с высоким потенциалом")
+note("   - Влияние: Долгосрочное планирование развития команды")
 
 # 3. анализ распределений
-print("\n" )
-print("4. анализ распределений числовых переменных")
+note("\n" , SUMMARY)
+note("4. анализ распределений числовых переменных", SUMMARY)
 
 
-print("\n4.1. создание визуализаций распределений:")
+note("\n4.1. создание визуализаций распределений:")
 
 
 
 # национальности: дополнительный анализ и визуализация
-print("\n" )
-print("8. анализ по национальностям и визуализация")
+note("\n" , SUMMARY)
+note("8. анализ по национальностям и визуализация", SUMMARY)
 
 
 # Выбираем топ-5 национальностей по количеству игроков
@@ -171,17 +165,21 @@ top_nationalities = df['nationality'].value_counts().head(top_n).index.tolist()
 features_to_plot = ['ova', 'age', 'height_cm']
 feature_titles = {'ova': 'Общий рейтинг', 'age': 'Возраст', 'height_cm': 'Рост (см)'}
 
+# показатели по странам считаются один раз: они печатаются здесь и в сводке для отчета
+nationality_stats = {nat: describe_columns(df[df['nationality'] == nat], features_to_plot)
+                     for nat in top_nationalities}
+
 # Печатаем сводные статистики по странам
-print(f"\nТоп-{top_n} национальностей по количеству игроков:")
+note(f"\nТоп-{top_n} национальностей по количеству игроков:")
 for nat in top_nationalities:
-    print(f"\nНациональность: {nat}")
-    subdf = df[df['nationality'] == nat]
+    note(f"\nНациональность: {nat}")
+    nat_stats = nationality_stats[nat]
     for feat in features_to_plot:
-        print(f"  {feature_titles[feat]}:")
-        print(f"    Среднее: {subdf[feat].mean():.2f}")
-        print(f"    Медиана: {subdf[feat].median():.2f}")
-        print(f"    Стандартное отклонение: {subdf[feat].std():.2f}")
-        print(f"    Мин: {subdf[feat].min():.2f}, Макс: {subdf[feat].max():.2f}")
+        note(f"  {feature_titles[feat]}:")
+        note(f"    Среднее: {nat_stats.loc[feat, 'mean']:.2f}")
+        note(f"    Медиана: {nat_stats.loc[feat, 'median']:.2f}")
+        note(f"    Стандартное отклонение: {nat_stats.loc[feat, 'std']:.2f}")
+        note(f"    Мин: {nat_stats.loc[feat, 'min']:.2f}, Макс: {nat_stats.loc[feat, 'max']:.2f}")
 
 # Визуализация распределений по странам
 fig, axes = plt.subplots(len(features_to_plot), 1, figsize=(10, 16))
@@ -204,7 +202,7 @@ for i, feat in enumerate(features_to_plot):
 plt.tight_layout(rect=[0, 0, 1, 0.97])
 plt.savefig('fifa_distributions_by_nationality.png', dpi=300, bbox_inches='tight')
 plt.show()
-print("\nВизуализация по странам сохранена в файл 'fifa_distributions_by_nationality.png'")
+note("\nВизуализация по странам сохранена в файл 'fifa_distributions_by_nationality.png'")
 
 
 
@@ -227,7 +225,7 @@ for i, (feature, title) in enumerate(zip(key_features, titles)):
     axes[row, col].set_ylabel('Частота')
     
     # Добавляем вертикальную линию среднего значения
-    mean_val = df[feature].mean()
+    mean_val = key_stats.loc[feature, 'mean']
     axes[row, col].axvline(mean_val, color='red', linestyle='--', 
                           label=f'Среднее: {mean_val:.1f}')
     axes[row, col].legend()
@@ -236,15 +234,15 @@ plt.tight_layout()
 plt.savefig('fifa_distributions.png', dpi=300, bbox_inches='tight')
 plt.show()
 
-print("Графики распределений сохранены в файл 'fifa_distributions.png'")
+note("Графики распределений сохранены в файл 'fifa_distributions.png'")
 
-print("\n4.2. АНАЛИЗ ВЫБРОСОВ:")
+note("\n4.2. АНАЛИЗ ВЫБРОСОВ:")
 
 
 # Анализ выбросов с помощью метода IQR
 for col in key_numeric_columns[:6]:  # Анализируем первые 6 признаков
-    Q1 = df[col].quantile(0.25)
-    Q3 = df[col].quantile(0.75)
+    Q1 = key_stats.loc[col, 'q25']
+    Q3 = key_stats.loc[col, 'q75']
     IQR = Q3 - Q1
     lower_bound = Q1 - 1.5 * IQR
     upper_bound = Q3 + 1.5 * IQR
@@ -252,20 +250,20 @@ for col in key_numeric_columns[:6]:  # Анализируем первые 6 п
     outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
     outlier_percentage = (len(outliers) / len(df)) * 100
     
-    print(f"\n{col.upper()}:")
-    print(f"  Выбросы: {len(outliers)} ({outlier_percentage:.1f}%)")
-    print(f"  Нижняя граница: {lower_bound:.2f}")
-    print(f"  Верхняя граница: {upper_bound:.2f}")
+    note(f"\n{col.upper()}:")
+    note(f"  Выбросы: {len(outliers)} ({outlier_percentage:.1f}%)")
+    note(f"  Нижняя граница: {lower_bound:.2f}")
+    note(f"  Верхняя граница: {upper_bound:.2f}")
     
     if len(outliers) > 0:
-        print(f"  Примеры выбросов: {outliers[col].head(3).tolist()}")
+        note(f"  Примеры выбросов: {outliers[col].head(3).tolist()}")
 
 # 4. ТАБЛИЦЫ СОПРЯЖЕННОСТИ
-print("\n" )
-print("5. ТАБЛИЦЫ СОПРЯЖЕННОСТИ")
+note("\n" , SUMMARY)
+note("5. ТАБЛИЦЫ СОПРЯЖЕННОСТИ", SUMMARY)
 
 
-print("\n5.1. СОЗДАНИЕ КАТЕГОРИАЛЬНЫХ ПЕРЕМЕННЫХ:")
+note("\n5.1. СОЗДАНИЕ КАТЕГОРИАЛЬНЫХ ПЕРЕМЕННЫХ:")
 
 
 # Создаем категориальные переменные
@@ -278,17 +276,17 @@ df['rating_group'] = pd.cut(df['ova'], bins=[0, 60, 70, 80, 85, 100],
 df['height_group'] = pd.cut(df['height_cm'], bins=[0, 170, 175, 180, 185, 300], 
                            labels=['До 170', '170-175', '175-180', '180-185', '185+'])
 
-print("\n5.2. ТАБЛИЦА СОПРЯЖЕННОСТИ: ВОЗРАСТ И РЕЙТИНГ")
+note("\n5.2. ТАБЛИЦА СОПРЯЖЕННОСТИ: ВОЗРАСТ И РЕЙТИНГ")
 
 
 age_rating_crosstab = pd.crosstab(df['age_group'], df['rating_group'], margins=True)
-print(age_rating_crosstab)
+section(None, lambda: age_rating_crosstab)
 
-print("\nДоли по возрастным группам:")
+note("\nДоли по возрастным группам:")
 age_rating_percentages = pd.crosstab(df['age_group'], df['rating_group'], normalize='index') * 100
-print(age_rating_percentages.round(1))
+section(None, lambda: age_rating_percentages.round(1))
 
-print("\n5.3. таблица сопряженности: рост и позиции")
+note("\n5.3. таблица сопряженности: рост и позиции")
 
 
 # Группируем позиции по основным категориям
@@ -307,13 +305,13 @@ def categorize_position(pos):
 df['position_category'] = df['positions_formatted'].apply(categorize_position)
 
 height_position_crosstab = pd.crosstab(df['height_group'], df['position_category'], margins=True)
-print(height_position_crosstab)
+section(None, lambda: height_position_crosstab)
 
-print("\nДоли по росту:")
+note("\nДоли по росту:")
 height_position_percentages = pd.crosstab(df['height_group'], df['position_category'], normalize='index') * 100
-print(height_position_percentages.round(1))
+section(None, lambda: height_position_percentages.round(1))
 
-print("\n5.4. ТАБЛИЦА СОПРЯЖЕННОСТИ: НАЦИОНАЛЬНОСТЬ И РЕЙТИНГ")
+note("\n5.4. ТАБЛИЦА СОПРЯЖЕННОСТИ: НАЦИОНАЛЬНОСТЬ И РЕЙТИНГ")
 
 
 # Выбираем топ-10 стран по количеству игроков
@@ -322,20 +320,20 @@ df_top_countries = df[df['nationality'].isin(top_countries)]
 
 nationality_rating_crosstab = pd.crosstab(df_top_countries['nationality'], 
                                         df_top_countries['rating_group'], margins=True)
-print(nationality_rating_crosstab)
+section(None, lambda: nationality_rating_crosstab)
 
-print("\nСредний рейтинг по странам:")
-avg_rating_by_country = df_top_countries.groupby('nationality')['ova'].agg(['mean', 'count']).round(2)
+note("\nСредний рейтинг по странам:")
+avg_rating_by_country = df_top_countries.groupby('nationality', observed=True)['ova'].agg(['mean', 'count']).round(2)
 avg_rating_by_country.columns = ['Средний рейтинг', 'Количество игроков']
-print(avg_rating_by_country.sort_values('Средний рейтинг', ascending=False))
+section(None, lambda: avg_rating_by_country.sort_values('Средний рейтинг', ascending=False))
 
 # 5. проверка гипотез
-print("\n" )
-print("6. проверка гипотез")
+note("\n" , SUMMARY)
+note("6. проверка гипотез", SUMMARY)
 
 
-print("\n6.1. т-тест: сравнение рейтингов молодых и опытных игроков")
-print("-" * 70)
+note("\n6.1. т-тест: сравнение рейтингов молодых и опытных игроков")
+note("-" * 70)
 
 # Гипотеза: Средний рейтинг молодых игроков (до 25 лет) отличается от опытных (25+ лет)
 young_players = df[df['age'] < 25]['ova']
@@ -343,15 +341,15 @@ experienced_players = df[df['age'] >= 25]['ova']
 
 t_stat, p_value = ttest_ind(young_players, experienced_players)
 
-print(f"Гипотеза: Средний рейтинг молодых игроков (до 25 лет) отличается от опытных (25+ лет)")
-print(f"Молодые игроки (до 25 лет): n={len(young_players)}, среднее={young_players.mean():.2f}")
-print(f"Опытные игроки (25+ лет): n={len(experienced_players)}, среднее={experienced_players.mean():.2f}")
-print(f"t-статистика: {t_stat:.4f}")
-print(f"p-значение: {p_value:.6f}")
-print(f"Результат: {'Отклоняем нулевую гипотезу' if p_value < 0.05 else 'Не отклоняем нулевую гипотезу'} (α=0.05)")
+note(f"Гипотеза: Средний рейтинг молодых игроков (до 25 лет) отличается от опытных (25+ лет)")
+note(lambda: f"Молодые игроки (до 25 лет): n={len(young_players)}, среднее={young_players.mean():.2f}")
+note(lambda: f"Опытные игроки (25+ лет): n={len(experienced_players)}, среднее={experienced_players.mean():.2f}")
+note(f"t-статистика: {t_stat:.4f}")
+note(f"p-значение: {p_value:.6f}")
+note(f"Результат: {'Отклоняем нулевую гипотезу' if p_value < 0.05 else 'Не отклоняем нулевую гипотезу'} (α=0.05)", SUMMARY)
 
-print("\n6.2. Т-ТЕСТ: СРАВНЕНИЕ РОСТА ВРАТАРЕЙ И ПОЛЕВЫХ ИГРОКОВ")
-print("-" * 70)
+note("\n6.2. Т-ТЕСТ: СРАВНЕНИЕ РОСТА ВРАТАРЕЙ И ПОЛЕВЫХ ИГРОКОВ")
+note("-" * 70)
 
 # Гипотеза: Средний рост вратарей отличается от полевых игроков
 goalkeepers = df[df['position_category'] == 'Вратарь']['height_cm']
@@ -359,151 +357,155 @@ field_players = df[df['position_category'] != 'Вратарь']['height_cm']
 
 t_stat, p_value = ttest_ind(goalkeepers, field_players)
 
-print(f"Гипотеза: Средний рост вратарей отличается от полевых игроков")
-print(f"Вратари: n={len(goalkeepers)}, средний рост={goalkeepers.mean():.2f} см")
-print(f"Полевые игроки: n={len(field_players)}, средний рост={field_players.mean():.2f} см")
-print(f"t-статистика: {t_stat:.4f}")
-print(f"p-значение: {p_value:.6f}")
-print(f"Результат: {'Отклоняем нулевую гипотезу' if p_value < 0.05 else 'Не отклоняем нулевую гипотезу'} (α=0.05)")
+note(f"Гипотеза: Средний рост вратарей отличается от полевых игроков")
+note(lambda: f"Вратари: n={len(goalkeepers)}, средний рост={goalkeepers.mean():.2f} см")
+note(lambda: f"Полевые игроки: n={len(field_players)}, средний рост={field_players.mean():.2f} см")
+note(f"t-статистика: {t_stat:.4f}")
+note(f"p-значение: {p_value:.6f}")
+note(f"Результат: {'Отклоняем нулевую гипотезу' if p_value < 0.05 else 'Не отклоняем нулевую гипотезу'} (α=0.05)", SUMMARY)
 
-print("\n6.3. ХИ-КВАДРАТ ТЕСТ: НЕЗАВИСИМОСТЬ ВОЗРАСТА И РЕЙТИНГА")
-print("-" * 70)
+note("\n6.3. ХИ-КВАДРАТ ТЕСТ: НЕЗАВИСИМОСТЬ ВОЗРАСТА И РЕЙТИНГА")
+note("-" * 70)
 
 # Гипотеза: Возраст и рейтинг независимы
 contingency_table = pd.crosstab(df['age_group'], df['rating_group'])
 chi2, p_value, dof, expected = chi2_contingency(contingency_table)
 
-print(f"Гипотеза: Возраст и рейтинг независимы")
-print(f"Хи-квадрат статистика: {chi2:.4f}")
-print(f"Степени свободы: {dof}")
-print(f"p-значение: {p_value:.6f}")
-print(f"Результат: {'Отклоняем нулевую гипотезу' if p_value < 0.05 else 'Не отклоняем нулевую гипотезу'} (α=0.05)")
+note(f"Гипотеза: Возраст и рейтинг независимы")
+note(f"Хи-квадрат статистика: {chi2:.4f}")
+note(f"Степени свободы: {dof}")
+note(f"p-значение: {p_value:.6f}")
+note(f"Результат: {'Отклоняем нулевую гипотезу' if p_value < 0.05 else 'Не отклоняем нулевую гипотезу'} (α=0.05)", SUMMARY)
 
-print("\n6.4. ХИ-КВАДРАТ ТЕСТ: НЕЗАВИСИМОСТЬ РОСТА И ПОЗИЦИИ")
-print("-" * 70)
+note("\n6.4. ХИ-КВАДРАТ ТЕСТ: НЕЗАВИСИМОСТЬ РОСТА И ПОЗИЦИИ")
+note("-" * 70)
 
 # Гипотеза: Рост и позиция независимы
 contingency_table2 = pd.crosstab(df['height_group'], df['position_category'])
 chi2, p_value, dof, expected = chi2_contingency(contingency_table2)
 
-print(f"Гипотеза: Рост и позиция независимы")
-print(f"Хи-квадрат статистика: {chi2:.4f}")
-print(f"Степени свободы: {dof}")
-print(f"p-значение: {p_value:.6f}")
-print(f"Результат: {'Отклоняем нулевую гипотезу' if p_value < 0.05 else 'Не отклоняем нулевую гипотезу'} (α=0.05)")
+note(f"Гипотеза: Рост и позиция независимы")
+note(f"Хи-квадрат статистика: {chi2:.4f}")
+note(f"Степени свободы: {dof}")
+note(f"p-значение: {p_value:.6f}")
+note(f"Результат: {'Отклоняем нулевую гипотезу' if p_value < 0.05 else 'Не отклоняем нулевую гипотезу'} (α=0.05)", SUMMARY)
 
 # 6. выводы и рекомендации
-print("\n" )
-print("7. выводы и рекомендации")
+note("\n" , SUMMARY)
+note("7. выводы и рекомендации", SUMMARY)
 
 
-print("\n7.1. выводы по статистическому анализу:")
+note("\n7.1. выводы по статистическому анализу:")
 
 
-print("1. основные статистические показатели:")
-print("   - возраст игроков: средний 25.2 года, медиана 25 лет")
-print("   - общий рейтинг: средний 65.7, медиана 66, правосторонняя асимметрия")
-print("   - рост игроков: средний 181.2 см, нормальное распределение")
-print("   - выявлены выбросы в возрасте (до 16 лет) и росте (до 205 см)")
+note("1. основные статистические показатели:")
+note("   - возраст игроков: средний 25.2 года, медиана 25 лет")
+note("   - общий рейтинг: средний 65.7, медиана 66, правосторонняя асимметрия")
+note("   - рост игроков: средний 181.2 см, нормальное распределение")
+note("   - выявлены выбросы в возрасте (до 16 лет) и росте (до 205 см)")
 
-print("\n2. корреляционный анализ:")
-print("   - найдены сильные корреляции между реакциями и общим рейтингом (r=0.87)")
-print("   - хладнокровие коррелирует с рейтингом (r=0.70)")
-print("   - потенциал умеренно коррелирует с текущим рейтингом (r=0.63)")
-print("   - физические характеристики слабо коррелируют с рейтингом")
+note("\n2. корреляционный анализ:")
+note("   - найдены сильные корреляции между реакциями и общим рейтингом (r=0.87)")
+note("   - хладнокровие коррелирует с рейтингом (r=0.70)")
+note("   - потенциал умеренно коррелирует с текущим рейтингом (r=0.63)")
+note("   - физические характеристики слабо коррелируют с рейтингом")
 
-print("\n3. анализ распределений:")
-print("   - возраст: правосторонняя асимметрия, пик в 20-25 лет")
-print("   - рейтинг: правосторонняя асимметрия, большинство игроков 60-70")
-print("   - рост: близко к нормальному распределению")
-print("   - навыки: различные распределения, зависящие от позиции")
+note("\n3. анализ распределений:")
+note("   - возраст: правосторонняя асимметрия, пик в 20-25 лет")
+note("   - рейтинг: правосторонняя асимметрия, большинство игроков 60-70")
+note("   - рост: близко к нормальному распределению")
+note("   - навыки: различные распределения, зависящие от позиции")
 
-print("\n4. таблицы сопряженности:")
-print("   - возраст и рейтинг: сильная зависимость (p < 0.001)")
-print("   - рост и позиция: сильная зависимость (p < 0.001)")
-print("   - национальность и рейтинг: умеренная зависимость")
+note("\n4. таблицы сопряженности:")
+note("   - возраст и рейтинг: сильная зависимость (p < 0.001)")
+note("   - рост и позиция: сильная зависимость (p < 0.001)")
+note("   - национальность и рейтинг: умеренная зависимость")
 
-print("\n5. проверка гипотез:")
-print("   - опытные игроки имеют более высокий рейтинг (p < 0.001)")
-print("   - вратари выше полевых игроков (p < 0.001)")
-print("   - возраст и рейтинг зависимы (p < 0.001)")
-print("   - рост и позиция зависимы (p < 0.001)")
+note("\n5. проверка гипотез:")
+note("   - опытные игроки имеют более высокий рейтинг (p < 0.001)")
+note("   - вратари выше полевых игроков (p < 0.001)")
+note("   - возраст и рейтинг зависимы (p < 0.001)")
+note("   - рост и позиция зависимы (p < 0.001)")
 
-print("\n7.2. бизнес-рекомендации:")
+note("\n7.2. бизнес-рекомендации:")
 
 
-print("1. СКАУТИНГ И ПОДБОР ИГРОКОВ:")
-print("   - Приоритет реакциям и хладнокровию при оценке игроков")
-print("   - Фокус на игроках 25-30 лет для максимального рейтинга")
-print("   - Учет физических характеристик в зависимости от позиции")
-print("   - Инвестиции в молодых игроков с высоким потенциалом")
+note("1. СКАУТИНГ И ПОДБОР ИГРОКОВ:")
+note("   - Приоритет реакциям и хладнокровию при оценке игроков")
+note("   - Фокус на игроках 25-30 лет для максимального рейтинга")
+note("   - Учет физических характеристик в зависимости от позиции")
+note("   - Инвестиции в молодых игроков с высоким потенциалом")
 
-print("\n2. РАЗВИТИЕ ИГРОКОВ:")
-print("   - Тренировка реакций как ключевого навыка")
-print("   - Психологическая подготовка для улучшения хладнокровия")
-print("   - Специализированные программы по позициям")
-print("   - Долгосрочное планирование карьеры игроков")
+note("\n2. РАЗВИТИЕ ИГРОКОВ:")
+note("   - Тренировка реакций как ключевого навыка")
+note("   - Психологическая подготовка для улучшения хладнокровия")
+note("   - Специализированные программы по позициям")
+note("   - Долгосрочное планирование карьеры игроков")
 
-print("\n3. УПРАВЛЕНИЕ КОМАНДОЙ:")
-print("   - Сбалансированный возрастной состав (25-30 лет)")
-print("   - Учет национальных особенностей при подборе")
-print("   - Специализация по позициям с учетом физических данных")
-print("   - Мониторинг развития потенциала молодых игроков")
+note("\n3. УПРАВЛЕНИЕ КОМАНДОЙ:")
+note("   - Сбалансированный возрастной состав (25-30 лет)")
+note("   - Учет национальных особенностей при подборе")
+note("   - Специализация по позициям с учетом физических данных")
+note("   - Мониторинг развития потенциала молодых игроков")
 
-print("\n4. СТРАТЕГИЧЕСКОЕ ПЛАНИРОВАНИЕ:")
-print("   - Анализ рынка игроков по возрастным группам")
-print("   - Оценка эффективности скаутинговых программ")
-print("   - Разработка критериев оценки игроков")
-print("   - Планирование трансферной политики")
+note("\n4. СТРАТЕГИЧЕСКОЕ ПЛАНИРОВАНИЕ:")
+note("   - Анализ рынка игроков по возрастным группам")
+note("   - Оценка эффективности скаутинговых программ")
+note("   - Разработка критериев оценки игроков")
+note("   - Планирование трансферной политики")
 
-print("\n7.3. ТЕХНИЧЕСКИЕ ДОСТИЖЕНИЯ:")
+note("\n7.3. ТЕХНИЧЕСКИЕ ДОСТИЖЕНИЯ:")
 
 
-print("1. СТАТИСТИЧЕСКИЙ АНАЛИЗ:")
-print("   - Рассчитаны все основные статистические показатели")
-print("   - Выполнен корреляционный анализ с выявлением сильных связей")
-print("   - Проведен анализ распределений с визуализацией")
-print("   - Созданы таблицы сопряженности для категориальных признаков")
+note("1. СТАТИСТИЧЕСКИЙ АНАЛИЗ:")
+note("   - Рассчитаны все основные статистические показатели")
+note("   - Выполнен корреляционный анализ с выявлением сильных связей")
+note("   - Проведен анализ распределений с визуализацией")
+note("   - Созданы таблицы сопряженности для категориальных признаков")
 
-print("\n2. ПРОВЕРКА ГИПОТЕЗ:")
-print("   - Выполнены t-тесты для сравнения групп")
-print("   - Проведены хи-квадрат тесты для категориальных данных")
-print("   - Все гипотезы проверены на уровне значимости α=0.05")
-print("   - Получены статистически значимые результаты")
+note("\n2. ПРОВЕРКА ГИПОТЕЗ:")
+note("   - Выполнены t-тесты для сравнения групп")
+note("   - Проведены хи-квадрат тесты для категориальных данных")
+note("   - Все гипотезы проверены на уровне значимости α=0.05")
+note("   - Получены статистически значимые результаты")
 
-print("\n3. БИЗНЕС-АНАЛИЗ:")
-print("   - Выявлены ключевые факторы успеха игроков")
-print("   - Определены оптимальные возрастные диапазоны")
-print("   - Установлены зависимости между характеристиками")
-print("   - Предоставлены практические рекомендации")
+note("\n3. БИЗНЕС-АНАЛИЗ:")
+note("   - Выявлены ключевые факторы успеха игроков")
+note("   - Определены оптимальные возрастные диапазоны")
+note("   - Установлены зависимости между характеристиками")
+note("   - Предоставлены практические рекомендации")
 
 
 # сводная статистика по топ-5 национальностям
-print("\n")
-print("сводная статистика по топ-5 национальностям (для отчета)")
+note("\n", SUMMARY)
+note("сводная статистика по топ-5 национальностям (для отчета)", SUMMARY)
 
 
 for nat in top_nationalities:
-    subdf = df[df['nationality'] == nat]
-    print(f"\nНациональность: {nat}")
+    nat_stats = nationality_stats[nat]
+    note(f"\nНациональность: {nat}")
     for feat in features_to_plot:
-        print(f"  {feature_titles[feat]}:")
-        print(f"    Среднее: {subdf[feat].mean():.2f}")
-        print(f"    Медиана: {subdf[feat].median():.2f}")
-        print(f"    Стандартное отклонение: {subdf[feat].std():.2f}")
-        print(f"    Мин: {subdf[feat].min():.2f}, Макс: {subdf[feat].max():.2f}")
+        note(f"  {feature_titles[feat]}:")
+        note(f"    Среднее: {nat_stats.loc[feat, 'mean']:.2f}")
+        note(f"    Медиана: {nat_stats.loc[feat, 'median']:.2f}")
+        note(f"    Стандартное отклонение: {nat_stats.loc[feat, 'std']:.2f}")
+        note(f"    Мин: {nat_stats.loc[feat, 'min']:.2f}, Макс: {nat_stats.loc[feat, 'max']:.2f}")
     # Краткая интерпретация
     if nat == 'england':
-        print("  Английские игроки моложе среднего, но имеют самый низкий средний рейтинг среди топ-5.")
+        note("  Английские игроки моложе среднего, но имеют самый низкий средний рейтинг среди топ-5.")
     elif nat == 'germany':
-        print("  Немецкие игроки самые высокие по росту, средний рейтинг чуть ниже испанцев и французов.")
+        note("  Немецкие игроки самые высокие по росту, средний рейтинг чуть ниже испанцев и французов.")
     elif nat == 'spain':
-        print("  Испанские игроки имеют самый высокий средний рейтинг и сбалансированный возраст.")
+        note("  Испанские игроки имеют самый высокий средний рейтинг и сбалансированный возраст.")
     elif nat == 'france':
-        print("  Французские игроки молоды и имеют высокий средний рейтинг, а также высоки по росту.")
+        note("  Французские игроки молоды и имеют высокий средний рейтинг, а также высоки по росту.")
     elif nat == 'argentina':
-        print("  Аргентинские игроки старше других топ-5, но их средний рейтинг также высок.")
+        note("  Аргентинские игроки старше других топ-5, но их средний рейтинг также высок.")
 
         
-print("\n" )
-print("СТАТИСТИЧЕСКИЙ АНАЛИЗ ЗАВЕРШЕН")
+note("\n" , SUMMARY)
+note("СТАТИСТИЧЕСКИЙ АНАЛИЗ ЗАВЕРШЕН", SUMMARY)
+
+report_path = write_json()
+if report_path:
+    print(f"Отчет сохранен в '{report_path}'")
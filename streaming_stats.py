@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+статистики очищенных данных по частям: объединяемые накопители вместо одного DataFrame
+накопитель - словарь, который считается по части данных и объединяется с накопителем другой части,
+поэтому файлы читаются частями и в нескольких процессах, а в памяти остается одна часть:
+- моменты по столбцам (count, mean и суммы центральных степеней 2-4, как у Уэлфорда, объединение
+  по формулам Чана/Пебэя): среднее, std, асимметрия и эксцесс как в pandas;
+- ковариации пар столбцов по строкам, где есть оба значения (как pandas corr): корреляции;
+- точные гистограммы целых столбцов (рейтинг, возраст): точные медиана, квартили и мода;
+- t-digest остальных столбцов: квантили и границы выбросов по IQR - точные, пока различных значений
+  не больше DIGEST_EXACT_VALUES, дальше приближенные (точнее всего у краев распределения)
+запуск: python streaming_stats.py 'seasons/*.parquet' players_cleaned.csv --chunksize 200000 --workers 4
+"""
+
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from correlation_engine import top_pairs
+from descriptive_stats import STATISTICS, moment_statistics
+from reporting import SUMMARY, add_arguments, configure, note, section, write_json
+
+# ключевые признаки statistical_analysis.py
+STREAM_COLUMNS = [
+    'age', 'ova', 'pot', 'height_cm', 'weight_kg',
+    'sprint_speed', 'dribbling', 'shot_power', 'short_passing', 'stamina',
+    'strength', 'marking', 'finishing', 'ball_control', 'acceleration',
+    'agility', 'reactions', 'balance', 'vision', 'composure',
+]
+# целые столбцы с точной гистограммой значений
+HISTOGRAM_COLUMNS = ['age', 'ova', 'pot']
+CHUNKSIZE = 200_000
+# сжатие t-digest: в середине распределения центроид держит около pi / DIGEST_COMPRESSION доли значений
+DIGEST_COMPRESSION = 1000
+# пока различных значений не больше, t-digest хранит их все с частотами и квантили точные
+DIGEST_EXACT_VALUES = 2000
+HIGH_CORRELATION = 0.7
+
+
+def new_accumulator(columns=STREAM_COLUMNS, histogram_columns=HISTOGRAM_COLUMNS, covariance=True):
+    """пустой накопитель для столбцов columns"""
+    k = len(columns)
+    zeros = np.zeros(k)
+    return {
+        'columns': list(columns),
+        'moments': {'count': zeros.copy(), 'mean': zeros.copy(), 'm2': zeros.copy(), 'm3': zeros.copy(),
+                    'm4': zeros.copy(), 'min': np.full(k, np.nan), 'max': np.full(k, np.nan)},
+        'comoments': ({'count': np.zeros((k, k)), 'mean': np.zeros((k, k)), 'c': np.zeros((k, k)),
+                       'm2': np.zeros((k, k))} if covariance else None),
+        'histograms': {col: pd.Series(dtype='int64') for col in histogram_columns if col in columns},
+        'digests': {col: _new_digest() for col in columns if col not in histogram_columns},
+    }
+
+
+def _new_digest():
+    return {'means': np.empty(0), 'weights': np.empty(0), 'exact': True}
+
+
+def _compress(means, weights, exact=True, compression=DIGEST_COMPRESSION):
+    """сжатие центроидов t-digest: соседние значения объединяются в пределах единицы шкалы k1
+
+    k1(q) = compression / (2 pi) * asin(2q - 1) растет быстро у краев, поэтому крайние значения
+    остаются отдельными центроидами, а в середине центроиды крупнее; одинаковые значения
+    сначала складываются, и если различных не больше DIGEST_EXACT_VALUES, сжатия нет (exact)
+    """
+    if exact:
+        means, inverse = np.unique(means, return_inverse=True)
+        weights = np.bincount(inverse, weights=weights, minlength=len(means))
+        if len(means) <= DIGEST_EXACT_VALUES:
+            return {'means': means, 'weights': weights, 'exact': True}
+    else:
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+    cumulative = np.cumsum(weights)
+    middle = (cumulative - weights / 2) / cumulative[-1]
+    scale = np.floor(compression / (2 * np.pi) * np.arcsin(2 * middle - 1))
+    starts = np.flatnonzero(np.r_[True, np.diff(scale) != 0])
+    merged_weights = np.add.reduceat(weights, starts)
+    merged_means = np.add.reduceat(means * weights, starts) / merged_weights
+    return {'means': merged_means, 'weights': merged_weights, 'exact': False}
+
+
+def _merge_digests(digest, other):
+    return _compress(np.concatenate([digest['means'], other['means']]),
+                     np.concatenate([digest['weights'], other['weights']]),
+                     digest['exact'] and other['exact'])
+
+
+def _frame_moments(block, valid):
+    """моменты части: count, mean, суммы центральных степеней, min и max по столбцам"""
+    counts = valid.sum(axis=0).astype('float64')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(counts > 0, np.nansum(block, axis=0) / counts, 0.0)
+    adjusted = np.where(valid, block - mean, 0.0)
+    squared = adjusted ** 2
+    return {
+        'count': counts, 'mean': mean,
+        'm2': squared.sum(axis=0), 'm3': (squared * adjusted).sum(axis=0), 'm4': (squared ** 2).sum(axis=0),
+        'min': np.fmin.reduce(block, axis=0), 'max': np.fmax.reduce(block, axis=0),
+    }
+
+
+def _frame_comoments(block, valid, mean):
+    """совместные моменты пар столбцов части по строкам, где есть оба значения (матричные произведения)
+
+    mean[i, j] - среднее столбца i по строкам пары (i, j), c - сумма произведений отклонений,
+    m2[i, j] - сумма квадратов отклонений столбца i по строкам пары
+    """
+    mask = valid.astype('float64')
+    # центрирование по средним части уменьшает потерю точности в суммах
+    values = np.where(valid, block - mean, 0.0)
+    counts = mask.T @ mask
+    sums = values.T @ mask
+    products = values.T @ values
+    squares = (values ** 2).T @ mask
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pair_mean = np.where(counts > 0, sums / counts, 0.0)
+        c = np.where(counts > 0, products - sums * sums.T / counts, 0.0)
+        m2 = np.where(counts > 0, squares - sums ** 2 / counts, 0.0)
+    return {'count': counts, 'mean': pair_mean + mean[:, None] * (counts > 0), 'c': c, 'm2': m2}
+
+
+def accumulate_frame(df, columns=STREAM_COLUMNS, histogram_columns=HISTOGRAM_COLUMNS, covariance=True):
+    """накопитель одной части данных (отсутствующие в части столбцы считаются пропусками)"""
+    acc = new_accumulator(columns, histogram_columns, covariance)
+    if len(df) == 0:
+        return acc
+    block = df.reindex(columns=columns).to_numpy(dtype='float64', na_value=np.nan)
+    valid = ~np.isnan(block)
+    acc['moments'] = _frame_moments(block, valid)
+    if covariance:
+        acc['comoments'] = _frame_comoments(block, valid, acc['moments']['mean'])
+    for i, col in enumerate(columns):
+        values = block[valid[:, i], i]
+        if col in acc['histograms']:
+            uniques, counts = np.unique(values, return_counts=True)
+            acc['histograms'][col] = pd.Series(counts, index=uniques, dtype='int64')
+        else:
+            acc['digests'][col] = _compress(values, np.ones(len(values)))
+    return acc
+
+
+def _merge_moments(a, b):
+    """объединение моментов двух частей (формулы Чана и Пебэя)"""
+    na, nb = a['count'], b['count']
+    n = na + nb
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = b['mean'] - a['mean']
+        share_b = np.where(n > 0, nb / n, 0.0)
+        weight = np.where(n > 0, na * nb / n, 0.0)
+        n_safe = np.where(n > 0, n, 1.0)
+        m2 = a['m2'] + b['m2'] + delta ** 2 * weight
+        m3 = (a['m3'] + b['m3'] + delta ** 3 * weight * (na - nb) / n_safe
+              + 3 * delta * (na * b['m2'] - nb * a['m2']) / n_safe)
+        m4 = (a['m4'] + b['m4'] + delta ** 4 * weight * (na ** 2 - na * nb + nb ** 2) / n_safe ** 2
+              + 6 * delta ** 2 * (na ** 2 * b['m2'] + nb ** 2 * a['m2']) / n_safe ** 2
+              + 4 * delta * (na * b['m3'] - nb * a['m3']) / n_safe)
+    return {
+        'count': n, 'mean': a['mean'] + delta * share_b, 'm2': m2, 'm3': m3, 'm4': m4,
+        'min': np.fmin(a['min'], b['min']), 'max': np.fmax(a['max'], b['max']),
+    }
+
+
+def _merge_comoments(a, b):
+    """объединение совместных моментов пар (тот же прием, что для дисперсии)"""
+    na, nb = a['count'], b['count']
+    n = na + nb
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share_b = np.where(n > 0, nb / n, 0.0)
+        weight = np.where(n > 0, na * nb / n, 0.0)
+    delta = b['mean'] - a['mean']
+    return {
+        'count': n, 'mean': a['mean'] + delta * share_b,
+        'c': a['c'] + b['c'] + delta * delta.T * weight,
+        'm2': a['m2'] + b['m2'] + delta ** 2 * weight,
+    }
+
+
+def merge_accumulators(acc, other):
+    """объединение накопителей двух частей с одинаковыми столбцами (новый словарь)"""
+    if acc['columns'] != other['columns']:
+        raise ValueError("накопители собраны по разным столбцам")
+    both_comoments = acc['comoments'] is not None and other['comoments'] is not None
+    return {
+        'columns': acc['columns'],
+        'moments': _merge_moments(acc['moments'], other['moments']),
+        'comoments': _merge_comoments(acc['comoments'], other['comoments']) if both_comoments else None,
+        'histograms': {col: hist.add(other['histograms'][col], fill_value=0).astype('int64').sort_index()
+                       for col, hist in acc['histograms'].items()},
+        'digests': {col: _merge_digests(digest, other['digests'][col]) for col, digest in acc['digests'].items()},
+    }
+
+
+def _frequencies(acc, col):
+    """все значения столбца и их частоты, если они известны точно (гистограмма или несжатый t-digest)"""
+    if col in acc['histograms']:
+        hist = acc['histograms'][col]
+        return hist.index.to_numpy(dtype='float64'), hist.to_numpy()
+    digest = acc['digests'][col]
+    if digest['exact']:
+        return digest['means'], digest['weights']
+    return None
+
+
+def _exact_quantiles(values, counts, qs):
+    """точные квантили по значениям и частотам (линейная интерполяция, как pandas quantile)"""
+    total = counts.sum()
+    if total == 0:
+        return np.full(len(qs), np.nan)
+    cumulative = counts.cumsum()
+    positions = (total - 1) * np.asarray(qs)
+    lower = values[np.searchsorted(cumulative, np.floor(positions), side='right')]
+    upper = values[np.searchsorted(cumulative, np.ceil(positions), side='right')]
+    return lower + (upper - lower) * (positions - np.floor(positions))
+
+
+def _digest_ranks(digest, minimum, maximum):
+    """опорные точки t-digest: значение и ранг центра каждого центроида, края - min и max"""
+    weights = digest['weights']
+    centers = np.cumsum(weights) - (weights + 1) / 2
+    total = weights.sum()
+    return np.r_[minimum, digest['means'], maximum], np.r_[0.0, centers, total - 1]
+
+
+def _digest_quantiles(digest, qs, minimum, maximum):
+    """приближенные квантили по сжатому t-digest"""
+    total = digest['weights'].sum()
+    if total == 0:
+        return np.full(len(qs), np.nan)
+    values, ranks = _digest_ranks(digest, minimum, maximum)
+    return np.interp((total - 1) * np.asarray(qs), ranks, values)
+
+
+def quantiles(acc, col, qs):
+    """квантили столбца: точные по частотам значений или приближенные по сжатому t-digest"""
+    frequencies = _frequencies(acc, col)
+    if frequencies is not None:
+        return _exact_quantiles(*frequencies, qs)
+    i = acc['columns'].index(col)
+    moments = acc['moments']
+    return _digest_quantiles(acc['digests'][col], qs, moments['min'][i], moments['max'][i])
+
+
+def summarize(acc):
+    """таблица STATISTICS по столбцам, как describe_columns для набора целиком
+
+    мода (наименьшее из самых частых значений) есть, только пока частоты значений известны точно
+    """
+    moments = acc['moments']
+    counts = moments['count']
+    std, skew, kurtosis = moment_statistics(counts, moments['m2'], moments['m3'], moments['m4'])
+    quartiles = np.array([quantiles(acc, col, [0.25, 0.5, 0.75]) for col in acc['columns']])
+    modes = []
+    for col in acc['columns']:
+        frequencies = _frequencies(acc, col)
+        has_values = frequencies is not None and len(frequencies[0]) > 0
+        modes.append(frequencies[0][np.argmax(frequencies[1])] if has_values else np.nan)
+    result = pd.DataFrame({
+        'count': counts.astype('int64'),
+        'mean': np.where(counts > 0, moments['mean'], np.nan),
+        'median': quartiles[:, 1],
+        'mode': modes,
+        'std': std,
+        'min': moments['min'],
+        'q25': quartiles[:, 0],
+        'q50': quartiles[:, 1],
+        'q75': quartiles[:, 2],
+        'max': moments['max'],
+        'skew': skew,
+        'kurtosis': kurtosis,
+    }, index=pd.Index(acc['columns']))
+    return result[STATISTICS]
+
+
+def correlation(acc):
+    """матрица пирсона по строкам, где есть оба значения пары (как pandas corr)"""
+    comoments = acc['comoments']
+    if comoments is None:
+        raise ValueError("накопитель собран без ковариаций (covariance=False)")
+    with np.errstate(invalid='ignore', divide='ignore'):
+        matrix = comoments['c'] / np.sqrt(comoments['m2'] * comoments['m2'].T)
+    matrix = np.clip(matrix, -1.0, 1.0)
+    matrix[(comoments['count'] < 2) | (comoments['m2'] <= 0) | (comoments['m2'].T <= 0)] = np.nan
+    diagonal = np.flatnonzero(~np.isnan(np.diag(matrix)))
+    matrix[diagonal, diagonal] = 1.0
+    return pd.DataFrame(matrix, index=acc['columns'], columns=acc['columns'])
+
+
+def covariance(acc):
+    """матрица ковариаций (несмещенная, по строкам, где есть оба значения пары)"""
+    comoments = acc['comoments']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        matrix = np.where(comoments['count'] > 1, comoments['c'] / (comoments['count'] - 1), np.nan)
+    return pd.DataFrame(matrix, index=acc['columns'], columns=acc['columns'])
+
+
+def outliers(acc, col, whisker=1.5):
+    """границы выбросов по IQR и число значений за ними (по сжатому t-digest - приближенно)"""
+    q1, q3 = quantiles(acc, col, [0.25, 0.75])
+    lower, upper = q1 - whisker * (q3 - q1), q3 + whisker * (q3 - q1)
+    frequencies = _frequencies(acc, col)
+    if frequencies is not None:
+        values, counts = frequencies
+        outside = int(counts[(values < lower) | (values > upper)].sum())
+    else:
+        i = acc['columns'].index(col)
+        digest = acc['digests'][col]
+        total = digest['weights'].sum()
+        values, ranks = _digest_ranks(digest, acc['moments']['min'][i], acc['moments']['max'][i])
+        # ранг границы по кусочно-линейной функции распределения t-digest
+        below = np.interp(lower, values, ranks, left=-1, right=total - 1) + 1 if total else 0
+        above = total - 1 - np.interp(upper, values, ranks, left=-1, right=total - 1) if total else 0
+        outside = int(round(max(below, 0) + max(above, 0)))
+    return {'lower': lower, 'upper': upper, 'outliers': outside}
+
+
+def iter_chunks(path, columns, chunksize=CHUNKSIZE):
+    """части очищенного файла (csv, parquet или feather) только с нужными столбцами"""
+    if path.endswith('.parquet'):
+        parquet = pq.ParquetFile(path)
+        present = [col for col in columns if col in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=present):
+            yield batch.to_pandas()
+    elif path.endswith('.feather'):
+        with pa.ipc.open_file(path) as reader:
+            present = [col for col in columns if col in reader.schema.names]
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).select(present).to_pandas()
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        yield from pd.read_csv(path, usecols=[col for col in columns if col in header], chunksize=chunksize)
+
+
+def accumulate_file(path, columns=STREAM_COLUMNS, histogram_columns=HISTOGRAM_COLUMNS, chunksize=CHUNKSIZE):
+    """накопитель файла, прочитанного по частям: в памяти одна часть"""
+    acc = new_accumulator(columns, histogram_columns)
+    for chunk in iter_chunks(path, columns, chunksize):
+        acc = merge_accumulators(acc, accumulate_frame(chunk, columns, histogram_columns))
+    return acc
+
+
+def accumulate_files(paths, columns=STREAM_COLUMNS, histogram_columns=HISTOGRAM_COLUMNS,
+                     chunksize=CHUNKSIZE, workers=1):
+    """накопитель нескольких файлов (сезонов); с workers > 1 файлы читаются в отдельных процессах"""
+    acc = new_accumulator(columns, histogram_columns)
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            futures = [executor.submit(accumulate_file, path, columns, histogram_columns, chunksize)
+                       for path in paths]
+            partitions = [future.result() for future in futures]
+    else:
+        partitions = (accumulate_file(path, columns, histogram_columns, chunksize) for path in paths)
+    for partition in partitions:
+        acc = merge_accumulators(acc, partition)
+    return acc
+
+
+def expand_inputs(patterns):
+    """пути по шаблонам glob без повторов, в порядке аргументов"""
+    paths = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def main():
+    """основная функция"""
+    parser = argparse.ArgumentParser(description='статистики очищенных данных по частям')
+    parser.add_argument('inputs', nargs='+', help='очищенные csv, parquet или feather (можно шаблоны glob)')
+    parser.add_argument('--columns', nargs='+', default=STREAM_COLUMNS, help='числовые столбцы')
+    parser.add_argument('--histogram-columns', nargs='*', default=HISTOGRAM_COLUMNS,
+                        help='целые столбцы с точной гистограммой')
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE, help='строк в одной части')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='процессов (по файлам)')
+    add_arguments(parser)
+    args = parser.parse_args()
+    configure(args.verbosity, args.report_json)
+
+    paths = expand_inputs(args.inputs)
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        parser.error(f"нет файлов: {', '.join(missing)}")
+    acc = accumulate_files(paths, args.columns, args.histogram_columns, args.chunksize, args.workers)
+    rows = int(acc['moments']['count'].max()) if len(acc['columns']) else 0
+    note(f"Файлов: {len(paths)}, строк: {rows}", SUMMARY)
+
+    note("\nОСНОВНЫЕ СТАТИСТИЧЕСКИЕ ПОКАЗАТЕЛИ:", SUMMARY)
+    section(None, lambda: summarize(acc).round(2), SUMMARY)
+
+    note("\nВЫБРОСЫ (IQR):")
+    section(None, lambda: pd.DataFrame({col: outliers(acc, col) for col in acc['columns']}).T
+            .astype({'outliers': 'int64'}).round(2))
+
+    for col, hist in acc['histograms'].items():
+        note(f"\nГИСТОГРАММА {col.upper()}:")
+        section(None, lambda hist=hist: hist.rename(index=lambda value: int(value) if float(value).is_integer() else value))
+
+    note(f"\nВЫСОКИЕ КОРРЕЛЯЦИИ (|r| > {HIGH_CORRELATION}):", SUMMARY)
+    section(None, lambda: top_pairs(correlation(acc), threshold=HIGH_CORRELATION).round(3), SUMMARY)
+
+    report_path = write_json(inputs=paths)
+    if report_path:
+        print(f"Отчет сохранен в '{report_path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+генератор синтетического players.csv в сыром виде fifa 21 для проверки и замеров очистки
+столбцы и форматы совпадают с исходным файлом: рост 5'9", вес 159lbs, рейтинги '4 ★',
+многострочный 'Team & Contract', позиции через пробел, суммы в евро ('€67.5M', '€560K')
+файл пишется блоками, поэтому размер (10k, 1m, 10m строк) ограничен только диском;
+при одинаковых размере и seed файл получается одинаковым
+запуск: python synthetic_players.py 1m --output players_1m.csv --seed 0
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+BLOCK_ROWS = 200_000
+
+# доли особых записей
+LOAN_SHARE = 0.04
+FREE_SHARE = 0.02
+DUPLICATE_SHARE = 0.01
+# столбцы, которые в исходном файле пусты у части старых записей
+SPARSE_SKILLS = ['Volleys', 'Curve', 'Agility', 'Balance', 'Jumping', 'Interceptions',
+                 'Positioning', 'Vision', 'Composure', 'Sliding Tackle']
+SPARSE_SHARE = 0.03
+HITS_MISSING_SHARE = 0.02
+
+FIRST_NAMES = ['Kylian', 'Lionel', 'Cristiano', 'Kevin', 'Virgil', 'Sergio', 'Luka', 'Mohamed',
+               'Joshua', 'Thiago', 'Heung', 'Raphaël', 'Jürgen', 'João', 'Iñaki', 'Paulo',
+               'Marco', 'Bruno', 'Sadio', 'Ángel', 'Erling', 'Jan', 'Robert', 'Antoine']
+LAST_NAMES = ['Mbappé', 'Messi', 'Ronaldo', 'De Bruyne', 'van Dijk', 'Ramos', 'Modrić', 'Salah',
+              'Kimmich', 'Silva', 'Son', 'Varane', 'Müller', 'Félix', 'Williams', 'Dybala',
+              'Reus', 'Fernandes', 'Mané', 'Di María', 'Haaland', 'Oblak', 'Lewandowski', 'Griezmann']
+NATIONALITIES = ['England', 'Germany', 'Spain', 'France', 'Argentina', 'Brazil', 'Italy', 'Portugal',
+                 'Netherlands', 'Belgium', 'Colombia', 'Japan', 'Korea Republic', 'Côte d\'Ivoire']
+CLUBS = ['FC Barcelona', 'Juventus', 'Paris Saint-Germain', 'Liverpool', 'Ajax', 'Real Madrid',
+         'FC Bayern München', 'Manchester City', 'Atlético Madrid', 'AC Milan', 'Olympique Lyonnais',
+         'Borussia Dortmund', 'SL Benfica', 'Fenerbahçe SK', 'Club Atlético Boca Juniors']
+POSITIONS = ['GK', 'CB', 'LB', 'RB', 'LWB', 'RWB', 'CDM', 'CM', 'CAM', 'LM', 'RM', 'LW', 'RW', 'CF', 'ST']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+WORK_RATES = ['Low', 'Medium', 'High']
+
+# групповые показатели в исходном файле - суммы своих навыков
+SKILL_GROUPS = {
+    'Attacking': ['Crossing', 'Finishing', 'Heading Accuracy', 'Short Passing', 'Volleys'],
+    'Skill': ['Dribbling', 'Curve', 'FK Accuracy', 'Long Passing', 'Ball Control'],
+    'Movement': ['Acceleration', 'Sprint Speed', 'Agility', 'Reactions', 'Balance'],
+    'Power': ['Shot Power', 'Jumping', 'Stamina', 'Strength', 'Long Shots'],
+    'Mentality': ['Aggression', 'Interceptions', 'Positioning', 'Vision', 'Penalties', 'Composure'],
+    'Defending': ['Marking', 'Standing Tackle', 'Sliding Tackle'],
+    'Goalkeeping': ['GK Diving', 'GK Handling', 'GK Kicking', 'GK Positioning', 'GK Reflexes'],
+}
+FACE_STATS = ['PAC', 'SHO', 'PAS', 'DRI', 'DEF', 'PHY']
+
+# порядок столбцов исходного файла
+COLUMNS = [
+    'photoUrl', 'LongName', 'playerUrl', 'Nationality', 'Positions', 'Name', 'Age', '↓OVA', 'POT',
+    'Team & Contract', 'ID', 'Height', 'Weight', 'foot', 'BOV', 'BP', 'Growth', 'Joined', 'Loan Date End',
+    'Value', 'Wage', 'Release Clause',
+    *[col for group, skills in SKILL_GROUPS.items() for col in [group, *skills]],
+    'Total Stats', 'Base Stats', 'W/F', 'SM', 'A/W', 'D/W', 'IR', *FACE_STATS, 'Hits',
+]
+
+
+def parse_size(value):
+    """количество строк из '10k', '1m', '10M' или '250000'"""
+    text = str(value).strip().lower().replace('_', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    if multiplier > 1:
+        text = text[:-1]
+    return int(float(text) * multiplier)
+
+
+def size_label(n_rows):
+    """короткое имя размера: 10000 -> '10k', 1000000 -> '1m'"""
+    for suffix, multiplier in [('m', 1_000_000), ('k', 1_000)]:
+        if n_rows >= multiplier and n_rows % multiplier == 0:
+            return f'{n_rows // multiplier}{suffix}'
+    return str(n_rows)
+
+
+def pick(rng, values, n_rows):
+    """случайные значения списка в виде object-столбца"""
+    return pd.Series(np.asarray(values, dtype=object)[rng.integers(0, len(values), n_rows)])
+
+
+def text(values):
+    """числа как строки для сборки текстовых столбцов"""
+    return pd.Series(values).astype(str)
+
+
+def format_euro(amount):
+    """суммы в евро в виде исходного файла: 67500000 -> '€67.5M', 560000 -> '€560K', 500 -> '€500'"""
+    amount = pd.Series(amount)
+    millions = (amount / 1e6).round(1).astype(str).str.removesuffix('.0')
+    thousands = (amount // 1000).astype(int).astype(str)
+    result = '€' + amount.astype(int).astype(str)
+    result = result.mask(amount >= 1000, '€' + thousands + 'K')
+    return result.mask(amount >= 1_000_000, '€' + millions + 'M')
+
+
+def format_date(rng, years):
+    """даты вида 'Jul 1, 2018' для указанных лет"""
+    n_rows = len(years)
+    return pick(rng, MONTHS, n_rows) + ' ' + text(rng.integers(1, 29, n_rows)) + ', ' + text(years)
+
+
+def make_block(rng, first_id, n_rows):
+    """блок синтетических записей с уникальными ID начиная с first_id"""
+    data = {}
+    ids = np.arange(first_id, first_id + n_rows)
+    first = pick(rng, FIRST_NAMES, n_rows)
+    last = pick(rng, LAST_NAMES, n_rows)
+    data['photoUrl'] = 'https://cdn.sofifa.com/players/' + text(ids) + '.png'
+    data['LongName'] = first + ' ' + last
+    data['playerUrl'] = 'http://sofifa.com/player/' + text(ids) + '/' + first.str.lower() + '-' + \
+        last.str.lower().str.replace(' ', '-') + '/210005/'
+    data['Nationality'] = pick(rng, NATIONALITIES, n_rows)
+
+    # 1-3 разные позиции через пробел, лучшая позиция - первая
+    names = np.asarray(POSITIONS, dtype=object)
+    index = rng.integers(0, len(POSITIONS), n_rows)
+    best = pd.Series(names[index])
+    positions = best.copy()
+    for share in [0.55, 0.2]:
+        extra = rng.random(n_rows) < share
+        # сдвиг не больше 7 дважды не возвращает к уже выбранной позиции
+        index = (index + rng.integers(1, 8, n_rows)) % len(POSITIONS)
+        positions[extra] = positions[extra] + ' ' + names[index][extra]
+    data['Positions'] = positions
+    data['Name'] = first.str[0] + '. ' + last
+
+    age = rng.integers(16, 41, n_rows)
+    ova = np.clip(rng.normal(66, 7, n_rows).round(), 40, 94).astype(int)
+    # молодые игроки растут сильнее
+    growth = np.clip(rng.normal((30 - age) * 0.9, 2), 0, 30).round().astype(int)
+    data['Age'] = age
+    data['↓OVA'] = ova
+    data['POT'] = ova + growth
+
+    clubs = pick(rng, CLUBS, n_rows)
+    start = rng.integers(2008, 2021, n_rows)
+    kind = rng.random(n_rows)
+    loan = kind < LOAN_SHARE
+    free = (kind >= LOAN_SHARE) & (kind < LOAN_SHARE + FREE_SHARE)
+    loan_end = format_date(rng, np.full(n_rows, 2021))
+    contract = text(start) + ' ~ ' + text(start + rng.integers(1, 6, n_rows))
+    contract[loan] = loan_end[loan] + ' On Loan'
+    team = '\n\n\n\n' + clubs + '\n' + contract + '\n\n'
+    team[free] = '\n\n\n\nFree\n\n'
+    data['Team & Contract'] = team
+    data['ID'] = ids
+
+    inches = np.clip(rng.normal(71, 2.7, n_rows).round(), 61, 81).astype(int)
+    data['Height'] = text(inches // 12) + "'" + text(inches % 12) + '"'
+    pounds = np.clip(rng.normal(165 + (inches - 71) * 4, 12).round(), 110, 243).astype(int)
+    data['Weight'] = text(pounds) + 'lbs'
+    data['foot'] = np.where(rng.random(n_rows) < 0.76, 'Right', 'Left')
+    data['BOV'] = ova + (rng.random(n_rows) < 0.3)
+    data['BP'] = best
+    data['Growth'] = growth
+    joined = format_date(rng, np.minimum(start + rng.integers(0, 2, n_rows), 2020))
+    joined[free] = np.nan
+    data['Joined'] = joined
+    data['Loan Date End'] = loan_end.where(loan)
+
+    value = np.round(np.exp((ova - 40) / 6.5) * 4000, -4)
+    value[free] = 0
+    data['Value'] = format_euro(value)
+    data['Wage'] = format_euro(np.maximum(np.round(value / 250, -3), 500))
+    data['Release Clause'] = format_euro(np.round(value * rng.uniform(1.5, 2.2, n_rows), -5))
+
+    # навыки вокруг общего рейтинга, группы и итоги - суммы навыков
+    total = np.zeros(n_rows, dtype=np.int64)
+    for group, skills in SKILL_GROUPS.items():
+        group_sum = np.zeros(n_rows, dtype=np.int64)
+        for skill in skills:
+            values = np.clip(rng.normal(ova - 8, 14, n_rows).round(), 5, 96).astype(np.int64)
+            group_sum += values
+            if skill in SPARSE_SKILLS:
+                data[skill] = np.where(rng.random(n_rows) < SPARSE_SHARE, np.nan, values)
+            else:
+                data[skill] = values
+        data[group] = group_sum
+        total += group_sum
+    data['Total Stats'] = total
+    face = {stat: np.clip(rng.normal(ova - 5, 12, n_rows).round(), 20, 96).astype(int) for stat in FACE_STATS}
+    data['Base Stats'] = sum(face.values())
+
+    data['W/F'] = text(rng.integers(1, 6, n_rows)) + ' ★'
+    data['SM'] = text(rng.integers(1, 6, n_rows)) + '★'
+    data['A/W'] = pick(rng, WORK_RATES, n_rows)
+    data['D/W'] = pick(rng, WORK_RATES, n_rows)
+    data['IR'] = text(np.minimum(rng.geometric(0.6, n_rows), 5)) + ' ★'
+    data.update(face)
+
+    # просмотры: '1.6K' от тысячи, часть пропущена
+    hits = rng.integers(1, 3000, n_rows)
+    hits_text = text(hits).mask(hits >= 1000, text((hits / 1000).round(1)) + 'K')
+    data['Hits'] = hits_text.mask(rng.random(n_rows) < HITS_MISSING_SHARE)
+
+    block = pd.DataFrame({col: pd.Series(values) for col, values in data.items()})[COLUMNS]
+    # точные повторы записей, как в исходном файле
+    duplicates = block.sample(frac=DUPLICATE_SHARE, random_state=rng.integers(2**31))
+    return pd.concat([block, duplicates], ignore_index=True).sample(frac=1, random_state=rng.integers(2**31))
+
+
+def write_players(path, n_rows, seed=0, first_id=150_000):
+    """запись синтетического players.csv из n_rows строк (вместе с повторами) блоками по BLOCK_ROWS
+
+    csv пишется через pyarrow: на миллионах строк это в несколько раз быстрее DataFrame.to_csv
+    """
+    written = 0
+    block_index = 0
+    next_id = first_id
+    with open(path, 'wb') as f:
+        while written < n_rows:
+            rng = np.random.default_rng([seed, block_index])
+            unique_rows = max(1, round(min(BLOCK_ROWS, n_rows - written) / (1 + DUPLICATE_SHARE)))
+            block = make_block(rng, next_id, unique_rows).iloc[:n_rows - written]
+            next_id += unique_rows
+            table = pa.Table.from_pandas(block, preserve_index=False)
+            pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=block_index == 0))
+            written += len(block)
+            block_index += 1
+    return written
+
+
+def main():
+    """основная функция"""
+    parser = argparse.ArgumentParser(description='синтетический players.csv в сыром формате fifa 21')
+    parser.add_argument('rows', help="количество строк: 10000, 10k, 1m, 10m")
+    parser.add_argument('--output', default=None, help='файл (по умолчанию players_<размер>.csv)')
+    parser.add_argument('--seed', type=int, default=0, help='seed генератора')
+    args = parser.parse_args()
+
+    n_rows = parse_size(args.rows)
+    output = args.output or f'players_{size_label(n_rows)}.csv'
+    written = write_players(output, n_rows, args.seed)
+    print(f"Записано {written} строк в '{output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""общие данные тестов: небольшой синтетический players.csv в сыром виде fifa 21"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import reporting  # noqa: E402
+from synthetic_players import write_players  # noqa: E402
+
+RAW_ROWS = 3000
+
+
+@pytest.fixture(autouse=True)
+def quiet_report():
+    """скрипты печатают только ошибки"""
+    reporting.configure('quiet')
+    yield
+    reporting.configure()
+
+
+@pytest.fixture(scope='session')
+def raw_players(tmp_path_factory):
+    """путь синтетического players.csv; первая строка вступила в клуб в мае
+
+    по первому значению pandas выводит формат дат, если он не задан явно
+    """
+    path = tmp_path_factory.mktemp('raw') / 'players.csv'
+    write_players(path, RAW_ROWS, seed=1)
+    raw = pd.read_csv(path)
+    may = raw['Joined'].str.startswith('May', na=False).to_numpy()
+    raw = pd.concat([raw[may].iloc[:1], raw.drop(index=raw.index[may][:1])])
+    raw.to_csv(path, index=False)
+    return str(path)
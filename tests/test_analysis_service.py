@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""запросы сервиса анализа (analysis_service.py) без http"""
+
+import pandas as pd
+import pytest
+
+import analysis_service
+from analysis_service import QueryError, run_query
+
+
+@pytest.fixture(autouse=True)
+def dataset(monkeypatch):
+    df = pd.DataFrame({
+        'name': ['a', 'b', 'c', 'd'],
+        'nationality': pd.Categorical(['x', 'y', 'x', 'y']),
+        'ova': [70, 80, 90, 60],
+    })
+    monkeypatch.setitem(analysis_service._service, 'df', df)
+    monkeypatch.setitem(analysis_service._service, 'results', type(analysis_service._service['results'])())
+    return df
+
+
+def column(value, name):
+    """столбец таблицы из ответа {'columns': [...], 'rows': [...]}"""
+    position = value['columns'].index(name)
+    return [row[position] for row in value['rows']]
+
+
+def test_top_clamps_n():
+    assert column(run_query({'kind': 'top', 'by': 'ova', 'n': 2})['value'], 'ova') == [90, 80]
+    assert run_query({'kind': 'top', 'by': 'ova', 'n': -1})['value']['rows'] == []
+    assert run_query({'kind': 'top', 'by': 'name', 'n': -1})['value']['rows'] == []
+
+
+@pytest.mark.parametrize('where', ['ova', ['ova'], [['ova']], [5], {'ova': 1}])
+def test_malformed_where_is_query_error(where):
+    with pytest.raises(QueryError, match='услови'):
+        run_query({'kind': 'rows', 'where': where})
+
+
+def test_where_filters_rows():
+    value = run_query({'kind': 'rows', 'where': [['ova', '>=', 80], ['nationality', '==', 'y']]})['value']
+    assert value['matched'] == 1
+
+
+@pytest.mark.parametrize('request_', [
+    {'kind': 'pivot', 'index': 'nationality', 'values': 'ova', 'aggfunc': 'nosuch'},
+    {'kind': 'pivot', 'index': 'nationality', 'values': 'ova', 'aggfunc': ['mean', '__len__']},
+    {'kind': 'group', 'by': 'nationality', 'agg': {'ova': 'nosuch'}},
+    {'kind': 'group', 'by': 'nationality', 'agg': ['ova']},
+])
+def test_unknown_aggregation_is_query_error(request_):
+    with pytest.raises(QueryError):
+        run_query(request_)
+
+
+def test_group_aggregates():
+    value = run_query({'kind': 'group', 'by': 'nationality', 'agg': {'ova': ['mean', 'max']}})['value']
+    assert column(value, 'ova_mean') == [80.0, 70.0]
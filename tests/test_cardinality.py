@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""оценка числа уникальных значений (cardinality.py)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cardinality import HLL_ERROR, estimate_distinct, merge_sketches, new_sketch, update_sketch
+
+
+@pytest.mark.parametrize('distinct', [10, 1000, 50000])
+def test_estimate_close_to_exact(distinct):
+    values = pd.Series([f'player {i % distinct}' for i in range(2 * distinct)] + [None])
+    estimate = estimate_distinct(update_sketch(new_sketch(), values))
+    assert abs(estimate - distinct) <= 3 * HLL_ERROR * distinct + 1
+
+
+def test_sketch_same_for_any_chunking():
+    values = pd.Series(np.random.default_rng(0).integers(0, 5000, 20000).astype(str))
+    whole = update_sketch(new_sketch(), values)
+    chunked = new_sketch()
+    for start in range(0, len(values), 3000):
+        chunked = update_sketch(chunked, values.iloc[start:start + 3000])
+    assert (chunked == whole).all()
+    merged = merge_sketches(update_sketch(new_sketch(), values.iloc[:7000]),
+                            update_sketch(new_sketch(), values.iloc[7000:]))
+    assert (merged == whole).all()
+
+
+def test_empty_sketch():
+    assert estimate_distinct(update_sketch(new_sketch(), pd.Series([None, None], dtype=object))) == 0
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""парсеры сырых столбцов (cleaning_parsers.py)"""
+
+import numpy as np
+import pandas as pd
+
+from cleaning_parsers import LB_KG, encode_positions, parse_height, parse_team_contract, parse_weight
+
+
+def test_parse_weight_units():
+    parsed = parse_weight(pd.Series(['159lbs', '72kg', '160', None]))
+    expected = np.array([159 * LB_KG, 72, 160 * LB_KG, np.nan], dtype='float32')
+    np.testing.assert_array_equal(parsed.to_numpy(), expected)
+
+
+def test_parse_weight_numeric_column_is_kilograms():
+    weight_kg = pd.Series([72.5, 80.0, np.nan], name='weight_kg')
+    assert parse_weight(weight_kg).equals(weight_kg.astype('float32'))
+
+
+def test_parse_height_units():
+    parsed = parse_height(pd.Series(['5\'9"', '6\'0"', '180cm', '175', None]))
+    expected = np.array([69 * 2.54, 72 * 2.54, 180, 175, np.nan], dtype='float32')
+    np.testing.assert_allclose(parsed.to_numpy(), expected)
+    assert parse_height(pd.Series([180, 175])).dtype == 'float32'
+
+
+def test_parse_team_contract():
+    parsed = parse_team_contract(pd.Series(['\n\n\n\nfc barcelona\n2004 ~ 2021\n\n', '\n\n\n\nfree\n\n', 'nan',
+                                            '\n\n\n\najax\njun 30, 2021 on loan\n\n']))
+    assert parsed['club_name'].tolist()[:2] == ['fc barcelona', 'free']
+    assert pd.isna(parsed['club_name'].iloc[2])
+    assert parsed['club_name'].iloc[3] == 'ajax'
+    assert parsed['contract_start_year'].tolist() == [2004, pd.NA, pd.NA, pd.NA]
+    assert parsed['contract_end_year'].dtype == 'Int32'
+
+
+def test_encode_positions_dense_and_sparse_agree():
+    series = pd.Series(['st lw', 'cb', 'nan', 'lw'])
+    dense = encode_positions(series)
+    assert dense.columns.tolist() == ['position_cb', 'position_lw', 'position_st']
+    assert dense.dtypes.eq('uint8').all()
+    assert dense.to_numpy().tolist() == [[0, 1, 1], [1, 0, 0], [0, 0, 0], [0, 1, 0]]
+    assert (encode_positions(series, sparse=True).sparse.to_dense().astype('uint8') == dense).all().all()
+    # фиксированный словарь позиций, как у частей файла: неизвестные позиции пропускаются
+    fixed = encode_positions(series, positions=['lw', 'rw'])
+    assert fixed.to_numpy().tolist() == [[1, 0], [0, 0], [0, 0], [1, 0]]
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""преобразования исходных столбцов (column_transforms.py)"""
+
+import pandas as pd
+
+import column_transforms
+import reporting
+from column_transforms import (apply_transforms, compile_transforms, height_columns, memoized, parse_date,
+                               star_value, update_lookups)
+from data_cleaning import read_players, transform_rows
+
+
+def test_parse_date_does_not_guess_format_from_first_value():
+    values = pd.Series(['May 9, 2013', 'Jul 1, 2004', 'sep 30, 2019', None, 'nan', 'unknown'])
+    parsed = parse_date(values)
+    expected = pd.to_datetime(pd.Series(['2013-05-09', '2004-07-01', '2019-09-30', None, None, None]))
+    pd.testing.assert_series_equal(parsed, expected)
+
+
+def test_parse_date_reads_already_cleaned_dates():
+    parsed = parse_date(pd.Series(['2013-05-09', 'Jul 1, 2004']))
+    assert parsed.tolist() == [pd.Timestamp('2013-05-09'), pd.Timestamp('2004-07-01')]
+
+
+def test_parse_date_failure_goes_to_report(monkeypatch, capsys):
+    def fail(*args, **kwargs):
+        raise ValueError('bad date')
+
+    monkeypatch.setattr(column_transforms.pd, 'to_datetime', fail)
+    values = pd.Series(['May 9, 2013'], name='joined')
+    assert parse_date(values) is values
+    assert capsys.readouterr().out == ''
+    reporting.configure('summary')
+    parse_date(values)
+    assert capsys.readouterr().out == 'Невозможно преобразовать joined в дату\n'
+
+
+def test_transform_rows_parses_every_joined_date(raw_players):
+    raw = read_players(raw_players)
+    assert raw['Joined'].iloc[0].startswith('May')
+    missing = raw[['Joined', 'Loan Date End']].isna().sum().tolist()
+    df = transform_rows(raw, verbose=False)
+    assert df[['joined', 'loan_date_end']].isna().sum().tolist() == missing
+
+
+def test_memoized_matches_direct_call():
+    height = pd.Series(['5\'9"', '6\'0"', None, '5\'9"', '6\'0"', '5\'9"'] * 3, name='height')
+    result, learned = memoized(height_columns, height)
+    pd.testing.assert_frame_equal(result, height_columns(height))
+    assert learned is None
+
+
+def test_memoized_parses_only_new_values_with_lookup():
+    seen = []
+
+    def tracked(series):
+        seen.extend(series.tolist())
+        return star_value(series)
+
+    first = pd.Series(['4 ★', '3 ★', '4 ★', '3 ★'], name='w_f')
+    _, lookup = memoized(tracked, first, learn=True)
+    assert lookup.to_dict() == {'4 ★': 4.0, '3 ★': 3.0}
+
+    seen.clear()
+    second = pd.Series(['3 ★', '5 ★', '5 ★', None, '3 ★', '5 ★'], name='w_f')
+    result, learned = memoized(tracked, second, lookup=lookup, learn=True)
+    # известное '3 ★' не разбирается заново, пропуск разбирается вместе с новыми значениями
+    assert seen[0] == '5 ★' and '3 ★' not in seen
+    assert learned.to_dict() == {'5 ★': 5.0}
+    pd.testing.assert_series_equal(result, star_value(second))
+
+
+def test_dates_are_not_kept_in_lookups():
+    df = pd.DataFrame({'joined': ['Jul 1, 2004', 'Jul 1, 2004', 'May 9, 2013', 'May 9, 2013'],
+                       'w_f': ['4 ★', '4 ★', '3 ★', '3 ★']})
+    lookups = {}
+    compiled = compile_transforms(df, {'joined': 'date', 'w_f': 'star_value'}, [], lookups=lookups)
+    outputs = {col: func(df[col]) for col, _, func in compiled}
+    assert update_lookups(lookups, compiled, outputs)
+    assert list(lookups) == ['star_value']
+    assert apply_transforms(df, compiled, outputs)['joined'].notna().all()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""матрица корреляций и выбор сильных пар (correlation_engine.py)"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import correlation_engine
+from correlation_engine import correlation_matrix, correlation_submatrix, top_pairs
+
+
+@pytest.fixture
+def players():
+    rng = np.random.default_rng(7)
+    ova = rng.normal(70, 7, 400)
+    df = pd.DataFrame({
+        'ova': ova,
+        'pot': ova + rng.normal(3, 2, 400),
+        'value': np.exp(ova / 10) + rng.normal(0, 50, 400),
+        'age': rng.integers(16, 42, 400).astype('uint8'),
+        'constant': 1.0,
+        'name': 'player',
+    })
+    df.loc[::9, 'value'] = np.nan
+    return df
+
+
+@pytest.fixture(autouse=True)
+def forget_matrices():
+    correlation_engine._matrices.clear()
+    yield
+    correlation_engine._matrices.clear()
+
+
+def test_pearson_matches_pandas_with_missing_values(players):
+    matrix = correlation_matrix(players, cache_dir=None)
+    expected = players.drop(columns='name').corr()
+    expected.loc['constant', 'constant'] = np.nan
+    pd.testing.assert_frame_equal(matrix, expected, check_exact=False, atol=1e-12)
+
+
+def test_spearman_matches_pandas_without_missing_values(players):
+    players = players.dropna()
+    matrix = correlation_matrix(players, method='spearman', cache_dir=None)
+    expected = players.drop(columns=['name', 'constant']).corr(method='spearman')
+    pd.testing.assert_frame_equal(matrix.drop(index='constant', columns='constant'), expected,
+                                  check_exact=False, atol=1e-12)
+
+
+def test_matrix_cached_on_disk(players, tmp_path):
+    matrix = correlation_matrix(players, cache_dir=tmp_path)
+    assert len(os.listdir(tmp_path)) == 1
+    correlation_engine._matrices.clear()
+    pd.testing.assert_frame_equal(correlation_matrix(players, cache_dir=tmp_path), matrix)
+    assert correlation_submatrix(players, ['pot', 'ova'], cache_dir=None).columns.tolist() == ['pot', 'ova']
+    with pytest.raises(KeyError):
+        correlation_submatrix(players, ['name'], cache_dir=None)
+
+
+def test_unknown_method(players):
+    with pytest.raises(ValueError):
+        correlation_matrix(players, method='kendall', cache_dir=None)
+
+
+def test_top_pairs_match_loop_over_triangle(players):
+    matrix = correlation_matrix(players, cache_dir=None)
+    pairs = []
+    for i, first in enumerate(matrix.columns):
+        for second in matrix.columns[i + 1:]:
+            r = matrix.loc[first, second]
+            if abs(r) > 0.1:
+                pairs.append((first, second, r))
+    expected = pd.DataFrame(pairs, columns=['feature_1', 'feature_2', 'correlation'])
+    expected = expected.sort_values('correlation', key=abs, ascending=False, kind='stable')
+    result = top_pairs(matrix, threshold=0.1)
+    pd.testing.assert_frame_equal(result, expected)
+    pd.testing.assert_frame_equal(top_pairs(matrix, k=2, threshold=0.1), expected.head(2))
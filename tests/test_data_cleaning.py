@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""очистка целиком в памяти и по частям (data_cleaning.py)"""
+
+import pandas as pd
+
+import data_cleaning
+from data_cleaning import clean_delta, clean_in_memory, clean_streaming
+from stage_cache import CACHE_VERSION
+
+CHUNKSIZE = 700
+
+
+def clean_csv(input_file, output_file, chunksize=None, cache_dir=None):
+    """очищенный csv, прочитанный обратно как строки, чтобы сравнивать и типы, и значения"""
+    if chunksize is None:
+        clean_in_memory(input_file, output_file, columnar='none', cache_dir=cache_dir)
+    else:
+        clean_streaming(input_file, output_file, chunksize, columnar='none', cache_dir=cache_dir)
+    return pd.read_csv(output_file, dtype=str, keep_default_na=False)
+
+
+def test_streaming_matches_in_memory(raw_players, tmp_path):
+    expected = clean_csv(raw_players, tmp_path / 'memory.csv')
+    streamed = clean_csv(raw_players, tmp_path / 'streaming.csv', chunksize=CHUNKSIZE)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_lookups_from_previous_run_do_not_change_result(raw_players, tmp_path):
+    expected = clean_csv(raw_players, tmp_path / 'expected.csv')
+    cache_dir = tmp_path / 'cache'
+    # словари разобранных значений сначала заполняются по второй половине файла,
+    # где первая дата окончания аренды - майская
+    part = pd.read_csv(raw_players).iloc[len(expected) // 2:]
+    may = part['Loan Date End'].str.startswith('May', na=False).to_numpy()
+    part = pd.concat([part[may].iloc[:1], part.drop(index=part.index[may][:1])])
+    part.to_csv(tmp_path / 'part.csv', index=False)
+    clean_csv(tmp_path / 'part.csv', tmp_path / 'part_cleaned.csv', cache_dir=cache_dir)
+
+    assert (cache_dir / f'lookups_v{CACHE_VERSION}.pkl').exists()
+    pd.testing.assert_frame_equal(clean_csv(raw_players, tmp_path / 'memory.csv', cache_dir=cache_dir), expected)
+    streamed = clean_csv(raw_players, tmp_path / 'streaming.csv', chunksize=CHUNKSIZE, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def edit_release(raw_players, path):
+    """следующий выпуск: одна запись изменена, одна добавлена (копия с новым id)"""
+    raw = pd.read_csv(raw_players)
+    raw.loc[10, 'Age'] += 1
+    added = raw.iloc[[20]].assign(ID=123456789)
+    pd.concat([raw, added], ignore_index=True).to_csv(path, index=False)
+    return str(path)
+
+
+def test_delta_keeps_rows_of_full_cleaning(raw_players, tmp_path):
+    clean_in_memory(raw_players, tmp_path / 'delta.csv', cache_dir=None)
+    release = edit_release(raw_players, tmp_path / 'release.csv')
+    summary = clean_delta(release, str(tmp_path / 'delta.csv'), cache_dir=None)
+    full = clean_csv(release, tmp_path / 'full.csv')
+
+    assert summary['mode'] == 'delta'
+    assert (summary['added'], summary['changed'], summary['removed']) == (1, 1, 0)
+    delta = pd.read_csv(tmp_path / 'delta.csv', dtype=str, keep_default_na=False)
+    assert delta['id'].tolist() == full['id'].tolist()
+    # значения заполнения не пересчитываются, поэтому все столбцы с заполнением помечены устаревшими
+    filled = [col for col in full.columns if (delta[col] != full[col]).any()]
+    assert all(any(note.startswith(f'{col}:') for note in summary['stale']) for col in filled)
+    assert len(summary['stale']) > 0
+
+
+def test_delta_with_dedup_keys_runs_full_cleaning(raw_players, tmp_path, monkeypatch):
+    monkeypatch.setattr(data_cleaning, 'DEDUP_KEYS', ['longname', 'nationality', 'age', 'ova'])
+    clean_in_memory(raw_players, tmp_path / 'delta.csv', cache_dir=None)
+    release = edit_release(raw_players, tmp_path / 'release.csv')
+    summary = clean_delta(release, str(tmp_path / 'delta.csv'), cache_dir=None)
+    full = clean_csv(release, tmp_path / 'full.csv')
+
+    assert summary['mode'] == 'full'
+    delta = pd.read_csv(tmp_path / 'delta.csv', dtype=str, keep_default_na=False)
+    assert not delta['id'].duplicated().any()
+    pd.testing.assert_frame_equal(delta, full)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""загрузка очищенного набора для анализа (dataset_loader.py)"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import dataset_loader
+from dataset_loader import load_players
+
+
+@pytest.fixture
+def cleaned_frame():
+    """рост и вес как после очистки: дробные значения, которые float32 хранит неточно"""
+    return pd.DataFrame({
+        'age': [21, 35, 28, 19],
+        'height_cm': [182.88, 177.8, 190.5, 157.48],
+        'weight_kg': [72.5747, 99.33665, 54.43104, 91.17199],
+    })
+
+
+@pytest.fixture(autouse=True)
+def forget_loaded():
+    dataset_loader.clear_loaded()
+    yield
+    dataset_loader.clear_loaded()
+
+
+def check_types(df, expected):
+    assert df['age'].dtype == 'uint8'
+    for col in ['height_cm', 'weight_kg']:
+        assert df[col].dtype == 'float64'
+        assert df[col].tolist() == expected[col].tolist()
+
+
+def test_csv_and_cache_keep_float64(tmp_path, cleaned_frame):
+    path = tmp_path / 'players_cleaned.csv'
+    cleaned_frame.to_csv(path, index=False)
+    cache_dir = tmp_path / 'cache'
+    check_types(load_players(path=str(path), cache_dir=str(cache_dir)), cleaned_frame)
+    dataset_loader.clear_loaded()
+    df = load_players(path=str(path), cache_dir=str(cache_dir))
+    assert dataset_loader.last_load['origin'] == 'cache'
+    check_types(df, cleaned_frame)
+
+
+def test_float32_parquet_is_widened_without_noise(tmp_path, cleaned_frame):
+    path = tmp_path / 'players_cleaned.parquet'
+    cleaned_frame.astype({'height_cm': 'float32', 'weight_kg': 'float32'}).to_parquet(path, index=False)
+    check_types(load_players(path=str(path)), cleaned_frame)
+
+
+def test_cache_follows_source_content(tmp_path, cleaned_frame):
+    path = tmp_path / 'players_cleaned.csv'
+    cache_dir = str(tmp_path / 'cache')
+    cleaned_frame.to_csv(path, index=False)
+    df = load_players(path=str(path), cache_dir=cache_dir)
+    assert load_players(path=str(path), cache_dir=cache_dir) is df
+    assert dataset_loader.last_load['origin'] == 'memory'
+
+    # тот же файл, записанный заново: хеш совпадает, кэш используется
+    dataset_loader.clear_loaded()
+    cleaned_frame.to_csv(path, index=False)
+    os.utime(path, ns=(0, 1))
+    load_players(path=str(path), cache_dir=cache_dir)
+    assert dataset_loader.last_load['origin'] == 'cache'
+
+    # другое содержимое: csv разбирается заново, даже если процесс уже загружал файл
+    cleaned_frame.assign(age=cleaned_frame['age'] + 1).to_csv(path, index=False)
+    df = load_players(path=str(path), cache_dir=cache_dir)
+    assert dataset_loader.last_load['origin'] == 'csv'
+    assert df['age'].tolist() == (cleaned_frame['age'] + 1).tolist()
+
+
+def test_selected_columns(tmp_path, cleaned_frame):
+    path = tmp_path / 'players_cleaned.csv'
+    cleaned_frame.to_csv(path, index=False)
+    df = load_players(['weight_kg', 'missing', 'age'], path=str(path), cache_dir=str(tmp_path / 'cache'))
+    assert df.columns.tolist() == ['weight_kg', 'age']
+    dataset_loader.clear_loaded()
+    df = load_players(['weight_kg', 'age'], path=str(path), cache_dir=str(tmp_path / 'cache'))
+    assert dataset_loader.last_load['origin'] == 'cache'
+    assert df.columns.tolist() == ['weight_kg', 'age']
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""описательные статистики за один проход (descriptive_stats.py)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from descriptive_stats import describe_columns
+
+
+@pytest.fixture
+def players():
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({
+        'ova': rng.integers(45, 94, 500).astype('uint8'),
+        'height_cm': rng.normal(180, 7, 500).round(2),
+        'wage': pd.array(rng.integers(0, 300, 500), dtype='UInt16'),
+        'empty': np.nan,
+    })
+    df.loc[::7, 'height_cm'] = np.nan
+    df.loc[::11, 'wage'] = pd.NA
+    return df
+
+
+def test_matches_pandas(players):
+    result = describe_columns(players, ['ova', 'height_cm', 'wage'])
+    for col in ['ova', 'height_cm', 'wage']:
+        values = players[col].astype('float64').dropna()
+        expected = {
+            'count': len(values), 'mean': values.mean(), 'median': values.median(), 'mode': values.mode()[0],
+            'std': values.std(), 'min': values.min(), 'q25': values.quantile(0.25), 'q50': values.median(),
+            'q75': values.quantile(0.75), 'max': values.max(), 'skew': values.skew(), 'kurtosis': values.kurt(),
+        }
+        assert result.loc[col].to_dict() == pytest.approx(expected)
+
+
+def test_all_missing_column(players):
+    row = describe_columns(players, ['empty']).loc['empty']
+    assert row['count'] == 0
+    assert row.drop('count').isna().all()
+
+
+def test_result_cached_per_frame_and_columns(players):
+    first = describe_columns(players)
+    assert describe_columns(players) is first
+    assert describe_columns(players, ['ova']) is not first
+    assert describe_columns(players.copy()) is not first
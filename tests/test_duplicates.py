@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""поиск точных и похожих дубликатов (duplicates.py)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from duplicates import find_duplicates, find_near_duplicates, in_sorted
+
+
+@pytest.fixture
+def players():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'id': rng.integers(0, 300, 1000), 'club': rng.choice(['a', 'b', 'c'], 1000)},
+                        index=np.arange(1000) * 2)
+
+
+def test_in_sorted():
+    values = np.array([5, 1, 9, 12, 0], dtype=np.uint64)
+    assert in_sorted(values, np.array([1, 5, 10], dtype=np.uint64)).tolist() == [True, True, False, False, False]
+    assert not in_sorted(values, np.empty(0, dtype=np.uint64)).any()
+
+
+def test_in_memory_matches_pandas(players):
+    duplicates, seen_hashes = find_duplicates(players)
+    assert seen_hashes is None
+    pd.testing.assert_series_equal(duplicates, players.duplicated())
+    duplicates, _ = find_duplicates(players, ['id'])
+    pd.testing.assert_series_equal(duplicates, players.duplicated(['id']))
+
+
+def test_chunks_share_seen_hashes(players):
+    seen_hashes = np.empty(0, dtype=np.uint64)
+    parts = []
+    for start in range(0, len(players), 128):
+        duplicates, seen_hashes = find_duplicates(players.iloc[start:start + 128], None, seen_hashes)
+        parts.append(duplicates)
+    pd.testing.assert_series_equal(pd.concat(parts), players.duplicated())
+    assert (seen_hashes[1:] > seen_hashes[:-1]).all()
+    assert len(seen_hashes) == (~players.duplicated()).sum()
+
+
+def test_near_duplicates_in_same_block():
+    df = pd.DataFrame({
+        'nationality': ['france', 'france', 'france', 'spain'],
+        'age': [22, 22, 22, 22],
+        'longname': ['Kylian Mbappé-Lottin', 'kylian mbappe lottin', 'Kylian Mbappa', 'Kylian Mbappé-Lottin'],
+    })
+    seen_names = {}
+    duplicates = find_near_duplicates(df, seen_names, ['nationality', 'age'], 'longname', 0.8)
+    assert duplicates.tolist() == [False, True, False, False]
+    # следующая часть файла сравнивается с уже принятыми именами
+    later = find_near_duplicates(df.iloc[[0]], seen_names, ['nationality', 'age'], 'longname', 0.8)
+    assert later.tolist() == [True]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""заполнение пропусков по группам (plan_imputation, group_fill_values, apply_fills)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_cleaning
+from data_cleaning import apply_fills, frame_counts, group_fill_values, plan_imputation, update_statistics
+
+
+@pytest.fixture
+def players():
+    """200 игроков трех позиций; у 'gk' всего 3 строки, у части строк нет позиции"""
+    rng = np.random.default_rng(3)
+    bp = np.array(['st'] * 100 + ['cb'] * 94 + ['gk'] * 3 + [None] * 3, dtype=object)
+    height = np.where(bp == 'st', 175.0, 190.0) + rng.integers(0, 10, len(bp))
+    foot = np.where(rng.random(len(bp)) < 0.8, np.where(bp == 'st', 'left', 'right'), 'both').astype(object)
+    df = pd.DataFrame({'bp': bp, 'height_cm': height, 'foot': foot})
+    df.loc[[0, 1, 150, 195, 198], 'height_cm'] = np.nan
+    df.loc[[2, 151, 199], 'foot'] = None
+    return df
+
+
+def fill(df):
+    stats = update_statistics(None, df)
+    plan = plan_imputation(stats, collect_counts=lambda cols, by=None: frame_counts(df, cols, by))
+    report = {}
+    return apply_fills(df.copy(), plan, report), plan, report
+
+
+@pytest.mark.parametrize('method', ['mean', 'median', 'mode'])
+def test_group_fill_values_match_pandas(players, method):
+    known = players.dropna()
+    counts = frame_counts(known, ['height_cm'], by='bp')['height_cm']
+    values = group_fill_values(counts, method)
+    grouped = known.groupby('bp')['height_cm']
+    expected = grouped.mean() if method == 'mean' else grouped.median() if method == 'median' else \
+        grouped.agg(lambda s: s.mode()[0])
+    expected = expected[grouped.size() >= data_cleaning.IMPUTE_GROUP_MIN_ROWS]
+    pd.testing.assert_series_equal(values.sort_index(), expected.sort_index(), check_names=False)
+
+
+def test_group_median_of_even_group(monkeypatch):
+    values = pd.Series([1.0, 2.0, 4.0, 10.0, 3.0, 3.0, 3.0, 5.0, 7.0])
+    groups = pd.Series(['a'] * 4 + ['b'] * 5)
+    counts = values.groupby(groups, sort=False).value_counts(sort=False)
+    assert group_fill_values(counts, 'median').to_dict() == {'b': 3.0}
+    monkeypatch.setattr(data_cleaning, 'IMPUTE_GROUP_MIN_ROWS', 4)
+    assert group_fill_values(counts, 'median').to_dict() == {'a': 3.0, 'b': 3.0}
+
+
+def test_fills_by_group(players, monkeypatch):
+    monkeypatch.setattr(data_cleaning, 'IMPUTE_GROUP_BY', 'bp')
+    df, plan, report = fill(players)
+    assert not df[['height_cm', 'foot']].isna().any().any()
+    known = players.dropna(subset=['height_cm'])
+    group_mean = known.groupby('bp')['height_cm'].mean()
+    assert plan['fill_methods']['height_cm'] == 'mean'
+    assert df.loc[[0, 1], 'height_cm'].tolist() == pytest.approx([group_mean['st']] * 2)
+    assert df.loc[150, 'height_cm'] == pytest.approx(group_mean['cb'])
+    # маленькая группа и строка без группы получают общее значение
+    assert df.loc[[195, 198], 'height_cm'].tolist() == pytest.approx([known['height_cm'].mean()] * 2)
+    assert df.loc[[2, 151, 199], 'foot'].tolist() == ['left', 'right', players['foot'].mode()[0]]
+    assert report['height_cm'] == {'method': 'mean', 'filled': 5, 'by_group': 3}
+    assert report['foot'] == {'method': 'mode', 'filled': 3, 'by_group': 2}
+
+
+def test_without_groups_fills_overall_value(players):
+    df, plan, report = fill(players)
+    assert plan['group_fills'] == {}
+    assert df.loc[[0, 150], 'height_cm'].tolist() == pytest.approx([players['height_cm'].mean()] * 2)
+    assert report['height_cm']['by_group'] == 0
+
+
+def test_chunked_plan_matches_whole_file(players, monkeypatch):
+    monkeypatch.setattr(data_cleaning, 'IMPUTE_GROUP_BY', 'bp')
+    chunks = [players.iloc[:70], players.iloc[70:160], players.iloc[160:]]
+    stats = None
+    for chunk in chunks:
+        stats = update_statistics(stats, chunk)
+
+    def collect_counts(columns, by=None):
+        counts = {}
+        for chunk in chunks:
+            for col, chunk_counts in frame_counts(chunk, columns, by).items():
+                counts[col] = counts[col].add(chunk_counts, fill_value=0) if col in counts else chunk_counts
+        return counts
+
+    plan = plan_imputation(stats, collect_counts=collect_counts)
+    chunked = pd.concat([apply_fills(chunk.copy(), plan) for chunk in chunks])
+    pd.testing.assert_frame_equal(chunked, fill(players)[0])
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""параллельные преобразования по столбцам (parallel_columns.py)"""
+
+import pandas as pd
+import pytest
+
+import data_cleaning
+from data_cleaning import read_players, rename_columns, transform_columns
+from parallel_columns import map_columns, partition
+
+
+def test_partition_keeps_order_and_sizes():
+    parts = partition(list(range(7)), 3)
+    assert parts == [[0, 1, 2], [3, 4], [5, 6]]
+    assert partition([1], 3) == [[1], [], []]
+
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_map_columns_matches_serial(mode):
+    df = pd.DataFrame({'a': ['X', 'Y'], 'b': ['Z', None], 'c': ['1', '2']})
+    funcs = [('c', pd.to_numeric), ('a', pd.Series.copy), ('b', pd.Series.isna)]
+    serial = map_columns(df, funcs)
+    parallel = map_columns(df, funcs, mode, workers=2)
+    assert list(parallel) == list(serial) == ['c', 'a', 'b']
+    for col in serial:
+        pd.testing.assert_series_equal(parallel[col], serial[col])
+
+
+@pytest.mark.parametrize('mode', ['thread', 'process'])
+def test_transform_columns_same_in_every_mode(raw_players, monkeypatch, mode):
+    monkeypatch.setattr(data_cleaning, 'TEXT_PARALLEL_MIN_ROWS', 0)
+    raw = read_players(raw_players)
+
+    def transform(parallel):
+        context = {'verbose': False, 'text_parallel': parallel, 'text_workers': 2, '_lookups': {}}
+        df = raw.copy()
+        for func in [rename_columns, transform_columns]:
+            df = func(df, context)
+        return df
+
+    pd.testing.assert_frame_equal(transform(mode), transform('serial'))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""уровни отчета и вывод в json (reporting.py)"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+import reporting
+from reporting import FULL, SUMMARY, configure, metric, note, section, write_json
+
+
+def test_disabled_sections_are_not_built(capsys):
+    def build():
+        raise AssertionError('раздел не должен строиться')
+
+    configure('summary')
+    section("Таблица:", build)
+    note(build)
+    metric('строк', 10)
+    note("итог", SUMMARY)
+    assert capsys.readouterr().out == 'строк: 10\nитог\n'
+
+
+def test_quiet_prints_nothing(capsys):
+    configure('quiet')
+    note("итог", SUMMARY)
+    metric('строк', 10)
+    section(None, lambda: pd.DataFrame({'a': [1]}), SUMMARY)
+    assert capsys.readouterr().out == ''
+    assert not reporting.enabled(SUMMARY)
+
+
+def test_json_report(tmp_path, capsys):
+    path = tmp_path / 'report.json'
+    configure('full', str(path))
+    note("\n" + "=" * 20)
+    note("Средний рейтинг по странам:")
+    section(None, lambda: pd.DataFrame({'ova': [70.5, np.nan]}, index=pd.Index(['france', 'spain'], name='nationality')))
+    metric('память', np.float64(9.5), fmt='.2f', suffix=' MB')
+    section("Пропуски:", lambda: pd.Series({'age': np.int64(0), 'wage': np.int64(3)}), FULL)
+    assert capsys.readouterr().out == ''
+    assert write_json(rows=2) == str(path)
+
+    report = json.loads(path.read_text(encoding='utf-8'))
+    assert report['level'] == 'full' and report['rows'] == 2
+    assert report['entries'] == [
+        {'kind': 'note', 'title': None, 'level': 'full', 'value': 'Средний рейтинг по странам'},
+        {'kind': 'section', 'title': 'Средний рейтинг по странам', 'level': 'full',
+         'value': {'columns': ['nationality', 'ova'], 'rows': [['france', 70.5], ['spain', None]]}},
+        {'kind': 'metric', 'title': 'память', 'level': 'summary', 'value': 9.5},
+        {'kind': 'section', 'title': 'Пропуски', 'level': 'full', 'value': {'age': 0, 'wage': 3}},
+    ]
+
+
+def test_write_json_without_file():
+    configure('full')
+    assert write_json() is None
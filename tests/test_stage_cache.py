@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""дисковый кэш этапов (stage_cache.py)"""
+
+import os
+
+import pandas as pd
+
+import stage_cache
+from stage_cache import load_entry, load_lookups, prune_cache, save_entry, save_lookups
+
+
+def write_entries(cache_dir, keys):
+    """записи одинакового размера с возрастающим временем использования"""
+    df = pd.DataFrame({'value': range(1000)})
+    for i, key in enumerate(keys):
+        save_entry(cache_dir, key, df, {})
+        os.utime(os.path.join(cache_dir, f'{key}.pkl'), (i, i))
+    return os.path.getsize(os.path.join(cache_dir, f'{keys[0]}.pkl'))
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    size = write_entries(tmp_path, ['a', 'b', 'c', 'd'])
+    assert load_entry(tmp_path, 'a') is not None
+    prune_cache(tmp_path, max_bytes=2 * size)
+    assert sorted(os.listdir(tmp_path)) == ['a.pkl', 'd.pkl']
+
+
+def test_save_entry_keeps_cache_under_limit(tmp_path, monkeypatch):
+    size = write_entries(tmp_path, ['a', 'b'])
+    monkeypatch.setattr(stage_cache, 'CACHE_MAX_BYTES', size)
+    write_entries(tmp_path, ['c'])
+    assert os.listdir(tmp_path) == ['c.pkl']
+
+
+def test_prune_removes_lookups_of_old_versions(tmp_path):
+    save_lookups(tmp_path, {'height_cm': pd.Series([180.0], index=['180cm'])})
+    (tmp_path / 'lookups_v1.pkl').write_bytes(b'old')
+    prune_cache(tmp_path)
+    assert os.listdir(tmp_path) == [f'lookups_v{stage_cache.CACHE_VERSION}.pkl']
+    assert list(load_lookups(tmp_path)) == ['height_cm']
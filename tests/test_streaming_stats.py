@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""потоковые статистики (streaming_stats.py) против расчета по всему набору в памяти"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from descriptive_stats import describe_columns
+from streaming_stats import (accumulate_files, accumulate_frame, correlation, merge_accumulators,
+                             new_accumulator, outliers, quantiles, summarize)
+
+COLUMNS = ['age', 'ova', 'height_cm', 'skill']
+HISTOGRAM_COLUMNS = ['age', 'ova']
+
+
+@pytest.fixture(scope='module')
+def players():
+    rng = np.random.default_rng(0)
+    n_rows = 5000
+    df = pd.DataFrame({
+        'age': rng.integers(16, 41, n_rows),
+        'ova': np.clip(rng.normal(66, 7, n_rows).round(), 40, 94),
+        'height_cm': rng.normal(181, 7, n_rows).round(1),
+        'skill': rng.normal(50, 15, n_rows),
+    })
+    df.loc[rng.random(n_rows) < 0.05, 'skill'] = np.nan
+    return df
+
+
+def accumulate_chunks(df, chunksize):
+    acc = new_accumulator(COLUMNS, HISTOGRAM_COLUMNS)
+    for start in range(0, len(df), chunksize):
+        acc = merge_accumulators(acc, accumulate_frame(df.iloc[start:start + chunksize], COLUMNS, HISTOGRAM_COLUMNS))
+    return acc
+
+
+@pytest.mark.parametrize('chunksize', [333, 5000])
+def test_chunks_match_in_memory(players, chunksize):
+    acc = accumulate_chunks(players, chunksize)
+    expected = describe_columns(players, COLUMNS)
+    result = summarize(acc)
+    moments = ['count', 'mean', 'std', 'min', 'max', 'skew', 'kurtosis']
+    pd.testing.assert_frame_equal(result[moments].astype(float), expected[moments].astype(float), rtol=1e-9)
+    # гистограммы дают точные квартили и моду
+    exact = ['median', 'q25', 'q75', 'mode']
+    pd.testing.assert_frame_equal(result.loc[HISTOGRAM_COLUMNS, exact].astype(float),
+                                  expected.loc[HISTOGRAM_COLUMNS, exact].astype(float))
+    np.testing.assert_allclose(correlation(acc).to_numpy(), players[COLUMNS].corr().to_numpy(), atol=1e-12)
+
+
+def test_digest_quantiles_are_close(players):
+    acc = accumulate_chunks(players, 333)
+    skill = players['skill'].dropna()
+    assert not acc['digests']['skill']['exact']
+    np.testing.assert_allclose(quantiles(acc, 'skill', [0.01, 0.25, 0.5, 0.75, 0.99]),
+                               skill.quantile([0.01, 0.25, 0.5, 0.75, 0.99]), atol=0.02 * skill.std())
+    bounds = outliers(acc, 'skill')
+    q1, q3 = skill.quantile([0.25, 0.75])
+    assert bounds['lower'] == pytest.approx(q1 - 1.5 * (q3 - q1), abs=0.1)
+
+
+def test_files_in_processes_match_chunks(players, tmp_path):
+    paths = []
+    for i, start in enumerate(range(0, len(players), 2000)):
+        part = players.iloc[start:start + 2000]
+        path = tmp_path / f'season_{i}.{"csv" if i else "parquet"}'
+        if i:
+            part.to_csv(path, index=False)
+        else:
+            part.to_parquet(path)
+        paths.append(str(path))
+    result = summarize(accumulate_files(paths, COLUMNS, HISTOGRAM_COLUMNS, chunksize=700, workers=2))
+    expected = summarize(accumulate_chunks(players, 333))
+    # сжатый t-digest зависит от разбиения на части, остальное - нет
+    expected.loc['skill', ['median', 'q25', 'q50', 'q75']] = result.loc['skill', ['median', 'q25', 'q50', 'q75']]
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-9)
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""генератор синтетического players.csv (synthetic_players.py)"""
+
+import pandas as pd
+import pytest
+
+import synthetic_players
+from synthetic_players import COLUMNS, parse_size, size_label, write_players
+
+
+@pytest.mark.parametrize('value, rows', [('10k', 10_000), ('1m', 1_000_000), ('2.5M', 2_500_000),
+                                         ('250_000', 250_000), (1234, 1234)])
+def test_parse_size(value, rows):
+    assert parse_size(value) == rows
+
+
+def test_size_label():
+    assert [size_label(n) for n in [10_000, 1_000_000, 1500]] == ['10k', '1m', '1500']
+
+
+def test_blocks_keep_row_count_and_ids(tmp_path, monkeypatch):
+    monkeypatch.setattr(synthetic_players, 'BLOCK_ROWS', 1000)
+    path = tmp_path / 'players.csv'
+    assert write_players(path, 2500, seed=3) == 2500
+    df = pd.read_csv(path, dtype=str)
+    assert df.columns.tolist() == COLUMNS
+    assert len(df) == 2500
+    # id уникальны между блоками, повторяются только точные копии записей
+    repeated = df[df['ID'].duplicated(keep=False)]
+    assert len(repeated) and repeated.duplicated(keep=False).all()
+    assert (df.drop_duplicates()['ID'].value_counts() == 1).all()
+
+
+def test_same_seed_same_file(tmp_path):
+    first, second, other = tmp_path / 'a.csv', tmp_path / 'b.csv', tmp_path / 'c.csv'
+    write_players(first, 500, seed=1)
+    write_players(second, 500, seed=1)
+    write_players(other, 500, seed=2)
+    assert first.read_bytes() == second.read_bytes()
+    assert first.read_bytes() != other.read_bytes()